@@ -0,0 +1,221 @@
+"""
+Проверка площадей без полигонов (engine/analytic.py) по полигональному расчёту
+
+Для случайных конфигураций с непустой областью площади вариантов 3 и 1
+сравниваются с полигональным расчётом движка и с эталонным полигональным
+расчётом повышенной точности (плотные окружности, эллипсы, гиперболы и
+контуры ДНА). Для варианта 1 проверяется несколько допусков квадратуры
+вместе с её оценкой погрешности. Также сравнивается замкнутая формула
+площади ДНА с площадью её контура.
+
+    python -m benchmarks.analytic_check --count 40
+"""
+import argparse
+import time
+
+import numpy as np
+from shapely.geometry import Polygon
+
+from models.rls import RLS
+from engine.analytic import variant1_area_batch, variant3_area, variant3_area_batch
+from engine.bands import hyperbola_band
+from engine.geometry import compute_variant1, compute_variant3, dataflow, lobe_cache, VARIANT1_RANGE_SCALE
+from engine.lobes import compute_lobe_outline, lobe_area
+
+# Допуски квадратуры варианта 1 для проверки
+VARIANT1_TOLERANCES = (1e-2, 1e-4, 1e-6)
+
+
+def random_configuration(rng):
+    """
+    Случайная конфигурация варианта 3 с непустой областью пересечения
+
+    РЛС направлены примерно на общую точку, кольца проходят рядом с ней.
+
+    :return: Кортеж из двух РЛС и параметров колец
+    """
+    target = rng.uniform(-300, 300, 2)
+    stations = []
+    params = []
+    for _ in range(2):
+        position = rng.uniform(-500, 500, 2)
+        distance = np.hypot(*(target - position))
+        direction = np.degrees(np.arctan2(target[1] - position[1], target[0] - position[0]))
+        stations.append(RLS(*position, distance * rng.uniform(1, 2), direction + rng.uniform(-20, 20),
+                            rng.uniform(10, 90)))
+        error = rng.uniform(5, 40)
+        params += [distance - rng.uniform(0, error), error]
+    return stations[0], stations[1], params
+
+
+def _dense_lobe(rls, max_range):
+    x, y = compute_lobe_outline(rls.A, rls.W, max_range, threshold=1e-9, tolerance=1e-7)
+    return Polygon(np.column_stack((x + rls.x, y + rls.y)))
+
+
+def reference_area(rls1, rls2, radius_rls1, error_rls1, radius_rls2, error_rls2, samples=8000):
+    """Полигональная площадь варианта 3 с плотными окружностями и контурами ДНА."""
+    theta = np.linspace(0, 2 * np.pi, samples)
+
+    def disc(rls, radius):
+        return Polygon(np.column_stack((rls.x + radius * np.cos(theta), rls.y + radius * np.sin(theta))))
+
+    def lobe(rls):
+        return _dense_lobe(rls, rls.R)
+
+    ring1 = disc(rls1, radius_rls1 + error_rls1).difference(disc(rls1, radius_rls1))
+    ring2 = disc(rls2, radius_rls2 + error_rls2).difference(disc(rls2, radius_rls2))
+    return ring1.intersection(ring2).intersection(lobe(rls1)).intersection(lobe(rls2)).area
+
+
+def random_configuration1(rng):
+    """
+    Случайная конфигурация варианта 1 с непустой зоной эллипса
+
+    РЛС направлены примерно на общую точку, дальности R1 и R2 близки к расстояниям до неё,
+    дальность ДНА такова, что её граница может проходить через область.
+
+    :return: Кортеж из двух РЛС и параметров зон или None, если зона эллипса пуста
+    """
+    target = rng.uniform(-300, 300, 2)
+    stations = []
+    distances = []
+    for _ in range(2):
+        position = rng.uniform(-500, 500, 2)
+        distance = np.hypot(*(target - position))
+        direction = np.degrees(np.arctan2(target[1] - position[1], target[0] - position[0]))
+        stations.append(RLS(*position, distance * rng.uniform(0.6, 1.1), direction + rng.uniform(-15, 15),
+                            rng.uniform(5, 40)))
+        distances.append(distance)
+    E_ellipse, E_hyperbola = rng.uniform(5, 30, 2)
+    params = {
+        'R1': distances[0] - rng.uniform(0, E_ellipse),
+        'R2': distances[1] - rng.uniform(0, E_ellipse),
+        'E_ellipse': E_ellipse,
+        'E_hyperbola': E_hyperbola,
+    }
+    rls1, rls2 = stations
+    if params['R1'] + params['R2'] <= np.hypot(rls2.x - rls1.x, rls2.y - rls1.y):
+        return None
+    return rls1, rls2, params
+
+
+def reference_area1(rls1, rls2, R1, R2, E_ellipse, E_hyperbola, samples=20000):
+    """Полигональные площади варианта 1 с плотными эллипсами, гиперболами и контурами ДНА."""
+    dx, dy = rls2.x - rls1.x, rls2.y - rls1.y
+    c = np.hypot(dx, dy) / 2
+    axis = np.arctan2(dy, dx)
+    theta = np.linspace(0, 2 * np.pi, samples)
+
+    def ellipse(total):
+        a = total / 2
+        x, y = a * np.cos(theta), np.sqrt(a**2 - c**2) * np.sin(theta)
+        return Polygon(np.column_stack(((rls1.x + rls2.x) / 2 + x * np.cos(axis) - y * np.sin(axis),
+                                        (rls1.y + rls2.y) / 2 + x * np.sin(axis) + y * np.cos(axis))))
+
+    ellipse_zone = ellipse(R1 + R2 + 2 * E_ellipse).difference(ellipse(R1 + R2))
+    radius = 2 * c + 2 * VARIANT1_RANGE_SCALE * (rls1.R + rls2.R)
+    c_h1 = R2 - R1
+    band1 = hyperbola_band(rls1, rls2, c_h1 - 2 * E_hyperbola, c_h1 + 2 * E_hyperbola, radius, samples // 4)
+    band2 = hyperbola_band(rls1, rls2, -c_h1 - 2 * E_hyperbola, -c_h1 + 2 * E_hyperbola, radius, samples // 4)
+    lobe1 = _dense_lobe(rls1, rls1.R * VARIANT1_RANGE_SCALE)
+    lobe2 = _dense_lobe(rls2, rls2.R * VARIANT1_RANGE_SCALE)
+    return [ellipse_zone.intersection(band1).intersection(lobe1).intersection(lobe2).area,
+            ellipse_zone.intersection(band2).intersection(lobe1).area]
+
+
+def check_variant1(rng, count):
+    """Сравнение площадей варианта 1 по эталону для count конфигураций."""
+    cases = []
+    while len(cases) < count:
+        case = random_configuration1(rng)
+        if case is None:
+            continue
+        reference = reference_area1(*case[:2], **case[2])
+        if reference[0] > 1:
+            cases.append(case + (np.array(reference),))
+
+    references = np.array([case[3] for case in cases])
+    valid = references > 1
+
+    def relative(areas):
+        return np.abs(areas - references)[valid] / references[valid]
+
+    polygon = np.zeros_like(references)
+    start = time.perf_counter()
+    for i, (rls1, rls2, params, _reference) in enumerate(cases):
+        dataflow.clear()
+        lobe_cache.clear()
+        polygon[i] = compute_variant1(rls1, rls2, **params)['areas']
+    polygon_time = time.perf_counter() - start
+
+    stations1 = np.array([(c[0].x, c[0].y, c[0].R, c[0].A, c[0].W) for c in cases])
+    stations2 = np.array([(c[1].x, c[1].y, c[1].R, c[1].A, c[1].W) for c in cases])
+    params = {name: np.array([c[2][name] for c in cases]) for name in cases[0][2]}
+
+    print(f"Вариант 1, {len(cases)} конфигураций, относительная погрешность по эталону:")
+    print(f"{'':<16}{'медиана':>12}{'максимум':>12}{'оценка':>12}{'мкс/конф.':>12}")
+    errors = relative(polygon)
+    print(f"{'полигоны':<16}{np.median(errors):>12.2e}{np.max(errors):>12.2e}{'-':>12}"
+          f"{polygon_time / len(cases) * 1e6:>12.1f}")
+    for tolerance in VARIANT1_TOLERANCES:
+        start = time.perf_counter()
+        areas, estimates = variant1_area_batch(stations1, stations2, tolerance=tolerance, **params)
+        elapsed = time.perf_counter() - start
+        errors = relative(areas)
+        print(f"{f'допуск {tolerance:g}':<16}{np.median(errors):>12.2e}{np.max(errors):>12.2e}"
+              f"{np.max(estimates[valid] / references[valid]):>12.2e}{elapsed / len(cases) * 1e6:>12.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=40, help="Количество конфигураций")
+    parser.add_argument('--seed', type=int, default=3, help="Зерно генератора случайных чисел")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    cases = []
+    while len(cases) < args.count:
+        rls1, rls2, params = random_configuration(rng)
+        reference = reference_area(rls1, rls2, *params)
+        if reference > 1:
+            cases.append((rls1, rls2, params, reference))
+
+    analytic_errors = []
+    polygon_errors = []
+    polygon_time = 0.0
+    for rls1, rls2, params, reference in cases:
+        analytic_errors.append(abs(variant3_area(rls1, rls2, *params) - reference) / reference)
+        start = time.perf_counter()
+        dataflow.clear()
+        lobe_cache.clear()
+        polygon = compute_variant3(rls1, rls2, *params)['areas'][0]
+        polygon_time += time.perf_counter() - start
+        polygon_errors.append(abs(polygon - reference) / reference)
+
+    stations1 = np.array([(c[0].x, c[0].y, c[0].R, c[0].A, c[0].W) for c in cases])
+    stations2 = np.array([(c[1].x, c[1].y, c[1].R, c[1].A, c[1].W) for c in cases])
+    params = np.array([c[2] for c in cases]).T
+    start = time.perf_counter()
+    variant3_area_batch(stations1, stations2, *params)
+    batch_time = time.perf_counter() - start
+
+    print(f"Вариант 3, {len(cases)} конфигураций, относительная погрешность по эталону:")
+    print(f"{'':<12}{'медиана':>12}{'максимум':>12}{'мкс/конф.':>12}")
+    print(f"{'полигоны':<12}{np.median(polygon_errors):>12.2e}{np.max(polygon_errors):>12.2e}"
+          f"{polygon_time / len(cases) * 1e6:>12.1f}")
+    print(f"{'квадратура':<12}{np.median(analytic_errors):>12.2e}{np.max(analytic_errors):>12.2e}"
+          f"{batch_time / len(cases) * 1e6:>12.1f}")
+
+    lobe_errors = []
+    for rls1, _rls2, _params, _reference in cases:
+        x, y = compute_lobe_outline(rls1.A, rls1.W, rls1.R)
+        exact = lobe_area(rls1.W, rls1.R)
+        lobe_errors.append(abs(Polygon(np.column_stack((x, y))).area - exact) / exact)
+    print(f"Площадь ДНА: максимальное отличие контура от замкнутой формулы {np.max(lobe_errors):.2e}")
+
+    check_variant1(rng, args.count)
+
+
+if __name__ == '__main__':
+    main()
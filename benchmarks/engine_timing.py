@@ -0,0 +1,153 @@
+"""
+Замер пропускной способности расчёта вариантов (вычислений в секунду)
+
+Запуск без Qt (только геометрический движок):
+    python -m benchmarks.engine_timing
+
+Сравнение с полной перерисовкой окна (MainWindow.update_plot, требуется PyQt5):
+    python -m benchmarks.engine_timing --window
+
+Замер только этапа отрисовки (время и пиковый объём Python-аллокаций за кадр):
+    python -m benchmarks.engine_timing --render
+
+Статистика этапов движка после изменения одной погрешности (E_hyperbola):
+    python -m benchmarks.engine_timing --stages
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+from models.presets import VARIANT_DEFAULTS, preset_rls
+from engine.geometry import compute_variant, compute_variant1, dataflow
+
+
+def _variant_calls():
+    """Вызовы движка для конфигураций по умолчанию каждого варианта (без запомненных этапов)."""
+    def uncached(call):
+        def wrapper():
+            dataflow.clear()
+            return call()
+        return wrapper
+
+    calls = {
+        variant: (lambda variant=variant: compute_variant(variant, *preset_rls(variant - 1), **VARIANT_DEFAULTS[variant]))
+        for variant in (1, 2, 3)
+    }
+    return {variant: uncached(call) for variant, call in calls.items()}
+
+
+def stage_stats():
+    """
+    Статистика этапов варианта 1 после изменения только погрешности гипербол
+
+    :return: Словарь {имя этапа: {'hits': ..., 'misses': ...}}
+    """
+    rls1, rls2 = preset_rls(0)
+    dataflow.clear()
+    compute_variant1(rls1, rls2, 300, 550, 10, 15)
+    compute_variant1(rls1, rls2, 300, 550, 10, 16)
+    return {name: stats for name, stats in dataflow.stats().items() if name.startswith('variant1.')}
+
+
+def measure(func, duration):
+    """
+    Замер количества вызовов функции в секунду
+
+    :param func: Функция без аргументов
+    :param duration: Минимальная длительность замера в секундах
+    :return: Количество вызовов в секунду
+    """
+    func()
+    count = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < duration:
+        func()
+        count += 1
+        elapsed = time.perf_counter() - start
+    return count / elapsed
+
+
+def _window_calls():
+    """Вызовы полной перерисовки окна для каждого варианта (Qt, offscreen)."""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    from ui.main_window import MainWindow
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    window = MainWindow()
+
+    def make_call(index):
+        def call():
+            if window.combo_box.currentIndex() != index:
+                window.combo_box.setCurrentIndex(index)
+            window.update_plot()
+        return call
+
+    return app, window, {variant: make_call(variant - 1) for variant in (1, 2, 3)}
+
+
+def measure_render(window, variant, duration):
+    """
+    Замер этапа отрисовки MainWindow для готового результата расчёта
+
+    :param window: Экземпляр MainWindow
+    :param variant: Номер варианта
+    :param duration: Минимальная длительность замера в секундах
+    :return: Кортеж из времени отрисовки кадра в мс и пикового объёма аллокаций в КиБ
+    """
+    if window.combo_box.currentIndex() != variant - 1:
+        window.combo_box.setCurrentIndex(variant - 1)
+    snapshot = window._snapshot_parameters()
+    result = window._compute_snapshot(snapshot)
+    frames_per_second = measure(lambda: window._render(snapshot, result), duration)
+
+    tracemalloc.start()
+    window._render(snapshot, result)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return 1000 / frames_per_second, peak / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--duration', type=float, default=2.0, help="Длительность замера одного варианта, с")
+    parser.add_argument('--window', action='store_true', help="Также замерить MainWindow.update_plot")
+    parser.add_argument('--render', action='store_true', help="Замерить только этап отрисовки MainWindow")
+    parser.add_argument('--stages', action='store_true', help="Показать статистику этапов после изменения E_hyperbola")
+    args = parser.parse_args(argv)
+
+    if args.stages:
+        print(f"{'Этап':<26}{'попадания':>12}{'пересчёты':>12}")
+        for name, stats in stage_stats().items():
+            print(f"{name:<26}{stats['hits']:>12}{stats['misses']:>12}")
+        return
+
+    if args.render:
+        _app, window, _calls = _window_calls()
+        print(f"{'Вариант':<10}{'отрисовка, мс':>16}{'аллокации, КиБ':>18}")
+        for variant in (1, 2, 3):
+            frame_ms, peak_kib = measure_render(window, variant, args.duration)
+            print(f"{variant:<10}{frame_ms:>16.2f}{peak_kib:>18.1f}")
+        return
+
+    engine_calls = _variant_calls()
+    window_calls = None
+    if args.window:
+        _app, _window, window_calls = _window_calls()
+
+    header = f"{'Вариант':<10}{'движок, выч/с':>16}"
+    if window_calls:
+        header += f"{'окно, выч/с':>16}"
+    print(header)
+    for variant, call in engine_calls.items():
+        line = f"{variant:<10}{measure(call, args.duration):>16.1f}"
+        if window_calls:
+            line += f"{measure(window_calls[variant], args.duration):>16.1f}"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""
+Замер времени запуска и проверка импорта модулей расчёта без Qt
+
+Каждый модуль импортируется в отдельном процессе Python («холодный» запуск,
+как у процесса пула): выводятся лучшие из нескольких повторов время импорта
+и полное время процесса, а также загруженные тяжёлые пакеты. Модули расчёта
+не должны загружать пакеты интерфейса (PyQt5, pyqtgraph) и пакеты, нужные
+только отдельным функциям (scipy); модули без полигонов - ещё и shapely.
+При нарушении код возврата 1.
+
+Запуск:
+    python -m benchmarks.startup
+
+Также замерить запуск приложения до первого кадра (main.py, требуется PyQt5):
+    python -m benchmarks.startup --window
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Корневой каталог проекта
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Пакеты интерфейса
+QT_PACKAGES = ('PyQt5', 'pyqtgraph')
+
+# Пакеты, загружаемые только при вызове использующих их функций
+LAZY_PACKAGES = ('scipy', 'matplotlib')
+
+# Пакеты, отображаемые в таблице
+REPORTED_PACKAGES = ('numpy', 'shapely', 'sqlite3', *LAZY_PACKAGES, *QT_PACKAGES)
+
+# Модули расчёта без полигонов (не загружают shapely)
+ARRAY_MODULES = (
+    'utils.ellipse_calculator',
+    'utils.hyperbola_calculator',
+    'models.rls',
+    'models.presets',
+    'engine.lobes',
+    'engine.predicates',
+    'engine.analytic',
+    'engine.solvers',
+    'engine.accuracy',
+    'engine.raster',
+    'engine.montecarlo',
+)
+
+# Модули расчёта с полигонами и пакетные сценарии
+POLYGON_MODULES = (
+    'engine.geometry',
+    'engine.network',
+    'engine.result_cache',
+    'sweep',
+    'optimizer',
+)
+
+# Код дочернего процесса: время импорта модуля и загруженные пакеты верхнего уровня
+_IMPORT_CODE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+if sys.argv[1]:
+    importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - start
+print(json.dumps({'import_ms': elapsed * 1000, 'packages': sorted({name.split('.')[0] for name in sys.modules})}))
+"""
+
+
+def _environment():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, (ROOT, env.get('PYTHONPATH'))))
+    return env
+
+
+def _run(args, env):
+    """Запуск процесса Python; возвращает последнюю строку вывода (JSON) и полное время процесса в мс."""
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else
+                           f"код возврата {completed.returncode}")
+    return json.loads(completed.stdout.strip().splitlines()[-1]), elapsed
+
+
+def import_time(module, repeat=5):
+    """
+    Холодный импорт модуля в отдельном процессе
+
+    :param module: Имя модуля ('' - пустой процесс Python)
+    :param repeat: Количество повторов
+    :return: Словарь с лучшими временем импорта ('import_ms') и процесса ('process_ms'), мс,
+             и загруженными пакетами верхнего уровня ('packages')
+    """
+    env = _environment()
+    best = None
+    for _ in range(repeat):
+        result, process_ms = _run(['-c', _IMPORT_CODE, module], env)
+        result['process_ms'] = process_ms
+        if best is None:
+            best = result
+        else:
+            best['import_ms'] = min(best['import_ms'], result['import_ms'])
+            best['process_ms'] = min(best['process_ms'], process_ms)
+    return best
+
+
+def check_imports(repeat=5):
+    """
+    Замер и проверка импорта модулей расчёта
+
+    :param repeat: Количество повторов каждого замера
+    :return: Список кортежей (модуль, результат import_time, запрещённые загруженные пакеты)
+    """
+    rows = [('python', import_time('', repeat), [])]
+    for modules, forbidden in ((ARRAY_MODULES, QT_PACKAGES + LAZY_PACKAGES + ('shapely',)),
+                               (POLYGON_MODULES, QT_PACKAGES + LAZY_PACKAGES)):
+        for module in modules:
+            result = import_time(module, repeat)
+            rows.append((module, result, [name for name in forbidden if name in result['packages']]))
+    return rows
+
+
+def startup_time(repeat=3):
+    """
+    Запуск приложения (main.py) до первого кадра
+
+    :param repeat: Количество повторов
+    :return: Словарь этапов лучшего запуска, мс: импорт ('imports_ms'), создание окна ('window_ms'),
+             первый кадр от начала main.py ('first_frame_ms') и полное время процесса ('process_ms')
+    """
+    env = _environment()
+    env['RLS_STARTUP_TIMING'] = '1'
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    best = None
+    for _ in range(repeat):
+        result, process_ms = _run([os.path.join(ROOT, 'main.py')], env)
+        result['process_ms'] = process_ms
+        if best is None or result['first_frame_ms'] < best['first_frame_ms']:
+            best = result
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help="Количество повторов каждого замера")
+    parser.add_argument('--window', action='store_true', help="Также замерить запуск main.py до первого кадра")
+    args = parser.parse_args(argv)
+
+    failed = False
+    print(f"{'Модуль':<30}{'импорт, мс':>12}{'процесс, мс':>13}  пакеты")
+    for module, result, violations in check_imports(args.repeat):
+        packages = ', '.join(name for name in REPORTED_PACKAGES if name in result['packages'])
+        print(f"{module:<30}{result['import_ms']:>12.1f}{result['process_ms']:>13.1f}  {packages}")
+        if violations:
+            failed = True
+            print(f"  ошибка: {module} загружает {', '.join(violations)}", file=sys.stderr)
+
+    if args.window:
+        result = startup_time(min(args.repeat, 3))
+        print(f"\nЗапуск main.py: импорт {result['imports_ms']:.0f} мс, окно {result['window_ms']:.0f} мс, "
+              f"первый кадр {result['first_frame_ms']:.0f} мс (процесс до выхода {result['process_ms']:.0f} мс)")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""
+Набор замеров горячих участков геометрического движка (без Qt)
+
+Каждый замер выполняется на сетке конфигураций РЛС, включающей начальные
+конфигурации приложения (models/presets.py). Варианты считаются «с нуля»:
+перед каждым вызовом сбрасываются кэш контуров ДНА и запомненные этапы.
+
+Запуск и вывод таблицы:
+    python -m benchmarks.suite
+
+Сохранение эталона:
+    python -m benchmarks.suite --save benchmarks/baseline.json
+
+Сравнение с эталоном (код возврата 1 при замедлении больше порога):
+    python -m benchmarks.suite --compare benchmarks/baseline.json --threshold 0.15
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from collections import OrderedDict
+
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+
+from models.presets import RLS_PRESETS, VARIANT_DEFAULTS
+from models.rls import RLS
+from engine.analytic import variant1_area, variant3_area
+from engine.geometry import compute_variant, dataflow, lobe_cache, VARIANT1_RANGE_SCALE
+from engine.lobes import compute_lobe
+from utils.ellipse_calculator import compute_ellipse
+from utils.hyperbola_calculator import compute_hyperbola
+
+# Минимальная длительность одного повтора замера, с
+MIN_REPEAT_TIME = 0.05
+
+# Порог замедления относительно эталона по умолчанию (доля)
+DEFAULT_THRESHOLD = 0.15
+
+
+def configurations():
+    """
+    Сетка конфигураций: начальные конфигурации приложения и набор расстановок РЛС
+
+    :return: Упорядоченный словарь {имя: (параметры РЛС 1, параметры РЛС 2, параметры вариантов)}
+    """
+    configs = OrderedDict()
+    for option, (params1, params2) in RLS_PRESETS.items():
+        configs[f'preset{option}'] = (params1, params2, VARIANT_DEFAULTS)
+
+    # Расстояние между РЛС, ширина ДНА; лучи направлены навстречу друг другу
+    for distance in (300, 600, 1200):
+        for width in (10, 30):
+            params1 = (0, 0, distance, 20, width)
+            params2 = (distance, 0, distance * 1.2, 160, width)
+            variant_params = {
+                1: {'R1': distance * 0.6, 'R2': distance * 0.7, 'E_ellipse': 10, 'E_hyperbola': 15},
+                2: {},
+                3: {'radius_rls1': distance * 0.6, 'error_rls1': 10, 'radius_rls2': distance * 0.6, 'error_rls2': 15},
+            }
+            configs[f'd{distance}_w{width}'] = (params1, params2, variant_params)
+    return configs
+
+
+def _cold(func):
+    """Вызов без кэшей движка, чтобы замерялся полный расчёт."""
+    def call():
+        lobe_cache.clear()
+        dataflow.clear()
+        return func()
+    return call
+
+
+def cases(params1, params2, variant_params):
+    """
+    Замеряемые вызовы для одной конфигурации
+
+    :return: Упорядоченный словарь {имя замера: функция без аргументов}
+    """
+    rls1, rls2 = RLS(*params1), RLS(*params2)
+    v1 = variant_params[1]
+    c_ellipse = v1['R1'] + v1['R2'] + 2 * v1['E_ellipse']
+    c_hyperbola = v1['R2'] - v1['R1'] + 2 * v1['E_hyperbola']
+
+    def lobe_polygons():
+        for rls in (rls1, rls2):
+            Polygon(np.column_stack(compute_lobe(rls, rls.R * VARIANT1_RANGE_SCALE)))
+
+    return OrderedDict([
+        ('compute_ellipse', lambda: compute_ellipse(rls1, rls2, c_ellipse)),
+        ('compute_hyperbola', lambda: compute_hyperbola(rls1, rls2, c_hyperbola)),
+        ('lobe_polygons', lobe_polygons),
+        ('variant1', _cold(lambda: compute_variant(1, rls1, rls2, **v1))),
+        ('variant1_analytic', lambda: variant1_area(rls1, rls2, **v1)),
+        ('variant2', _cold(lambda: compute_variant(2, rls1, rls2, **variant_params[2]))),
+        ('variant3', _cold(lambda: compute_variant(3, rls1, rls2, **variant_params[3]))),
+        ('variant3_analytic', lambda: variant3_area(rls1, rls2, **variant_params[3])),
+    ])
+
+
+def time_call(func, repeat):
+    """
+    Время одного вызова функции: минимум по повторам, каждый не короче MIN_REPEAT_TIME
+
+    :param func: Функция без аргументов
+    :param repeat: Количество повторов
+    :return: Время одного вызова в мкс
+    """
+    func()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_REPEAT_TIME:
+            break
+        number *= 2
+
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best * 1e6
+
+
+def run(repeat=3, only=None):
+    """
+    Выполнение всех замеров на сетке конфигураций
+
+    :param repeat: Количество повторов каждого замера
+    :param only: Имена замеров для выполнения (None - все)
+    :return: Словарь {имя замера: {'per_call_us': среднее геометрическое, 'configs': {конфигурация: мкс}}}
+    """
+    per_case = OrderedDict()
+    for config_name, config in configurations().items():
+        for case_name, func in cases(*config).items():
+            if only and case_name not in only:
+                continue
+            per_case.setdefault(case_name, OrderedDict())[config_name] = time_call(func, repeat)
+
+    return OrderedDict(
+        (case_name, {
+            'per_call_us': float(np.exp(np.mean(np.log(list(timings.values()))))),
+            'configs': timings,
+        })
+        for case_name, timings in per_case.items()
+    )
+
+
+def environment():
+    """Сведения об окружении, сохраняемые вместе с эталоном."""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'shapely': shapely.__version__,
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Сравнение результатов с эталоном
+
+    :param results: Результаты run()
+    :param baseline: Результаты из файла эталона
+    :param threshold: Допустимое относительное замедление
+    :return: Список строк таблицы и признак наличия замедлений
+    """
+    lines = [f"{'Замер':<20}{'эталон, мкс':>14}{'сейчас, мкс':>14}{'отношение':>11}"]
+    regressed = False
+    for case_name, result in results.items():
+        reference = baseline.get(case_name)
+        if reference is None:
+            lines.append(f"{case_name:<20}{'-':>14}{result['per_call_us']:>14.1f}{'новый':>11}")
+            continue
+        ratio = result['per_call_us'] / reference['per_call_us']
+        mark = ''
+        if ratio > 1 + threshold:
+            mark = '  ЗАМЕДЛЕНИЕ'
+            regressed = True
+        elif ratio < 1 - threshold:
+            mark = '  ускорение'
+        lines.append(f"{case_name:<20}{reference['per_call_us']:>14.1f}{result['per_call_us']:>14.1f}"
+                     f"{ratio:>11.2f}{mark}")
+    return lines, regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3, help="Количество повторов каждого замера")
+    parser.add_argument('--only', nargs='+', help="Выполнить только указанные замеры")
+    parser.add_argument('--save', metavar='PATH', help="Сохранить результаты как эталон")
+    parser.add_argument('--compare', metavar='PATH', help="Сравнить результаты с эталоном")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Допустимое относительное замедление при сравнении")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat, args.only)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        lines, regressed = compare(results, baseline['results'], args.threshold)
+        print("\n".join(lines))
+        if regressed:
+            return 1
+    else:
+        print(f"{'Замер':<20}{'мкс/вызов':>12}{'вызовов/с':>12}")
+        for case_name, result in results.items():
+            print(f"{case_name:<20}{result['per_call_us']:>12.1f}{1e6 / result['per_call_us']:>12.1f}")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment(), 'results': results}, f, ensure_ascii=False, indent=4)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,235 @@
+"""
+Поле точности местоопределения (граница Крамера-Рао для двух измерений)
+
+Измеряемые величины варианта (вариант 1 - сумма и разность расстояний d1 + d2,
+d2 - d1; вариант 3 - дальности d1, d2) имеют в точке цели градиенты, выражаемые
+через единичные векторы u1, u2 от РЛС к цели. Два измерения с СКО s1, s2
+определяют положение с ковариацией P = J^-1 * diag(s1^2, s2^2) * J^-T, где J -
+матрица градиентов; СКО местоопределения sqrt(trace P) - граница Крамера-Рао
+для несмещённых оценок (и геометрический фактор GDOP при s1 = s2 = 1).
+
+Поле строится на регулярной сетке плитками. Единичные векторы и маска ДНА
+каждой РЛС в плитке зависят только от этой РЛС, поэтому хранятся в кэше:
+при перемещении одной РЛС пересчитываются только её плитки, а плитки вне ДНА
+не считаются вовсе. Размер ячейки - степень двойки, подобранная по видимой
+области, поэтому плитки переиспользуются при перемещении видимой области.
+"""
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from engine.lobes import VARIANT1_RANGE_SCALE
+from engine.predicates import in_lobe
+
+# Размер плитки в ячейках (плитка ACCURACY_TILE x ACCURACY_TILE)
+ACCURACY_TILE = 64
+
+# Количество экранных пикселей на ячейку сетки
+ACCURACY_PIXELS = 2
+
+# Количество хранимых плиток РЛС
+ACCURACY_CACHE = 512
+
+# Порог вырожденности матрицы градиентов (цель на линии РЛС)
+_SINGULAR = 1e-9
+
+
+def measurement_errors(variant, **params):
+    """
+    Половины ширины зон измеряемых величин варианта
+
+    :param variant: Номер варианта (1 или 3)
+    :param params: Параметры зон и погрешностей соответствующего варианта
+    :return: Кортеж из двух половин ширины (вариант 1 - сумма и разность расстояний, вариант 3 - дальности)
+    """
+    if variant == 1:
+        return params['E_ellipse'], 2 * params['E_hyperbola']
+    if variant == 3:
+        return params['error_rls1'] / 2, params['error_rls2'] / 2
+    raise ValueError(f"Вариант {variant} не содержит измерений дальности")
+
+
+def unit_vectors(points, rls):
+    """
+    Единичные векторы от РЛС к точкам
+
+    :param points: Точки, массив формы (N, 2)
+    :param rls: РЛС объект
+    :return: Кортеж массивов ux, uy формы (N,)
+    """
+    dx, dy = points[:, 0] - rls.x, points[:, 1] - rls.y
+    distance = np.hypot(dx, dy)
+    return dx / distance, dy / distance
+
+
+def measurement_gradients(variant, u1, u2):
+    """
+    Строки матрицы J: градиенты двух измеряемых величин варианта
+
+    :param variant: Номер варианта (1 или 3)
+    :param u1: Единичные векторы (ux, uy) от первой РЛС
+    :param u2: Единичные векторы (ux, uy) от второй РЛС
+    :return: Кортеж (a, b, c, d): J = [[a, b], [c, d]]
+    """
+    (ux1, uy1), (ux2, uy2) = u1, u2
+    if variant == 1:
+        return ux1 + ux2, uy1 + uy2, ux2 - ux1, uy2 - uy1
+    return ux1, uy1, ux2, uy2
+
+
+def position_error(variant, u1, u2, sigma1, sigma2):
+    """
+    СКО местоопределения sqrt(trace P) по единичным векторам от РЛС
+
+    :param variant: Номер варианта (1 или 3)
+    :param u1: Единичные векторы (ux, uy) от первой РЛС
+    :param u2: Единичные векторы (ux, uy) от второй РЛС
+    :param sigma1: СКО первой измеряемой величины
+    :param sigma2: СКО второй измеряемой величины
+    :return: Массив СКО (NaN, где матрица градиентов вырождена)
+    """
+    a, b, c, d = measurement_gradients(variant, u1, u2)
+    det = a * d - b * c
+    with np.errstate(divide='ignore', invalid='ignore'):
+        error = np.sqrt(sigma1**2 * (c**2 + d**2) + sigma2**2 * (a**2 + b**2)) / np.abs(det)
+    return np.where(np.abs(det) > _SINGULAR, error, np.nan)
+
+
+def _range_scale(variant):
+    return VARIANT1_RANGE_SCALE if variant == 1 else 1.0
+
+
+def accuracy_field(variant, points, rls1, rls2, **params):
+    """
+    СКО местоопределения в точках внутри ДНА обеих РЛС
+
+    :param variant: Номер варианта (1 или 3)
+    :param points: Точки, массив формы (N, 2)
+    :param rls1: Первый РЛС объект
+    :param rls2: Второй РЛС объект
+    :param params: Параметры зон и погрешностей соответствующего варианта
+    :return: Массив формы (N,), NaN вне ДНА
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    scale = _range_scale(variant)
+    error = position_error(variant, unit_vectors(points, rls1), unit_vectors(points, rls2),
+                           *measurement_errors(variant, **params))
+    inside = in_lobe(points, rls1, rls1.R * scale) & in_lobe(points, rls2, rls2.R * scale)
+    return np.where(inside, error, np.nan)
+
+
+class AccuracyTiles:
+    """
+    Плиточный расчёт поля точности с LRU-кэшем плиток каждой РЛС
+
+    Плитка РЛС - единичные векторы от РЛС к центрам ячеек плитки и маска ДНА;
+    ключ плитки - параметры РЛС, дальность ДНА, размер ячейки и номер плитки.
+    """
+
+    def __init__(self, tile=ACCURACY_TILE, maxsize=ACCURACY_CACHE):
+        """
+        :param tile: Размер плитки в ячейках
+        :param maxsize: Максимальное количество хранимых плиток РЛС
+        """
+        self.tile = tile
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _station_tile(self, rls, max_range, cell, ix, iy):
+        """Единичные векторы и маска ДНА РЛС в плитке (ix, iy)."""
+        key = (float(rls.x), float(rls.y), float(rls.A), float(rls.W), float(max_range), cell, ix, iy)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        offsets = cell * (np.arange(self.tile) + 0.5)
+        x = ix * self.tile * cell + offsets
+        y = iy * self.tile * cell + offsets
+        points = np.stack(np.meshgrid(x, y), axis=-1).reshape(-1, 2)
+        ux, uy = unit_vectors(points, rls)
+        entry = (ux.astype(np.float32), uy.astype(np.float32), in_lobe(points, rls, max_range))
+
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def cell_size(self, view, pixels):
+        """
+        Размер ячейки для видимой области: степень двойки, дающая около ACCURACY_PIXELS пикселей на ячейку
+
+        :param view: Видимая область (x_min, y_min, x_max, y_max)
+        :param pixels: Ширина видимой области в пикселях
+        :return: Размер ячейки
+        """
+        width = max(view[2] - view[0], 1e-9)
+        return 2.0 ** math.ceil(math.log2(width * ACCURACY_PIXELS / max(pixels, 1)))
+
+    def render(self, variant, rls1, rls2, view, pixels, **params):
+        """
+        Поле СКО местоопределения, покрывающее видимую область
+
+        :param variant: Номер варианта (1 или 3)
+        :param rls1: Первый РЛС объект
+        :param rls2: Второй РЛС объект
+        :param view: Видимая область (x_min, y_min, x_max, y_max)
+        :param pixels: Ширина видимой области в пикселях
+        :param params: Параметры зон и погрешностей соответствующего варианта
+        :return: Кортеж из массива СКО формы (ny, nx) (строка 0 - нижняя, NaN вне ДНА)
+                 и прямоугольника (x_min, y_min, x_max, y_max), занимаемого массивом
+        """
+        sigma1, sigma2 = measurement_errors(variant, **params)
+        cell = self.cell_size(view, pixels)
+        span = self.tile * cell
+        ix0, iy0 = math.floor(view[0] / span), math.floor(view[1] / span)
+        ix1, iy1 = math.ceil(view[2] / span), math.ceil(view[3] / span)
+
+        scale = _range_scale(variant)
+        stations = [(rls, rls.R * scale) for rls in (rls1, rls2)]
+        field = np.full(((iy1 - iy0) * self.tile, (ix1 - ix0) * self.tile), np.nan, dtype=np.float32)
+        for iy in range(iy0, iy1):
+            for ix in range(ix0, ix1):
+                # Плитка вне круга дальности любой из РЛС лежит вне пересечения ДНА
+                x_min, y_min = ix * span, iy * span
+                if any(rls.x + max_range < x_min or rls.x - max_range > x_min + span
+                       or rls.y + max_range < y_min or rls.y - max_range > y_min + span
+                       for rls, max_range in stations):
+                    continue
+
+                (ux1, uy1, inside1), (ux2, uy2, inside2) = (
+                    self._station_tile(rls, max_range, cell, ix, iy) for rls, max_range in stations)
+                error = position_error(variant, (ux1, uy1), (ux2, uy2), sigma1, sigma2)
+                error[~(inside1 & inside2)] = np.nan
+                row, column = (iy - iy0) * self.tile, (ix - ix0) * self.tile
+                field[row:row + self.tile, column:column + self.tile] = error.reshape(self.tile, self.tile)
+        return field, (ix0 * span, iy0 * span, ix1 * span, iy1 * span)
+
+    def stats(self):
+        """
+        Статистика использования кэша
+
+        :return: Словарь с количеством попаданий, промахов и хранимых плиток
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+    def clear(self):
+        """Очистка кэша и счётчиков."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Кэш плиток поля точности, общий для интерфейса
+accuracy_tiles = AccuracyTiles()
@@ -0,0 +1,709 @@
+"""
+Площади без построения полигонов
+
+Площадь ДНА имеет замкнутую форму (engine.lobes.lobe_area). Площадь
+пересечения колец дальности и двух ДНА (вариант 3) считается квадратурой
+в полярных координатах первой РЛС. Угол перебирается только внутри углового
+сектора, в котором кольца вообще пересекаются; сектор делится на участки в
+точках излома подынтегральной функции (пересечения и касательные окружностей,
+пересечения окружностей колец с границей ДНА первой РЛС), и на каждом участке
+берутся узлы Гаусса-Лежандра. На каждом луче отрезки колец и граница ДНА первой
+РЛС находятся точно, граница ДНА второй РЛС - по знаку разности дальности ДНА
+и расстояния до РЛС с линейной интерполяцией корня.
+
+Площади варианта 1 считаются в эллиптических координатах с фокусами в РЛС,
+где зона эллипса и зоны гипербол - прямоугольники; ДНА учитываются
+адаптивной квадратурой с заданной точностью и оценкой погрешности.
+
+Все функции векторизованы по конфигурациям: параметры РЛС передаются
+массивом формы (N, 5) или (5,) в порядке (x, y, R, A, W) или таблицей
+models.rls.StationTable.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from engine.lobes import VARIANT1_RANGE_SCALE, attenuation_factor, lobe_half_width
+
+# Количество узлов квадратуры по углу на каждом участке сектора пересечения колец
+ANALYTIC_RAYS = 6
+
+# Количество точек проверки ДНА второй РЛС на каждом отрезке луча
+ANALYTIC_SAMPLES = 12
+
+# Количество направлений просмотра границы ДНА при поиске вершин области
+_LOBE_GRID = 32
+
+# Максимальное количество пересечений границы ДНА с одной кривой
+_CROSSINGS = 4
+
+# Допустимая относительная погрешность площадей варианта 1 по умолчанию
+QUADRATURE_TOLERANCE = 1e-4
+
+# Количество узлов квадратуры по nu на каждом участке (вариант 1)
+QUADRATURE_NODES = 5
+
+# Количество точек проверки ДНА на каждом луче (вариант 1)
+QUADRATURE_SAMPLES = 9
+
+# Начальное количество участков по nu в каждой полуплоскости и предел делений пополам
+_INITIAL_PANELS = 2
+_MAX_BISECTIONS = 12
+
+# Предел удвоений количества точек проверки ДНА на лучах
+_MAX_SAMPLE_DOUBLINGS = 3
+
+# Количество шагов уточнения границы ДНА методом ложного положения на лучах
+# и вершин областей (вершины должны быть точными: область может начинаться скачком)
+_ROOT_STEPS = 3
+_CROSSING_STEPS = 5
+
+
+@lru_cache(maxsize=8)
+def _legendre(rays):
+    """Узлы и веса Гаусса-Лежандра на [-1, 1] (только для чтения)."""
+    nodes, weights = np.polynomial.legendre.leggauss(rays)
+    nodes.flags.writeable = False
+    weights.flags.writeable = False
+    return nodes, weights
+
+
+def _stations(stations):
+    """Разбор массива параметров РЛС на столбцы x, y, R, A, W формы (N,)."""
+    stations = np.atleast_2d(np.asarray(stations, dtype=float))
+    return tuple(stations[:, i] for i in range(5))
+
+
+def lobe_radius(R, A, W, phi):
+    """
+    Дальность ДНА в направлении phi
+
+    :param R: Максимальная дальность ДНА
+    :param A: Угол направления ДНА, градусы
+    :param W: Ширина ДНА, градусы
+    :param phi: Направление, радианы
+    :return: Дальность границы ДНА
+    """
+    delta = (np.rad2deg(phi) - A + 180) % 360 - 180
+    return R * np.exp(-attenuation_factor(W) * delta**2)
+
+
+def _ring_sector(distance, inner1, outer1, inner2, outer2):
+    """
+    Угловой сектор пересечения колец, видимый из первой РЛС
+
+    Угол theta между лучом и направлением на вторую РЛС связан с расстояниями
+    теоремой косинусов: cos(theta) = (d1^2 + D^2 - d2^2) / (2 * d1 * D). Крайние
+    значения достигаются на границах колец или в точке минимума по d1.
+
+    :return: Кортеж из границ theta_low, theta_high в радианах
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corners = [
+            (d1**2 + distance**2 - d2**2) / (2 * d1 * distance)
+            for d1 in (inner1, outer1) for d2 in (inner2, outer2)
+        ]
+        cos_max = np.max(corners, axis=0)
+        cos_min = np.min(corners, axis=0)
+
+        # Минимум по d1 при d2 = outer2 достигается в d1 = sqrt(D^2 - outer2^2)
+        critical = np.sqrt(np.maximum(distance**2 - outer2**2, 0))
+        inside = (distance > outer2) & (critical > inner1) & (critical < outer1)
+        cos_min = np.where(inside, np.minimum(cos_min, critical / distance), cos_min)
+
+    # Совпадающие РЛС: кольца концентричны, ограничения по углу нет
+    coincident = distance == 0
+    cos_max = np.where(coincident, 1.0, np.nan_to_num(cos_max, nan=1.0))
+    cos_min = np.where(coincident, -1.0, np.nan_to_num(cos_min, nan=-1.0))
+    return np.arccos(np.clip(cos_max, -1, 1)), np.arccos(np.clip(cos_min, -1, 1))
+
+
+def _lobe_point(station, phi):
+    """Точка границы ДНА РЛС station в направлении phi (радианы)."""
+    x, y, R, A, W = (value[:, None] for value in station)
+    rho = lobe_radius(R, A, W, phi)
+    return x + rho * np.cos(phi), y + rho * np.sin(phi)
+
+
+def _lobe_crossings(station, residual, steps=2):
+    """
+    Точки границы ДНА, в которых функция residual(x, y) меняет знак
+
+    Граница ДНА просматривается по сетке направлений внутри диапазона выше
+    порога затухания, корни уточняются методом ложного положения.
+
+    :param station: Столбцы параметров РЛС (x, y, R, A, W) формы (N,)
+    :param residual: Функция координат точек формы (N, M)
+    :param steps: Количество шагов уточнения корней
+    :return: Кортеж из x и y координат не более _CROSSINGS точек формы (N, _CROSSINGS), NaN - нет точки
+    """
+    _x, _y, _R, A, W = station
+    grid = np.linspace(-1, 1, _LOBE_GRID)
+    phi = np.deg2rad(A[:, None] + lobe_half_width(W)[:, None] * grid)
+    h = residual(*_lobe_point(station, phi))
+
+    a, b = phi[:, :-1], phi[:, 1:]
+    h_a, h_b = h[:, :-1], h[:, 1:]
+    change = (h_a > 0) != (h_b > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for _ in range(steps):
+            root = np.where(change, a - h_a * (b - a) / (h_b - h_a), a)
+            h_root = residual(*_lobe_point(station, root))
+            left = (h_root > 0) == (h_a > 0)
+            a, h_a = np.where(left, root, a), np.where(left, h_root, h_a)
+            b, h_b = np.where(left, b, root), np.where(left, h_b, h_root)
+        root = np.where(change, a - h_a * (b - a) / (h_b - h_a), np.nan)
+
+    # Найденные точки переносятся в начало строки
+    order = np.argsort(~change, axis=-1, kind='stable')[:, :_CROSSINGS]
+    return _lobe_point(station, np.take_along_axis(root, order, axis=-1))
+
+
+def _sector_breakpoints(station1, station2, inner1, outer1, inner2, outer2, distance, direction):
+    """
+    Углы theta (от направления на вторую РЛС), в которых подынтегральная функция имеет излом
+
+    Это направления из первой РЛС на вершины области: пересечения окружностей
+    колец между собой и с границами ДНА, пересечения границ ДНА и касательные
+    к окружностям второй РЛС.
+
+    :return: Массив формы (N, 2, K) для двух сторон от направления на вторую РЛС (NaN - нет точки)
+    """
+    x1, y1, R1, A1, W1 = station1
+    x2, y2, R2, A2, W2 = station2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Пересечения окружностей колец и касательные из первой РЛС к окружностям второй
+        cosines = [
+            (d1**2 + distance**2 - d2**2) / (2 * d1 * distance)
+            for d1 in (inner1, outer1) for d2 in (inner2, outer2)
+        ]
+        symmetric = [np.where(np.abs(c) <= 1, np.arccos(c), np.nan) for c in cosines]
+        symmetric += [np.where(d2 < distance, np.arcsin(d2 / distance), np.nan) for d2 in (inner2, outer2)]
+        symmetric = np.stack(symmetric, axis=-1)
+
+        # Пересечения границы ДНА с окружностями кольца той же РЛС (в замкнутой форме)
+        points_x, points_y = [], []
+        for (x, y, R, A, W), radii in ((station1, (inner1, outer1)), (station2, (inner2, outer2))):
+            k = attenuation_factor(W)
+            for radius in radii:
+                offset = np.sqrt(np.log(R / radius) / k)
+                for sign in (1, -1):
+                    phi = np.deg2rad(A + sign * offset)
+                    points_x.append((x + radius * np.cos(phi))[:, None])
+                    points_y.append((y + radius * np.sin(phi))[:, None])
+
+    # Пересечения границы ДНА с окружностями кольца другой РЛС и границ ДНА между собой
+    def circle(x, y, radius):
+        return lambda qx, qy: np.hypot(qx - x[:, None], qy - y[:, None]) - radius[:, None]
+
+    def lobe(x, y, R, A, W):
+        def residual(qx, qy):
+            dx, dy = qx - x[:, None], qy - y[:, None]
+            return np.hypot(dx, dy) - lobe_radius(R[:, None], A[:, None], W[:, None], np.arctan2(dy, dx))
+        return residual
+
+    for station, residual in ((station1, circle(x2, y2, inner2)), (station1, circle(x2, y2, outer2)),
+                              (station2, circle(x1, y1, inner1)), (station2, circle(x1, y1, outer1)),
+                              (station1, lobe(*station2))):
+        crossing_x, crossing_y = _lobe_crossings(station, residual)
+        points_x.append(crossing_x)
+        points_y.append(crossing_y)
+
+    points_x = np.concatenate(points_x, axis=-1)
+    points_y = np.concatenate(points_y, axis=-1)
+    angles = np.arctan2(points_y - y1[:, None], points_x - x1[:, None])
+    relative = (angles - direction[:, None] + np.pi) % (2 * np.pi) - np.pi
+
+    sides = [np.concatenate([symmetric, sign * relative], axis=-1) for sign in (1, -1)]
+    return np.stack(sides, axis=1)
+
+
+def _lobe_measure(x1, y1, phi, start, stop, station2, samples):
+    """
+    Интеграл r dr по части отрезков лучей [start, stop], лежащей внутри ДНА второй РЛС
+
+    Все аргументы - массивы формы (M,) по отрезкам лучей.
+
+    :return: Массив значений интеграла формы (M,)
+    """
+    x2, y2, R2, A2, W2 = (value[..., None] for value in station2)
+    t = np.linspace(0, 1, samples)
+    r = start[..., None] + (stop - start)[..., None] * t
+
+    px = x1[..., None] + r * np.cos(phi)[..., None] - x2
+    py = y1[..., None] + r * np.sin(phi)[..., None] - y2
+    g = lobe_radius(R2, A2, W2, np.arctan2(py, px)) - np.hypot(px, py)
+
+    r_a, r_b = r[..., :-1], r[..., 1:]
+    g_a, g_b = g[..., :-1], g[..., 1:]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        root = r_a + (r_b - r_a) * g_a / (g_a - g_b)
+
+    inside_a = g_a >= 0
+    inside_b = g_b >= 0
+    measure = np.where(inside_a & inside_b, r_b**2 - r_a**2, 0.0)
+    measure = np.where(inside_a & ~inside_b, root**2 - r_a**2, measure)
+    measure = np.where(~inside_a & inside_b, r_b**2 - root**2, measure)
+    return 0.5 * measure.sum(axis=-1)
+
+
+def variant3_area_batch(stations1, stations2, radius_rls1, error_rls1, radius_rls2, error_rls2,
+                        rays=ANALYTIC_RAYS, samples=ANALYTIC_SAMPLES):
+    """
+    Площадь пересечения колец погрешности и ДНА (вариант 3) без построения полигонов
+
+    :param stations1: Параметры первых РЛС (x, y, R, A, W), массив формы (N, 5) или (5,) либо таблица РЛС
+    :param stations2: Параметры вторых РЛС (x, y, R, A, W), массив формы (N, 5) или (5,) либо таблица РЛС
+    :param radius_rls1: Измеренные дальности первой РЛС, массив формы (N,) или скаляр
+    :param error_rls1: Погрешности дальности первой РЛС
+    :param radius_rls2: Измеренные дальности второй РЛС
+    :param error_rls2: Погрешности дальности второй РЛС
+    :param rays: Количество узлов квадратуры по углу в каждом секторе
+    :param samples: Количество точек проверки ДНА второй РЛС на отрезке луча
+    :return: Массив площадей формы (N,)
+    """
+    columns = np.broadcast_arrays(
+        *_stations(stations1), *_stations(stations2),
+        *(np.atleast_1d(np.asarray(value, dtype=float))
+          for value in (radius_rls1, error_rls1, radius_rls2, error_rls2))
+    )
+    station1, station2 = tuple(columns[:5]), tuple(columns[5:10])
+    inner1, error1, inner2, error2 = columns[10:]
+    x1, y1, R1, A1, W1 = station1
+    x2, y2 = station2[:2]
+    outer1 = inner1 + error1
+    outer2 = inner2 + error2
+
+    distance = np.hypot(x2 - x1, y2 - y1)
+    direction = np.arctan2(y2 - y1, x2 - x1)
+    theta_low, theta_high = _ring_sector(distance, inner1, outer1, inner2, outer2)
+
+    def column(value):
+        return value[:, None, None]
+
+    # Участки сектора между точками излома для каждой стороны от направления на РЛС 2
+    breakpoints = _sector_breakpoints(station1, station2, inner1, outer1, inner2, outer2, distance, direction)
+    breakpoints = np.clip(np.nan_to_num(breakpoints, nan=-1.0), column(theta_low), column(theta_high))
+    edges = np.sort(np.concatenate([np.broadcast_to(column(theta_low), breakpoints.shape[:2] + (1,)),
+                                    breakpoints,
+                                    np.broadcast_to(column(theta_high), breakpoints.shape[:2] + (1,))],
+                                   axis=-1), axis=-1)
+
+    # Узлы по углу только на участках ненулевой ширины: одномерные массивы по лучам
+    sides = np.broadcast_to(np.array([1.0, -1.0])[:, None], edges.shape[1:2] + (edges.shape[2] - 1,))
+    half = (edges[..., 1:] - edges[..., :-1]) / 2
+    panels = half > 0
+    rows = np.broadcast_to(np.arange(len(x1))[:, None, None], half.shape)[panels]
+    nodes, weights = _legendre(rays)
+    theta = (((edges[..., 1:] + edges[..., :-1]) / 2)[panels][:, None] + half[panels][:, None] * nodes).ravel()
+    weights = (half[panels][:, None] * weights).ravel()
+    phi = direction[rows].repeat(rays) + np.broadcast_to(sides, half.shape)[panels].repeat(rays) * theta
+    rows = rows.repeat(rays)
+
+    # Отрезок луча внутри кольца и ДНА первой РЛС
+    start = inner1[rows]
+    stop = np.minimum(outer1[rows], lobe_radius(R1[rows], A1[rows], W1[rows], phi))
+
+    # Кольцо второй РЛС: d2^2 = r^2 - 2 r D cos(theta) + D^2
+    along = distance[rows] * np.cos(theta)
+    across2 = (distance[rows] * np.sin(theta))**2
+    outer_disc = outer2[rows]**2 - across2
+    outer_root = np.sqrt(np.maximum(outer_disc, 0))
+    start = np.maximum(start, along - outer_root)
+    stop = np.where(outer_disc >= 0, np.minimum(stop, along + outer_root), start)
+
+    inner_disc = inner2[rows]**2 - across2
+    inner_root = np.sqrt(np.maximum(inner_disc, 0))
+    cut_start = np.where(inner_disc > 0, along - inner_root, start)
+    cut_stop = np.where(inner_disc > 0, along + inner_root, start)
+
+    # Не более двух отрезков на луче: до и после внутреннего круга второй РЛС;
+    # граница ДНА второй РЛС проверяется только на непустых отрезках
+    radial = np.zeros(len(phi))
+    for seg_start, seg_stop in ((start, np.minimum(stop, cut_start)), (np.maximum(start, cut_stop), stop)):
+        active = seg_stop > seg_start
+        seg_rows = rows[active]
+        radial[active] += _lobe_measure(x1[seg_rows], y1[seg_rows], phi[active], seg_start[active],
+                                        seg_stop[active], tuple(value[seg_rows] for value in station2), samples)
+
+    return np.bincount(rows, weights=radial * weights, minlength=len(x1))
+
+
+def variant3_area(rls1, rls2, radius_rls1, error_rls1, radius_rls2, error_rls2,
+                  rays=ANALYTIC_RAYS, samples=ANALYTIC_SAMPLES):
+    """
+    Площадь пересечения колец погрешности и ДНА (вариант 3) для одной конфигурации
+
+    :param rls1: Первый РЛС объект
+    :param rls2: Второй РЛС объект
+    :param radius_rls1: Измеренная дальность первой РЛС
+    :param error_rls1: Погрешность дальности первой РЛС
+    :param radius_rls2: Измеренная дальность второй РЛС
+    :param error_rls2: Погрешность дальности второй РЛС
+    :param rays: Количество узлов квадратуры по углу в каждом секторе
+    :param samples: Количество точек проверки ДНА второй РЛС на отрезке луча
+    :return: Площадь
+    """
+    stations1 = (rls1.x, rls1.y, rls1.R, rls1.A, rls1.W)
+    stations2 = (rls2.x, rls2.y, rls2.R, rls2.A, rls2.W)
+    return float(variant3_area_batch(stations1, stations2, radius_rls1, error_rls1, radius_rls2, error_rls2,
+                                     rays, samples)[0])
+
+
+def _elliptic_margin(params, lobe, mu, nu):
+    """
+    Запас дальности ДНА в точке с эллиптическими координатами (mu, nu)
+
+    Точка: x' = c * cosh(mu) * cos(nu), y' = c * sinh(mu) * sin(nu) в системе
+    с началом в середине между РЛС и осью x' от РЛС 1 к РЛС 2.
+
+    :param params: Столбцы таблицы областей (см. _ELLIPTIC_COLUMNS), согласованные по форме с mu
+    :param lobe: Номер ДНА (0 - первая РЛС, 1 - вторая)
+    :return: Запас дальности: >= 0 - точка внутри ДНА (для неучитываемой ДНА всегда 1)
+    """
+    mx, my, c, cos_axis, sin_axis = params[:5]
+    x0, y0, R, A, W = params[5 + 5 * lobe:10 + 5 * lobe]
+    px = c * np.cosh(mu) * np.cos(nu)
+    py = c * np.sinh(mu) * np.sin(nu)
+    dx = mx + px * cos_axis - py * sin_axis - x0
+    dy = my + px * sin_axis + py * cos_axis - y0
+    margin = lobe_radius(R, A, W, np.arctan2(dy, dx)) - np.hypot(dx, dy)
+    return margin if lobe == 0 else np.where(params[15] > 0, margin, 1.0)
+
+
+# Столбцы таблицы областей варианта 1: система координат, ДНА двух РЛС,
+# признак учёта ДНА второй РЛС и диапазон mu зоны эллипса
+_ELLIPTIC_COLUMNS = 18
+
+
+def _elliptic_measure(params, nu, samples):
+    """
+    Интеграл элемента площади c^2 (cosh^2(mu) - cos^2(nu)) dmu по части отрезка
+    [mu_low, mu_high], лежащей внутри ДНА, при фиксированном nu
+
+    Граница каждой ДНА ищется по знаку её запаса дальности в samples точках и
+    уточняется методом ложного положения; на каждом интервале между точками
+    части внутри двух ДНА пересекаются, элемент площади интегрируется точно.
+
+    :param params: Таблица лучей формы (M, _ELLIPTIC_COLUMNS)
+    :param nu: Угловые координаты лучей формы (M,)
+    :param samples: Количество точек проверки ДНА на отрезке
+    :return: Массив значений интеграла формы (M,)
+    """
+    columns = tuple(params.T)
+    c, mu_low, mu_high = columns[2], columns[16], columns[17]
+    cos2 = np.cos(nu)**2
+
+    mu = mu_low[:, None] + (mu_high - mu_low)[:, None] * np.linspace(0, 1, samples)
+    a, b = mu[:, :-1], mu[:, 1:]
+    lower, upper = a, b
+    for lobe in (0, 1):
+        g = _elliptic_margin(tuple(value[:, None] for value in columns), lobe, mu, nu[:, None])
+        inside_a, inside_b = g[:, :-1] >= 0, g[:, 1:] >= 0
+        lobe_lower = np.where(inside_a, a, b)
+        lobe_upper = np.where(inside_b, b, a)
+
+        # Уточнение границы ДНА только на интервалах со сменой знака
+        ray, k = np.nonzero(inside_a != inside_b)
+        if len(ray):
+            ray_params = tuple(value[ray] for value in columns)
+            ray_nu = nu[ray]
+            left, right = a[ray, k], b[ray, k]
+            g_left, g_right = g[ray, k], g[ray, k + 1]
+            for _ in range(_ROOT_STEPS):
+                root = left - g_left * (right - left) / (g_right - g_left)
+                g_root = _elliptic_margin(ray_params, lobe, root, ray_nu)
+                same = (g_root >= 0) == (g_left >= 0)
+                left, g_left = np.where(same, root, left), np.where(same, g_root, g_left)
+                right, g_right = np.where(same, right, root), np.where(same, g_right, g_root)
+            root = left - g_left * (right - left) / (g_right - g_left)
+            enter = inside_b[ray, k]
+            lobe_lower[ray, k] = np.where(enter, root, a[ray, k])
+            lobe_upper[ray, k] = np.where(enter, b[ray, k], root)
+
+        lower = np.maximum(lower, lobe_lower)
+        upper = np.minimum(upper, lobe_upper)
+    upper = np.maximum(upper, lower)
+
+    def primitive(m):
+        return np.sinh(2 * m) / 4 + m / 2 - m * cos2[:, None]
+
+    return c**2 * (primitive(upper) - primitive(lower)).sum(axis=-1)
+
+
+def _elliptic_breakpoints(columns, sums, differences):
+    """
+    Углы nu точек излома подынтегральной функции варианта 1: пересечения границ ДНА
+    с эллипсами, гиперболами и между собой, а также точки касания границ ДНА
+    с гиперболами (там область может начинаться скачком)
+
+    :param columns: Столбцы таблицы областей (см. _ELLIPTIC_COLUMNS) формы (N,)
+    :param sums: Суммы расстояний d1 + d2 граничных эллипсов
+    :param differences: Разности расстояний d2 - d1 граничных гипербол
+    :return: Массив углов nu в [0, 2pi) формы (N, K) (NaN - нет точки)
+    """
+    mx, my, c, cos_axis, sin_axis = columns[:5]
+    station1, station2 = tuple(columns[5:10]), tuple(columns[10:15])
+    count = len(c)
+
+    def stacked(blocks):
+        """Поиски одного вида объединяются в один вызов: строки поисков идут блоками по count."""
+        return tuple(np.concatenate(values) for values in zip(*blocks))
+
+    foci = {}
+
+    def focus_columns(blocks):
+        if blocks not in foci:
+            foci[blocks] = tuple(np.tile(value, blocks)[:, None]
+                                 for value in (station1[0], station1[1], station2[0], station2[1]))
+        return foci[blocks]
+
+    def distances(qx, qy):
+        x1, y1, x2, y2 = focus_columns(len(qx) // count)
+        return np.hypot(qx - x1, qy - y1), np.hypot(qx - x2, qy - y2)
+
+    # Эллипсы d1 + d2 = s и гиперболы d2 - d1 = t: w1 * d1 + w2 * d2 = level
+    levels = [(1.0, 1.0, total) for total in sums] + [(-1.0, 1.0, difference) for difference in differences]
+    w1, w2, level = (np.concatenate([np.broadcast_to(value, (count,)) for value in values]
+                                    * 2)[:, None] for values in zip(*levels))
+
+    def curve(qx, qy):
+        d1, d2 = distances(qx, qy)
+        return w1 * d1 + w2 * d2 - level
+
+    def lobe(qx, qy):
+        x, y, R, A, W = (value[:, None] for value in station2)
+        dx, dy = qx - x, qy - y
+        return np.hypot(dx, dy) - lobe_radius(R, A, W, np.arctan2(dy, dx))
+
+    # Касательная к границе ДНА r(phi) ортогональна градиенту d1 - d2
+    own = stacked([station1, station2])
+
+    def tangent(qx, qy):
+        x, y, R, A, W = (value[:, None] for value in own)
+        d1, d2 = distances(qx, qy)
+        x1, y1, x2, y2 = focus_columns(2)
+        phi = np.arctan2(qy - y, qx - x)
+        delta = (np.rad2deg(phi) - A + 180) % 360 - 180
+        slope = -2 * attenuation_factor(W) * delta * np.rad2deg(1)
+        tx = slope * np.cos(phi) - np.sin(phi)
+        ty = slope * np.sin(phi) + np.cos(phi)
+        # При нулевой дальности ДНА точки контура совпадают с фокусом (d = 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return ((qx - x1) / d1 - (qx - x2) / d2) * tx + ((qy - y1) / d1 - (qy - y2) / d2) * ty
+
+    searches = [(stacked([station1] * len(levels) + [station2] * len(levels)), curve),
+                (station1, lobe), (own, tangent)]
+    points_x, points_y = [], []
+    for station, residual in searches:
+        crossing_x, crossing_y = _lobe_crossings(station, residual, _CROSSING_STEPS)
+        # Блоки строк поиска переносятся в столбцы
+        points_x.append(crossing_x.reshape(-1, count, _CROSSINGS).transpose(1, 0, 2).reshape(count, -1))
+        points_y.append(crossing_y.reshape(-1, count, _CROSSINGS).transpose(1, 0, 2).reshape(count, -1))
+    points_x, points_y = np.concatenate(points_x, axis=-1), np.concatenate(points_y, axis=-1)
+
+    # d2 - d1 = -2c cos(nu), знак nu - сторона от оси x'
+    d1, d2 = distances(points_x, points_y)
+    nu = np.arccos(np.clip((d1 - d2) / (2 * c[:, None]), -1, 1))
+    side = -(points_x - mx[:, None]) * sin_axis[:, None] + (points_y - my[:, None]) * cos_axis[:, None]
+    return np.where(side >= 0, nu, 2 * np.pi - nu)
+
+
+def _elliptic_panels(table, rows, low, high, nodes, samples):
+    """
+    Квадратура Гаусса-Лежандра по nu на участках [low, high]
+
+    :return: Массив интегралов по участкам формы (P,)
+    """
+    x, w = _legendre(nodes)
+    half = (high - low) / 2
+    nu = ((low + high) / 2)[:, None] + half[:, None] * x
+    values = _elliptic_measure(table[rows.repeat(nodes)], nu.ravel(), samples).reshape(nu.shape)
+    return half * (values @ w)
+
+
+def variant1_area_batch(stations1, stations2, R1, R2, E_ellipse, E_hyperbola,
+                        tolerance=QUADRATURE_TOLERANCE, nodes=QUADRATURE_NODES, samples=QUADRATURE_SAMPLES):
+    """
+    Площади пересечений зоны эллипса, зон гипербол и ДНА (вариант 1) без построения полигонов
+
+    В эллиптических координатах (mu, nu) с фокусами в РЛС сумма расстояний
+    d1 + d2 = 2c cosh(mu), разность d2 - d1 = -2c cos(nu), поэтому зона эллипса
+    и зоны гипербол - прямоугольники, а элемент площади c^2 (cosh^2(mu) - cos^2(nu))
+    гладкий. Интеграл по mu на каждом луче берётся точно до границы ДНА, интеграл
+    по nu - адаптивной квадратурой: участок делится пополам, пока разность
+    квадратур на участке и на его половинах больше доли допуска; затем
+    количество точек проверки ДНА на лучах удваивается, пока площадь меняется
+    больше допуска. Сумма этих разностей возвращается как оценка погрешности.
+
+    Как и полигональный расчёт, вторая площадь берётся только с ДНА первой РЛС.
+
+    :param stations1: Параметры первых РЛС (x, y, R, A, W), массив формы (N, 5) или (5,) либо таблица РЛС
+    :param stations2: Параметры вторых РЛС (x, y, R, A, W), массив формы (N, 5) или (5,) либо таблица РЛС
+    :param R1: Дальности до цели от первой РЛС, массив формы (N,) или скаляр
+    :param R2: Дальности до цели от второй РЛС
+    :param E_ellipse: Погрешности эллипса
+    :param E_hyperbola: Погрешности гипербол
+    :param tolerance: Допустимая относительная погрешность каждой площади
+    :param nodes: Количество узлов квадратуры по nu на участке
+    :param samples: Количество точек проверки ДНА на луче
+    :return: Кортеж из массивов площадей и оценок их погрешности формы (N, 2)
+    """
+    columns = np.broadcast_arrays(
+        *_stations(stations1), *_stations(stations2),
+        *(np.atleast_1d(np.asarray(value, dtype=float)) for value in (R1, R2, E_ellipse, E_hyperbola))
+    )
+    x1, y1, range1, A1, W1, x2, y2, range2, A2, W2, R1, R2, E_ellipse, E_hyperbola = columns
+    count = len(x1)
+
+    distance = np.hypot(x2 - x1, y2 - y1)
+    c = np.where(distance > 0, distance / 2, 1.0)
+
+    # Зона эллипса: R1 + R2 <= d1 + d2 <= R1 + R2 + 2E; совпадающие РЛС - зона пуста
+    mu_low = np.arccosh(np.maximum((R1 + R2) / (2 * c), 1))
+    mu_high = np.where(distance > 0, np.arccosh(np.maximum((R1 + R2 + 2 * E_ellipse) / (2 * c), 1)), mu_low)
+
+    # Зоны гипербол: low <= d2 - d1 <= high, то есть cos(nu) в [-high / 2c, -low / 2c]
+    c_h1 = R2 - R1
+    bands = [(c_h1 - 2 * E_hyperbola, c_h1 + 2 * E_hyperbola), (-c_h1 - 2 * E_hyperbola, -c_h1 + 2 * E_hyperbola)]
+
+    # Строка таблицы на каждую пару (конфигурация, зона гиперболы)
+    table = np.empty((count, 2, _ELLIPTIC_COLUMNS))
+    table[..., 0] = ((x1 + x2) / 2)[:, None]
+    table[..., 1] = ((y1 + y2) / 2)[:, None]
+    table[..., 2] = c[:, None]
+    axis = np.arctan2(y2 - y1, x2 - x1)
+    table[..., 3] = np.cos(axis)[:, None]
+    table[..., 4] = np.sin(axis)[:, None]
+    for i, value in enumerate((x1, y1, range1 * VARIANT1_RANGE_SCALE, A1, W1,
+                               x2, y2, range2 * VARIANT1_RANGE_SCALE, A2, W2)):
+        table[..., 5 + i] = value[:, None]
+    table[..., 15] = [1.0, 0.0]
+    table[..., 16] = mu_low[:, None]
+    table[..., 17] = mu_high[:, None]
+    table = table.reshape(2 * count, _ELLIPTIC_COLUMNS)
+
+    # Начальные участки по nu: полосы зон гипербол в верхней и нижней полуплоскостях,
+    # разбитые равномерно и в точках излома подынтегральной функции
+    nu_low = np.stack([np.arccos(np.clip(-low / (2 * c), -1, 1)) for low, high in bands], axis=1).ravel()
+    nu_high = np.stack([np.arccos(np.clip(-high / (2 * c), -1, 1)) for low, high in bands], axis=1).ravel()
+    width = 2 * (nu_high - nu_low)
+    split = np.linspace(0, 1, _INITIAL_PANELS + 1)
+    breakpoints = _elliptic_breakpoints(
+        table.reshape(count, 2, _ELLIPTIC_COLUMNS)[:, 0].T,
+        [R1 + R2, R1 + R2 + 2 * E_ellipse], [value for band in bands for value in band]
+    ).repeat(2, axis=0)
+    edges = np.sort(np.concatenate([nu_low[:, None] + (nu_high - nu_low)[:, None] * split,
+                                    2 * np.pi - nu_high[:, None] + (nu_high - nu_low)[:, None] * split,
+                                    np.nan_to_num(breakpoints, nan=0.0)], axis=1), axis=1)
+    low, high = edges[:, :-1], edges[:, 1:]
+    middle = (low + high) / 2
+    inside = ((middle > nu_low[:, None]) & (middle < nu_high[:, None])) | \
+             ((middle > 2 * np.pi - nu_high[:, None]) & (middle < 2 * np.pi - nu_low[:, None]))
+    active = inside & (mu_high > mu_low).repeat(2)[:, None]
+    rows = np.broadcast_to(np.arange(2 * count)[:, None], low.shape)[active]
+    low, high = low[active], high[active]
+
+    whole = _elliptic_panels(table, rows, low, high, nodes, samples)
+    areas = np.zeros(2 * count)
+    errors = np.zeros(2 * count)
+    accepted = []
+    for level in range(_MAX_BISECTIONS + 1):
+        if not len(rows):
+            break
+        middle = (low + high) / 2
+        left = _elliptic_panels(table, rows, low, middle, nodes, samples)
+        right = _elliptic_panels(table, rows, middle, high, nodes, samples)
+        refined = left + right
+        error = np.abs(refined - whole)
+
+        # Допуск участка - доля допуска площади, пропорциональная его ширине
+        estimate = areas + np.bincount(rows, weights=refined, minlength=2 * count)
+        allowed = tolerance * np.abs(estimate[rows]) * (high - low) / width[rows]
+        done = (error <= allowed) | (level == _MAX_BISECTIONS)
+        areas += np.bincount(rows[done], weights=refined[done], minlength=2 * count)
+        errors += np.bincount(rows[done], weights=error[done], minlength=2 * count)
+        accepted.append((rows[done], low[done], high[done], refined[done]))
+
+        keep = ~done
+        rows = np.concatenate([rows[keep], rows[keep]])
+        low, high = np.concatenate([low[keep], middle[keep]]), np.concatenate([middle[keep], high[keep]])
+        whole = np.concatenate([left[keep], right[keep]])
+
+    # Ни одного участка: области всех конфигураций пусты
+    if not accepted:
+        return areas.reshape(count, 2), errors.reshape(count, 2)
+
+    # Проверка точек на лучах: узкие части области между точками проверки теряются,
+    # поэтому принятые участки пересчитываются с удвоенным количеством точек,
+    # пока изменение площади больше допуска
+    rows, low, high, values = (np.concatenate(columns) for columns in zip(*accepted))
+    inner = np.zeros(2 * count)
+    for _ in range(_MAX_SAMPLE_DOUBLINGS):
+        if not len(rows):
+            break
+        samples = 2 * samples - 1
+        middle = (low + high) / 2
+        finer = (_elliptic_panels(table, rows, low, middle, nodes, samples) +
+                 _elliptic_panels(table, rows, middle, high, nodes, samples))
+        areas += np.bincount(rows, weights=finer - values, minlength=2 * count)
+        change = np.bincount(rows, weights=np.abs(finer - values), minlength=2 * count)
+        inner[np.unique(rows)] = change[np.unique(rows)]
+
+        keep = (change > tolerance * np.abs(areas))[rows]
+        rows, low, high, values = rows[keep], low[keep], high[keep], finer[keep]
+
+    errors += inner
+    return areas.reshape(count, 2), errors.reshape(count, 2)
+
+
+def variant1_area(rls1, rls2, R1, R2, E_ellipse, E_hyperbola,
+                  tolerance=QUADRATURE_TOLERANCE, nodes=QUADRATURE_NODES, samples=QUADRATURE_SAMPLES):
+    """
+    Площади пересечений зоны эллипса, зон гипербол и ДНА (вариант 1) для одной конфигурации
+
+    :param rls1: Первый РЛС объект
+    :param rls2: Второй РЛС объект
+    :param R1: Дальность до цели от первой РЛС
+    :param R2: Дальность до цели от второй РЛС
+    :param E_ellipse: Погрешность эллипса
+    :param E_hyperbola: Погрешность гипербол
+    :param tolerance: Допустимая относительная погрешность каждой площади
+    :param nodes: Количество узлов квадратуры по nu на участке
+    :param samples: Количество точек проверки ДНА на луче
+    :return: Кортеж из списков двух площадей и оценок их погрешности
+    """
+    stations1 = (rls1.x, rls1.y, rls1.R, rls1.A, rls1.W)
+    stations2 = (rls2.x, rls2.y, rls2.R, rls2.A, rls2.W)
+    areas, errors = variant1_area_batch(stations1, stations2, R1, R2, E_ellipse, E_hyperbola,
+                                        tolerance, nodes, samples)
+    return areas[0].tolist(), errors[0].tolist()
+
+
+# Движки расчёта площадей
+AREA_ENGINES = ('polygon', 'analytic')
+
+
+def compute_areas(variant, rls1, rls2, engine='polygon', tolerance=QUADRATURE_TOLERANCE, **params):
+    """
+    Площади варианта выбранным движком
+
+    :param variant: Номер варианта (1, 2 или 3)
+    :param rls1: Первый РЛС объект
+    :param rls2: Второй РЛС объект
+    :param engine: 'polygon' - полигоны движка, 'analytic' - без полигонов (варианты 1 и 3)
+    :param tolerance: Допустимая относительная погрешность площадей варианта 1 (только 'analytic')
+    :param params: Параметры зон и погрешностей соответствующего варианта
+    :return: Кортеж из списка площадей и списка оценок их погрешности (None, если оценки нет)
+    """
+    if engine == 'polygon':
+        from engine.geometry import compute_variant
+        return compute_variant(variant, rls1, rls2, **params)['areas'], None
+    if engine != 'analytic':
+        raise ValueError(f"Неизвестный движок расчёта площадей: {engine}")
+    if variant == 1:
+        return variant1_area(rls1, rls2, tolerance=tolerance, **params)
+    if variant == 3:
+        return [variant3_area(rls1, rls2, **params)], None
+    raise ValueError(f"Движок analytic недоступен для варианта {variant}")
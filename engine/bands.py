@@ -0,0 +1,128 @@
+import numpy as np
+from shapely.geometry import Polygon
+
+# Количество точек каждой граничной ветви гиперболы внутри области отсечения
+BAND_BRANCH_SAMPLES = 128
+
+# Максимальный угловой шаг дуги окружности отсечения, градусы
+_ARC_STEP_DEG = 2.0
+
+# Запас радиуса области отсечения, чтобы граница ДНА не совпадала с окружностью
+_CLIP_MARGIN = 1.01
+
+
+def clip_radius(rls1, rls2, max_range1, max_range2):
+    """
+    Радиус области отсечения вокруг середины между РЛС, содержащей обе ДНА
+
+    :param rls1: Первый РЛС объект
+    :param rls2: Второй РЛС объект
+    :param max_range1: Максимальная дальность ДНА первой РЛС
+    :param max_range2: Максимальная дальность ДНА второй РЛС
+    :return: Радиус окружности отсечения
+    """
+    half_distance = np.hypot(rls2.x - rls1.x, rls2.y - rls1.y) / 2
+    return (half_distance + max(max_range1, max_range2)) * _CLIP_MARGIN
+
+
+def _arc(start, stop, radius):
+    """
+    Дуга окружности отсечения между концами ветвей
+
+    Промежуточные вершины вынесены на радиус radius / cos(шаг), поэтому все
+    отрезки дуги лежат вне открытого круга и не могут пересечь ветви гипербол,
+    даже если ветвь подходит к окружности под малым углом.
+    """
+    intervals = max(int(np.ceil(abs(stop - start) / np.deg2rad(_ARC_STEP_DEG))), 2)
+    angles = np.linspace(start, stop, intervals + 1)
+    radii = np.full(intervals + 1, radius / np.cos((stop - start) / intervals))
+    radii[[0, -1]] = radius
+    return radii * np.cos(angles), radii * np.sin(angles)
+
+
+def hyperbola_band(rls1, rls2, low, high, radius, samples=BAND_BRANCH_SAMPLES):
+    """
+    Построение замкнутой зоны гиперболы low <= d2 - d1 <= high внутри окружности отсечения
+
+    d1 и d2 - расстояния до первой и второй РЛС. Окружность отсечения с центром
+    в середине между РЛС; ветви гипербол обрезаются точно по ней (параметр t
+    находится аналитически), а зона замыкается дугами этой окружности, поэтому
+    полигон корректен и содержит только вершины внутри области.
+
+    :param rls1: Первый РЛС объект
+    :param rls2: Второй РЛС объект
+    :param low: Нижняя граница разности расстояний d2 - d1
+    :param high: Верхняя граница разности расстояний d2 - d1
+    :param radius: Радиус окружности отсечения
+    :param samples: Количество точек каждой граничной ветви
+    :return: Полигон Shapely (пустой, если зона не существует)
+    """
+    dx = rls2.x - rls1.x
+    dy = rls2.y - rls1.y
+    distance = np.hypot(dx, dy)
+
+    # Внутри окружности отсечения разность расстояний лежит в (-v_max, v_max):
+    # вершина ветви уровня v удалена от середины между РЛС на |v| / 2
+    v_max = min(distance, 2 * radius)
+    low = max(low, -v_max)
+    high = min(high, v_max)
+    if distance == 0 or low >= high:
+        return Polygon()
+
+    # Локальная система координат: начало в середине, ось x направлена от РЛС 1 к РЛС 2.
+    # Ветвь уровня v: x = -v/2 * cosh(t), y = sqrt(c^2 - v^2/4) * sinh(t), c = distance / 2.
+    # Конец ветви на окружности отсечения: v^2/4 + c^2 * sinh(t)^2 = radius^2.
+    c_focus = distance / 2
+
+    def branch(v):
+        """Ветвь уровня v снизу вверх и угол её верхнего конца (None, если ветвь вне области)."""
+        if abs(v) >= v_max:
+            return None
+        sinh_t_max = np.sqrt(radius**2 - v**2 / 4) / c_focus
+        # Равномерный шаг по t сгущает точки у вершины, равномерный по sinh(t) -
+        # на удалённых участках, где хорды иначе получаются слишком длинными
+        t = np.union1d(np.linspace(-1, 1, samples // 2) * np.arcsinh(sinh_t_max),
+                       np.arcsinh(np.linspace(-1, 1, samples - samples // 2) * sinh_t_max))
+        x = -v / 2 * np.cosh(t)
+        y = np.sqrt(c_focus**2 - v**2 / 4) * np.sinh(t)
+        return x, y, np.arctan2(y[-1], x[-1])
+
+    low_branch = branch(low)
+    high_branch = branch(high)
+
+    # Углы верхних концов ветвей растут с ростом v; без нижней ветви зона доходит
+    # до окружности со стороны РЛС 2 (угол 0), без верхней - со стороны РЛС 1 (угол pi)
+    low_angle = low_branch[2] if low_branch is not None else 0.0
+    high_angle = high_branch[2] if high_branch is not None else np.pi
+
+    parts_x, parts_y = [], []
+    if low_branch is not None:
+        parts_x.append(low_branch[0])
+        parts_y.append(low_branch[1])
+    arc_x, arc_y = _arc(low_angle, high_angle, radius)
+    parts_x.append(arc_x)
+    parts_y.append(arc_y)
+    if high_branch is not None:
+        parts_x.append(high_branch[0][::-1])
+        parts_y.append(high_branch[1][::-1])
+    arc_x, arc_y = _arc(-high_angle, -low_angle, radius)
+    parts_x.append(arc_x)
+    parts_y.append(arc_y)
+
+    local_x = np.concatenate(parts_x)
+    local_y = np.concatenate(parts_y)
+
+    # Концы дуг совпадают с концами ветвей; совпадающие соседние вершины убираются,
+    # иначе при касательном подходе ветви к окружности возникают ложные самопересечения
+    gaps = np.hypot(np.diff(local_x, append=local_x[0]), np.diff(local_y, append=local_y[0]))
+    keep = gaps > radius * 1e-9
+    local_x = local_x[keep]
+    local_y = local_y[keep]
+
+    # Поворот и перенос в середину между РЛС
+    cos_phi = dx / distance
+    sin_phi = dy / distance
+    x = (rls1.x + rls2.x) / 2 + local_x * cos_phi - local_y * sin_phi
+    y = (rls1.y + rls2.y) / 2 + local_x * sin_phi + local_y * cos_phi
+
+    return Polygon(np.column_stack((x, y)))
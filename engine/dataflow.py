@@ -0,0 +1,108 @@
+import threading
+from collections import OrderedDict
+
+from engine.profiler import profiler
+
+_MISSING = object()
+
+
+def _same(a, b):
+    """
+    Сравнение входов этапа: результаты других этапов сравниваются по идентичности,
+    параметры (числа, строки и кортежи из них) - по значению
+    """
+    if a is b:
+        return True
+    if isinstance(a, tuple) and isinstance(b, tuple):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    if isinstance(a, (int, float, str)) and isinstance(b, (int, float, str)):
+        return a == b
+    return False
+
+
+class Stage:
+    """
+    Этап расчёта, запоминающий результат для последнего набора входов
+
+    Входами этапа служат параметры и результаты предыдущих этапов. Если вход
+    не изменился, предыдущий этап вернул тот же объект, поэтому зависимые
+    этапы пересчитываются только при изменении своих входов.
+    """
+
+    def __init__(self, name, func):
+        """
+        :param name: Имя этапа для статистики
+        :param func: Функция расчёта этапа
+        """
+        self.name = name
+        self.func = func
+        self.hits = 0
+        self.misses = 0
+        self._inputs = _MISSING
+        self._value = None
+        self._lock = threading.Lock()
+
+    def __call__(self, *inputs):
+        with self._lock:
+            if self._inputs is not _MISSING and _same(self._inputs, inputs):
+                self.hits += 1
+                return self._value
+            self.misses += 1
+
+        with profiler.section(self.name):
+            value = self.func(*inputs)
+
+        with self._lock:
+            self._inputs = inputs
+            self._value = value
+        return value
+
+    def stats(self):
+        """
+        Статистика использования этапа
+
+        :return: Словарь с количеством попаданий и пересчётов
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def clear(self):
+        """Сброс запомненного результата и счётчиков."""
+        with self._lock:
+            self._inputs = _MISSING
+            self._value = None
+            self.hits = 0
+            self.misses = 0
+
+
+class Dataflow:
+    """Набор именованных этапов расчёта с общей статистикой."""
+
+    def __init__(self):
+        self.stages = OrderedDict()
+
+    def stage(self, name):
+        """
+        Декоратор, регистрирующий функцию как этап расчёта
+
+        :param name: Имя этапа
+        :return: Декоратор, возвращающий объект Stage
+        """
+        def decorator(func):
+            stage = Stage(name, func)
+            self.stages[name] = stage
+            return stage
+        return decorator
+
+    def stats(self):
+        """
+        Статистика всех этапов
+
+        :return: Словарь {имя этапа: {'hits': ..., 'misses': ...}}
+        """
+        return {name: stage.stats() for name, stage in self.stages.items()}
+
+    def clear(self):
+        """Сброс всех этапов."""
+        for stage in self.stages.values():
+            stage.clear()
@@ -0,0 +1,362 @@
+from collections import namedtuple
+
+import numpy as np
+from shapely.geometry import Polygon
+
+from engine.bands import clip_radius, hyperbola_band
+from engine.dataflow import Dataflow
+from engine.lobe_cache import LobeCache
+from engine.lobes import VARIANT1_RANGE_SCALE, compute_lobe_outline
+from engine.solvers import SOLUTION_NONE, solve_range_range, solve_sum_difference
+from utils.ellipse_calculator import compute_ellipse_batch
+from utils.hyperbola_calculator import compute_hyperbola_batch
+
+
+# Кэш контуров ДНА: перемещение РЛС не требует повторного расчёта формы ДНА
+lobe_cache = LobeCache(compute_lobe_outline)
+
+# Этапы расчёта вариантов, пересчитываемые только при изменении своих входов
+dataflow = Dataflow()
+
+# Неизменяемые входы этапов: параметры РЛС и координаты фокусов
+Station = namedtuple('Station', 'x y R A W')
+Focus = namedtuple('Focus', 'x y')
+
+
+def _station(rls):
+    return Station(float(rls.x), float(rls.y), float(rls.R), float(rls.A), float(rls.W))
+
+
+def compute_beam_line(rls, max_range):
+    """
+    Расчёт линии направления главного лепестка ДНА
+
+    :param rls: РЛС объект
+    :param max_range: Максимальная дальность ДНА
+    :return: Кортеж из x и y координат начала и конца линии
+    """
+    angle_rad = np.deg2rad(rls.A)
+    end_x = rls.x + max_range * np.cos(angle_rad)
+    end_y = rls.y + max_range * np.sin(angle_rad)
+    return [rls.x, end_x], [rls.y, end_y]
+
+
+def _join_branches(x1, y1, x2, y2):
+    """
+    Объединение двух ветвей гиперболы в одну линию с разрывом (NaN)
+
+    :return: Кортеж из x и y координат или None, если гипербола не построена
+    """
+    if not all([len(x1) > 0, len(y1) > 0, len(x2) > 0, len(y2) > 0]):
+        return None
+    return np.concatenate([x1, [np.nan], x2]), np.concatenate([y1, [np.nan], y2])
+
+
+def _area(geometry):
+    return geometry.area if not geometry.is_empty else 0.0
+
+
+def _lobes(rls1, rls2, max_range1, max_range2):
+    x1, y1, poly1 = lobe_cache.lobe(rls1, max_range1)
+    x2, y2, poly2 = lobe_cache.lobe(rls2, max_range2)
+    beam_lines = [compute_beam_line(rls1, max_range1), compute_beam_line(rls2, max_range2)]
+    return [(x1, y1), (x2, y2)], [poly1, poly2], beam_lines
+
+
+@dataflow.stage('variant1.lobes')
+def _variant1_lobes(station1, station2):
+    return _lobes(station1, station2, station1.R * VARIANT1_RANGE_SCALE, station2.R * VARIANT1_RANGE_SCALE)
+
+
+@dataflow.stage('variant1.ellipses')
+def _variant1_ellipses(focus1, focus2, R1, R2, E_ellipse):
+    """
+    Эллипсы (идеальный и с погрешностью) и зона погрешности между ними
+
+    :return: Кортеж из списка координат эллипсов и полигона зоны
+    """
+    # Построение эллипсов за один проход
+    c1 = R1 + R2
+    c2 = (R1 + E_ellipse) + (R2 + E_ellipse)
+    ellipses_x, ellipses_y, ellipses_valid = compute_ellipse_batch(focus1, focus2, [c1, c2])
+    ellipses = [(x, y) if valid else ([], []) for x, y, valid in zip(ellipses_x, ellipses_y, ellipses_valid)]
+    (ellipse1_x, ellipse1_y), (ellipse2_x, ellipse2_y) = ellipses
+
+    ellipse_inner_polygon = Polygon(list(zip(ellipse1_x, ellipse1_y)))
+    ellipse_outer_polygon = Polygon(list(zip(ellipse2_x, ellipse2_y)))
+    ellipse_difference = ellipse_outer_polygon.difference(ellipse_inner_polygon)
+
+    curves = [(x, y) if len(x) > 0 else None for x, y in ellipses]
+    return curves, ellipse_difference
+
+
+@dataflow.stage('variant1.hyperbolas')
+def _variant1_hyperbolas(focus1, focus2, R1, R2, E_hyperbola):
+    """
+    Линии гипербол с погрешностями для отображения
+
+    :return: Словарь с координатами гипербол
+    """
+    # Построение гипербол с погрешностями за один проход
+    # Гипербола 1: R2 - R1 = c, гипербола 2: R1 - R2 = c
+    c_h1 = R2 - R1
+    c_h2 = R1 - R2
+    hyperbolas_x1, hyperbolas_y1, hyperbolas_x2, hyperbolas_y2, hyperbolas_valid = compute_hyperbola_batch(
+        focus1, focus2,
+        [c_h1 + 2 * E_hyperbola, c_h1 - 2 * E_hyperbola, c_h2 + 2 * E_hyperbola, c_h2 - 2 * E_hyperbola]
+    )
+    hyperbola1_pos, hyperbola1_neg, hyperbola2_pos, hyperbola2_neg = [
+        branches[:4] if branches[4] else ([], [], [], [])
+        for branches in zip(hyperbolas_x1, hyperbolas_y1, hyperbolas_x2, hyperbolas_y2, hyperbolas_valid)
+    ]
+    return {
+        'hyperbola1_uncertainty': _join_branches(*hyperbola1_pos),
+        'hyperbola1_uncertainty_neg': _join_branches(*hyperbola1_neg),
+        'hyperbola2_uncertainty': _join_branches(*hyperbola2_pos),
+        'hyperbola2_uncertainty_neg': _join_branches(*hyperbola2_neg),
+    }
+
+
+@dataflow.stage('variant1.bands')
+def _variant1_bands(focus1, focus2, R1, R2, E_hyperbola, radius):
+    """
+    Зоны погрешности гипербол, отсечённые окружностью радиуса radius
+
+    :return: Кортеж из двух полигонов зон
+    """
+    # Зона 1: c_h1 - 2E <= d2 - d1 <= c_h1 + 2E, зона 2 - её отражение d1 - d2
+    c_h1 = R2 - R1
+    hyperbola1_difference = hyperbola_band(focus1, focus2, c_h1 - 2 * E_hyperbola, c_h1 + 2 * E_hyperbola, radius)
+    hyperbola2_difference = hyperbola_band(focus1, focus2, -c_h1 - 2 * E_hyperbola, -c_h1 + 2 * E_hyperbola, radius)
+    return hyperbola1_difference, hyperbola2_difference
+
+
+@dataflow.stage('variant1.zones')
+def _variant1_zones(ellipses, bands):
+    _curves, ellipse_difference = ellipses
+    return tuple(ellipse_difference.intersection(band) for band in bands)
+
+
+@dataflow.stage('variant1.intersections')
+def _variant1_intersections(lobes, zones):
+    _lobe_curves, (poly1, poly2), _beam_lines = lobes
+    ellipse_hyperbola1_intersection, ellipse_hyperbola2_intersection = zones
+
+    final_intersection1 = poly1.intersection(poly2).intersection(ellipse_hyperbola1_intersection)
+    final_intersection2 = poly1.intersection(poly1).intersection(ellipse_hyperbola2_intersection)
+    return final_intersection1, final_intersection2
+
+
+def _targets(solution):
+    """Выбранные по ДНА точки решения; None, если решения нет."""
+    return [None if status == SOLUTION_NONE else (float(x), float(y))
+            for status, (x, y) in zip(solution['status'], solution['best'])]
+
+
+@dataflow.stage('variant1.targets')
+def _variant1_targets(station1, station2, R1, R2, E_ellipse):
+    """
+    Положения цели по середине зоны эллипса и гиперболам R2 - R1 и R1 - R2
+
+    :return: Список из двух точек (x, y) или None
+    """
+    total = R1 + R2 + E_ellipse
+    return _targets(solve_sum_difference(station1, station2, [total, total], [R2 - R1, R1 - R2]))
+
+
+def compute_variant1(rls1, rls2, R1, R2, E_ellipse, E_hyperbola):
+    """
+    Расчёт варианта 1: пересечение ДНА с зонами эллипса и гипербол
+
+    :param rls1: Первый РЛС объект
+    :param rls2: Второй РЛС объект
+    :param R1: Дальность до цели от первой РЛС
+    :param R2: Дальность до цели от второй РЛС
+    :param E_ellipse: Погрешность эллипса
+    :param E_hyperbola: Погрешность гипербол
+    :return: Словарь с контурами ДНА ('lobes'), линиями направления ('beam_lines'),
+             эллипсами ('ellipses'), гиперболами ('hyperbolas'), положениями цели в
+             зонах ('targets'), полигонами пересечений ('intersections') и их площадями ('areas')
+    """
+    station1 = _station(rls1)
+    station2 = _station(rls2)
+    focus1 = Focus(station1.x, station1.y)
+    focus2 = Focus(station2.x, station2.y)
+    R1, R2, E_ellipse, E_hyperbola = float(R1), float(R2), float(E_ellipse), float(E_hyperbola)
+
+    lobes = _variant1_lobes(station1, station2)
+    ellipses = _variant1_ellipses(focus1, focus2, R1, R2, E_ellipse)
+    hyperbolas = _variant1_hyperbolas(focus1, focus2, R1, R2, E_hyperbola)
+
+    # Зоны гипербол отсекаются окружностью, содержащей обе ДНА
+    radius = clip_radius(station1, station2, station1.R * VARIANT1_RANGE_SCALE, station2.R * VARIANT1_RANGE_SCALE)
+    bands = _variant1_bands(focus1, focus2, R1, R2, E_hyperbola, float(radius))
+
+    zones = _variant1_zones(ellipses, bands)
+    final_intersection1, final_intersection2 = _variant1_intersections(lobes, zones)
+
+    lobe_curves, _polygons, beam_lines = lobes
+    ellipse_curves, _ellipse_difference = ellipses
+    return {
+        'lobes': list(lobe_curves),
+        'beam_lines': beam_lines,
+        'ellipses': list(ellipse_curves),
+        'hyperbolas': dict(hyperbolas),
+        'targets': _variant1_targets(station1, station2, R1, R2, E_ellipse),
+        'intersections': [final_intersection1, final_intersection2],
+        'areas': [_area(final_intersection1), _area(final_intersection2)],
+    }
+
+
+@dataflow.stage('variant2.lobes')
+def _variant2_lobes(station1, station2):
+    return _lobes(station1, station2, station1.R, station2.R)
+
+
+@dataflow.stage('variant2.intersection')
+def _variant2_intersection(lobes):
+    _lobe_curves, (poly1, poly2), _beam_lines = lobes
+    return poly1.intersection(poly2)
+
+
+def compute_variant2(rls1, rls2):
+    """
+    Расчёт варианта 2: пересечение двух ДНА
+
+    :param rls1: Первый РЛС объект
+    :param rls2: Второй РЛС объект
+    :return: Словарь с контурами ДНА ('lobes'), линиями направления ('beam_lines'),
+             полигонами пересечений ('intersections') и их площадями ('areas')
+    """
+    lobes = _variant2_lobes(_station(rls1), _station(rls2))
+    intersect_poly = _variant2_intersection(lobes)
+
+    lobe_curves, _polygons, beam_lines = lobes
+    return {
+        'lobes': list(lobe_curves),
+        'beam_lines': beam_lines,
+        'intersections': [intersect_poly],
+        'areas': [_area(intersect_poly)],
+    }
+
+
+def _circle_polygon(x, y, radius, theta):
+    return Polygon(list(zip(x + radius * np.cos(theta), y + radius * np.sin(theta))))
+
+
+@dataflow.stage('variant3.lobes')
+def _variant3_lobes(station1, station2):
+    return _lobes(station1, station2, station1.R, station2.R)
+
+
+@dataflow.stage('variant3.rings')
+def _variant3_rings(focus1, radius_rls1, error_rls1, focus2, radius_rls2, error_rls2):
+    """
+    Пересечение дальномерных колец погрешности двух РЛС
+
+    :return: Полигон пересечения колец
+    """
+    theta = np.linspace(0, 2 * np.pi, 360)
+
+    circle1_polygon = _circle_polygon(focus1.x, focus1.y, radius_rls1, theta)
+    error_circle1_polygon = _circle_polygon(focus1.x, focus1.y, radius_rls1 + error_rls1, theta)
+    circle2_polygon = _circle_polygon(focus2.x, focus2.y, radius_rls2, theta)
+    error_circle2_polygon = _circle_polygon(focus2.x, focus2.y, radius_rls2 + error_rls2, theta)
+
+    ring1 = error_circle1_polygon.difference(circle1_polygon)
+    ring2 = error_circle2_polygon.difference(circle2_polygon)
+
+    return ring1.intersection(ring2)
+
+
+@dataflow.stage('variant3.targets')
+def _variant3_targets(station1, station2, range1, range2):
+    """
+    Положение цели по серединам колец погрешности, выбранное по направлениям ДНА
+
+    :return: Список из одной точки (x, y) или None, если окружности не пересекаются
+    """
+    return _targets(solve_range_range(station1, station2, range1, range2))
+
+
+@dataflow.stage('variant3.intersection')
+def _variant3_intersection(lobes, rings_intersection):
+    _lobe_curves, (poly1, poly2), _beam_lines = lobes
+    return rings_intersection.intersection(poly1).intersection(poly2)
+
+
+def compute_variant3(rls1, rls2, radius_rls1, error_rls1, radius_rls2, error_rls2):
+    """
+    Расчёт варианта 3: пересечение дальномерных колец погрешности и ДНА
+
+    :param rls1: Первый РЛС объект
+    :param rls2: Второй РЛС объект
+    :param radius_rls1: Измеренная дальность первой РЛС
+    :param error_rls1: Погрешность дальности первой РЛС
+    :param radius_rls2: Измеренная дальность второй РЛС
+    :param error_rls2: Погрешность дальности второй РЛС
+    :return: Словарь с контурами ДНА ('lobes'), линиями направления ('beam_lines'),
+             окружностями дальности ('circles'), положением цели по серединам колец ('targets'),
+             полигонами пересечений ('intersections') и их площадями ('areas')
+    """
+    station1 = _station(rls1)
+    station2 = _station(rls2)
+    lobes = _variant3_lobes(station1, station2)
+
+    # Пересечение
+    rings_intersection = _variant3_rings(Focus(station1.x, station1.y), float(radius_rls1), float(error_rls1),
+                                         Focus(station2.x, station2.y), float(radius_rls2), float(error_rls2))
+    beams_intersection = _variant3_intersection(lobes, rings_intersection)
+    targets = _variant3_targets(station1, station2, radius_rls1 + error_rls1 / 2, radius_rls2 + error_rls2 / 2)
+
+    lobe_curves, _polygons, beam_lines = lobes
+    return {
+        'lobes': list(lobe_curves),
+        'beam_lines': beam_lines,
+        # Окружности дальности: (x, y, радиус, признак окружности погрешности)
+        'circles': [
+            (rls1.x, rls1.y, radius_rls1, False),
+            (rls1.x, rls1.y, radius_rls1 + error_rls1, True),
+            (rls2.x, rls2.y, radius_rls2, False),
+            (rls2.x, rls2.y, radius_rls2 + error_rls2, True),
+        ],
+        'targets': targets,
+        'intersections': [beams_intersection],
+        'areas': [_area(beams_intersection)],
+    }
+
+
+def iter_polygons(geometry):
+    """
+    Перебор непустых полигонов, входящих в геометрию
+
+    :param geometry: Shapely геометрия (Polygon, MultiPolygon, GeometryCollection)
+    :return: Генератор полигонов
+    """
+    if isinstance(geometry, Polygon):
+        if not geometry.is_empty:
+            yield geometry
+    elif hasattr(geometry, 'geoms'):
+        for geom in geometry.geoms:
+            yield from iter_polygons(geom)
+
+
+# Функции расчёта по номеру варианта
+VARIANTS = {
+    1: compute_variant1,
+    2: compute_variant2,
+    3: compute_variant3,
+}
+
+
+def compute_variant(variant, rls1, rls2, **params):
+    """
+    Расчёт варианта по его номеру
+
+    :param variant: Номер варианта (1, 2 или 3)
+    :param rls1: Первый РЛС объект
+    :param rls2: Второй РЛС объект
+    :param params: Параметры зон и погрешностей соответствующего варианта
+    :return: Словарь с результатами расчёта варианта
+    """
+    return VARIANTS[variant](rls1, rls2, **params)
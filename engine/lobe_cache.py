@@ -0,0 +1,85 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from shapely import affinity
+from shapely.geometry import Polygon
+
+
+class LobeCache:
+    """
+    Ограниченный LRU-кэш контуров ДНА
+
+    Форма ДНА зависит только от направления A, ширины W и дальности, а положение
+    РЛС лишь смещает контур. Поэтому в кэше хранятся контуры и полигоны ДНА с
+    центром в начале координат, а перенос в точку РЛС выполняется при выдаче.
+    """
+
+    def __init__(self, outline, maxsize=128):
+        """
+        :param outline: Функция (A, W, max_range) -> (x, y) контура ДНА в начале координат
+        :param maxsize: Максимальное количество хранимых контуров
+        """
+        self.outline = outline
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, A, W, max_range):
+        """
+        Получение контура и полигона ДНА в начале координат
+
+        :param A: Угол направления ДНА
+        :param W: Ширина ДНА
+        :param max_range: Максимальная дальность ДНА
+        :return: Кортеж из x, y координат контура и полигона Shapely
+        """
+        key = (float(A), float(W), float(max_range))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        x, y = self.outline(*key)
+        x.flags.writeable = False
+        y.flags.writeable = False
+        entry = (x, y, Polygon(np.column_stack((x, y))))
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def lobe(self, rls, max_range):
+        """
+        Получение контура и полигона ДНА, перенесённых в точку РЛС
+
+        :param rls: РЛС объект
+        :param max_range: Максимальная дальность ДНА
+        :return: Кортеж из x, y координат контура и полигона Shapely
+        """
+        x, y, polygon = self.get(rls.A, rls.W, max_range)
+        return x + rls.x, y + rls.y, affinity.translate(polygon, rls.x, rls.y)
+
+    def stats(self):
+        """
+        Статистика использования кэша
+
+        :return: Словарь с количеством попаданий, промахов и хранимых контуров
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+    def clear(self):
+        """Очистка кэша и счётчиков."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
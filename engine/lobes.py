@@ -0,0 +1,166 @@
+import math
+
+import numpy as np
+
+# Порог затухания: контур ДНА строится только там, где L(theta) > LOBE_THRESHOLD
+LOBE_THRESHOLD = 1e-3
+
+# Допустимая относительная погрешность площади контура из-за замены дуг хордами
+LOBE_TOLERANCE = 5e-4
+
+# Множитель дальности ДНА в варианте 1 (эллипсы и гиперболы)
+VARIANT1_RANGE_SCALE = 1.5
+
+# Начальное и максимальное количество разбиений диапазона углов
+_INITIAL_INTERVALS = 8
+_MAX_REFINEMENTS = 40
+
+erf = np.vectorize(math.erf, otypes=[float])
+
+
+def attenuation_factor(W):
+    """
+    Коэффициент затухания ДНА L(theta) = exp(-k * (theta - A)^2), углы в градусах
+
+    :param W: Ширина ДНА
+    :return: Коэффициент k
+    """
+    return np.log(2) / (W / 2)**2
+
+
+def lobe_half_width(W, threshold=LOBE_THRESHOLD):
+    """
+    Половина углового диапазона, в котором затухание ДНА превышает порог
+
+    :param W: Ширина ДНА
+    :param threshold: Порог затухания
+    :return: Отклонение от направления ДНА в градусах (не более 179.9)
+    """
+    return np.minimum((W / 2) * np.sqrt(np.log(1 / threshold) / np.log(2)), 179.9)
+
+
+def lobe_sector_area(W, max_range, phi_a, phi_b):
+    """
+    Точная площадь сектора ДНА между углами phi_a и phi_b (отсчёт от направления ДНА)
+
+    Площадь 1/2 * integral(r(phi)^2 dphi) с r = max_range * exp(-k * phi^2) сводится к erf.
+
+    :param W: Ширина ДНА
+    :param max_range: Максимальная дальность ДНА
+    :param phi_a: Начальные углы в градусах
+    :param phi_b: Конечные углы в градусах
+    :return: Площади секторов
+    """
+    k = attenuation_factor(W)
+    scale = 0.5 * max_range**2 * np.deg2rad(1) * np.sqrt(np.pi / (8 * k))
+    return scale * (erf(np.sqrt(2 * k) * np.asarray(phi_b)) - erf(np.sqrt(2 * k) * np.asarray(phi_a)))
+
+
+def lobe_area(W, max_range):
+    """
+    Точная площадь ДНА
+
+    :param W: Ширина ДНА
+    :param max_range: Максимальная дальность ДНА
+    :return: Площадь ДНА
+    """
+    k = attenuation_factor(W)
+    return 0.5 * max_range**2 * np.deg2rad(1) * np.sqrt(np.pi / (2 * k))
+
+
+def adaptive_lobe_angles(W, max_range, threshold=LOBE_THRESHOLD, tolerance=LOBE_TOLERANCE):
+    """
+    Адаптивный выбор углов контура ДНА (отсчёт от направления ДНА)
+
+    Углы берутся только из диапазона, где затухание выше порога. Интервалы
+    делятся пополам, пока разница между точной площадью сектора и площадью
+    треугольника на хорде не станет меньше доли допуска, пропорциональной
+    ширине интервала, поэтому точки сгущаются там, где контур сильнее изогнут.
+
+    Оценка погрешности площади полученного контура относительно точной площади ДНА:
+        |S_контура - S_ДНА| <= tolerance * S_ДНА + S_ДНА * erfc(sqrt(2 * ln(1 / threshold)))
+    Второе слагаемое (площадь отброшенных хвостов) для порога 1e-3 около 2e-7 * S_ДНА.
+
+    :param W: Ширина ДНА
+    :param max_range: Максимальная дальность ДНА
+    :param threshold: Порог затухания
+    :param tolerance: Допустимая относительная погрешность площади из-за хорд
+    :return: Массив углов в градусах
+    """
+    k = attenuation_factor(W)
+    phi_max = lobe_half_width(W, threshold)
+    allowed = tolerance * lobe_area(W, max_range) / (2 * phi_max)
+
+    phi = np.linspace(-phi_max, phi_max, _INITIAL_INTERVALS + 1)
+    for _ in range(_MAX_REFINEMENTS):
+        phi_a, phi_b = phi[:-1], phi[1:]
+        r_a = max_range * np.exp(-k * phi_a**2)
+        r_b = max_range * np.exp(-k * phi_b**2)
+        triangle = 0.5 * r_a * r_b * np.sin(np.deg2rad(phi_b - phi_a))
+        error = np.abs(lobe_sector_area(W, max_range, phi_a, phi_b) - triangle)
+
+        refine = error > allowed * (phi_b - phi_a)
+        if not refine.any():
+            break
+        phi = np.sort(np.concatenate([phi, (phi_a[refine] + phi_b[refine]) / 2]))
+
+    return phi
+
+
+def compute_lobe_outline(A, W, max_range, threshold=LOBE_THRESHOLD, tolerance=LOBE_TOLERANCE):
+    """
+    Расчёт контура ДНА с центром в начале координат и адаптивной дискретизацией
+
+    Контур замыкается через точку РЛС, поэтому полигон звёздный относительно
+    неё и всегда корректен (без самопересечений).
+
+    :param A: Угол направления ДНА
+    :param W: Ширина ДНА
+    :param max_range: Максимальная дальность ДНА
+    :param threshold: Порог затухания
+    :param tolerance: Допустимая относительная погрешность площади из-за хорд
+    :return: Кортеж из x и y координат контура ДНА
+    """
+    phi = adaptive_lobe_angles(W, max_range, threshold, tolerance)
+    distances = max_range * np.exp(-attenuation_factor(W) * phi**2)
+
+    theta = np.deg2rad(phi + A)
+    x_fill = np.concatenate([[0.0], distances * np.cos(theta)])
+    y_fill = np.concatenate([[0.0], distances * np.sin(theta)])
+
+    return x_fill, y_fill
+
+
+def compute_lobe_outline_dense(A, W, max_range):
+    """
+    Эталонный контур ДНА с плотной равномерной дискретизацией (3600 точек на -360..360°)
+
+    :param A: Угол направления ДНА
+    :param W: Ширина ДНА
+    :param max_range: Максимальная дальность ДНА
+    :return: Кортеж из x и y координат контура ДНА
+    """
+    angles_deg = np.linspace(-360, 360, 3600)
+
+    main_lobe = np.exp(-attenuation_factor(W) * (angles_deg - A)**2)
+    main_lobe = main_lobe / np.max(main_lobe)
+
+    max_range_distances = main_lobe * max_range
+
+    theta = np.deg2rad(angles_deg)
+    x_fill = max_range_distances * np.cos(theta)
+    y_fill = max_range_distances * np.sin(theta)
+
+    return x_fill, y_fill
+
+
+def compute_lobe(rls, max_range):
+    """
+    Расчёт контура диаграммы направленности антенны (ДНА)
+
+    :param rls: РЛС объект
+    :param max_range: Максимальная дальность ДНА
+    :return: Кортеж из x и y координат контура ДНА
+    """
+    x_fill, y_fill = compute_lobe_outline(rls.A, rls.W, max_range)
+    return x_fill + rls.x, y_fill + rls.y
@@ -0,0 +1,230 @@
+"""
+Оценка точности местоопределения методом Монте-Карло
+
+Площади областей варианта - геометрическая мера неопределённости. Здесь
+оценивается статистика: истинное положение цели равномерно распределено по
+области варианта, к измерениям добавляется шум, согласованный с погрешностями
+зон, и по линеаризованной модели вычисляется оценка положения цели
+
+    e = J^-1 * n,
+
+где J - матрица градиентов измеряемых величин в точке цели (вариант 1 - сумма
+и разность расстояний d1 + d2, d2 - d1; вариант 3 - дальности d1, d2), n - шум
+измерений. Попадание - оценка положения цели лежит в той же области. Для каждой
+области возвращаются вероятность попадания, ковариация ошибки положения и
+площадь области с доверительными интервалами.
+
+Шум измерения - нормальный со СКО, равным половине ширины зоны (эллипс -
+E_ellipse, гипербола - 2 * E_hyperbola, кольцо - error / 2), или равномерный
+в пределах зоны.
+
+Цели выбираются в ячейках грубой сетки, задевающих область, с отбраковкой по
+engine.predicates. Выборка делится на блоки фиксированного размера, каждый со
+своим генератором из SeedSequence(seed).spawn, поэтому результат при заданном
+seed не зависит от количества процессов.
+"""
+import math
+from statistics import NormalDist
+
+import numpy as np
+
+from engine.accuracy import measurement_errors, measurement_gradients, unit_vectors
+from engine.predicates import variant_masks
+from engine.raster import variant_extent
+
+# Количество ячеек сетки отбора целей по большей стороне области варианта
+MC_GRID = 256
+
+# Размер блока выборки (точек на генератор)
+MC_CHUNK = 1 << 20
+
+# Распределения шума измерений
+MC_NOISE = ('normal', 'uniform')
+
+# Порог вырожденности матрицы градиентов (цель на линии РЛС)
+_SINGULAR = 1e-9
+
+# Суммы блока: точки, цели, попадания, вырожденные, e (2), e e^T (3), (e e^T)^2 (3)
+_SUMS = 12
+
+
+def candidate_cells(variant, area, rls1, rls2, grid=MC_GRID, **params):
+    """
+    Ячейки грубой сетки, задевающие область варианта
+
+    Отбираются ячейки, хотя бы один угол которых лежит в области, и их соседи,
+    поэтому области уже ячейки, не задевающие ни одного узла, могут быть пропущены.
+
+    :param variant: Номер варианта
+    :param area: Номер области (в порядке площадей compute_variant)
+    :param rls1: Первый РЛС объект
+    :param rls2: Второй РЛС объект
+    :param grid: Количество ячеек по большей стороне области варианта
+    :param params: Параметры зон и погрешностей соответствующего варианта
+    :return: Кортеж из левых нижних углов ячеек (массив формы (M, 2)) и размера ячейки
+    """
+    x_min, y_min, x_max, y_max = variant_extent(variant, rls1, rls2, **params)
+    if x_min >= x_max or y_min >= y_max:
+        return np.empty((0, 2)), 0.0
+    cell = max(x_max - x_min, y_max - y_min) / grid
+    nx, ny = math.ceil((x_max - x_min) / cell), math.ceil((y_max - y_min) / cell)
+    x = x_min + cell * np.arange(nx + 1)
+    y = y_min + cell * np.arange(ny + 1)
+    points = np.stack(np.meshgrid(x, y), axis=-1).reshape(-1, 2)
+
+    corners = variant_masks(variant, points, rls1, rls2, **params)[area].reshape(ny + 1, nx + 1)
+    touched = corners[:-1, :-1] | corners[1:, :-1] | corners[:-1, 1:] | corners[1:, 1:]
+    # Соседние ячейки (область может заходить в ячейку, не задевая её углов)
+    padded = np.pad(touched, 1)
+    touched = (padded[1:-1, 1:-1] | padded[:-2, 1:-1] | padded[2:, 1:-1] | padded[1:-1, :-2] | padded[1:-1, 2:]
+               | padded[:-2, :-2] | padded[:-2, 2:] | padded[2:, :-2] | padded[2:, 2:])
+    rows, columns = np.nonzero(touched)
+    return np.column_stack((x[columns], y[rows])), cell
+
+
+def sample_block(variant, area, rls1, rls2, params, cells, cell, size, seed, noise='normal'):
+    """
+    Суммы одного блока выборки
+
+    :param variant: Номер варианта (1 или 3)
+    :param area: Номер области
+    :param rls1: Первый РЛС объект
+    :param rls2: Второй РЛС объект
+    :param params: Параметры зон и погрешностей варианта
+    :param cells: Ячейки отбора целей (candidate_cells)
+    :param cell: Размер ячейки
+    :param size: Количество точек блока
+    :param seed: SeedSequence блока
+    :param noise: Распределение шума измерений ('normal' или 'uniform')
+    :return: Массив сумм блока длины _SUMS
+    """
+    rng = np.random.default_rng(seed)
+    points = cells[rng.integers(len(cells), size=size)] + cell * rng.random((size, 2))
+    targets = points[variant_masks(variant, points, rls1, rls2, **params)[area]]
+
+    half = np.array(measurement_errors(variant, **params))
+    if noise == 'normal':
+        n = rng.standard_normal((len(targets), 2)) * half
+    else:
+        n = rng.uniform(-1, 1, (len(targets), 2)) * half
+
+    # Ошибка положения по линеаризованной модели: e = J^-1 * n
+    a, b, c, d = measurement_gradients(variant, unit_vectors(targets, rls1), unit_vectors(targets, rls2))
+    det = a * d - b * c
+    regular = np.abs(det) > _SINGULAR
+    det = np.where(regular, det, 1.0)
+    errors = np.column_stack(((d * n[:, 0] - b * n[:, 1]) / det, (a * n[:, 1] - c * n[:, 0]) / det))[regular]
+    hits = variant_masks(variant, targets[regular] + errors, rls1, rls2, **params)[area]
+
+    products = np.column_stack((errors[:, 0]**2, errors[:, 0] * errors[:, 1], errors[:, 1]**2))
+    sums = np.zeros(_SUMS)
+    sums[:4] = size, len(targets), np.count_nonzero(hits), len(targets) - len(errors)
+    sums[4:6] = errors.sum(axis=0)
+    sums[6:9] = products.sum(axis=0)
+    sums[9:12] = (products**2).sum(axis=0)
+    return sums
+
+
+def _sample_block(task):
+    return sample_block(*task)
+
+
+def wilson_interval(successes, total, z):
+    """
+    Доверительный интервал Уилсона для доли
+
+    :param successes: Количество успехов
+    :param total: Количество испытаний
+    :param z: Квантиль нормального распределения
+    :return: Кортеж (нижняя граница, верхняя граница)
+    """
+    if total == 0:
+        return 0.0, 1.0
+    p = successes / total
+    scale = 1 + z**2 / total
+    center = (p + z**2 / (2 * total)) / scale
+    half = z / scale * math.sqrt(p * (1 - p) / total + z**2 / (4 * total**2))
+    return max(center - half, 0.0), min(center + half, 1.0)
+
+
+def _summary(sums, cell_area, z):
+    """Статистика области по суммам блоков."""
+    drawn, targets, hits, singular = (int(value) for value in sums[:4])
+    regular = targets - singular
+
+    area_low, area_high = wilson_interval(targets, drawn, z)
+    result = {
+        'samples': drawn,
+        'targets': targets,
+        'hits': hits,
+        'singular': singular,
+        'area': targets / drawn * cell_area if drawn else 0.0,
+        'area_ci': (area_low * cell_area, area_high * cell_area),
+        'probability': hits / targets if targets else 0.0,
+        'probability_ci': wilson_interval(hits, targets, z),
+        'mean': [0.0, 0.0],
+        'covariance': [[0.0, 0.0], [0.0, 0.0]],
+        'covariance_ci': ([[0.0, 0.0], [0.0, 0.0]], [[0.0, 0.0], [0.0, 0.0]]),
+    }
+    if regular < 2:
+        return result
+
+    mean = sums[4:6] / regular
+    moments = sums[6:9] / regular
+    covariance = (moments - np.array([mean[0]**2, mean[0] * mean[1], mean[1]**2])) * regular / (regular - 1)
+    # Стандартная ошибка выборочных вторых моментов
+    spread = z * np.sqrt(np.maximum(sums[9:12] / regular - moments**2, 0) / regular)
+
+    def matrix(values):
+        return [[float(values[0]), float(values[1])], [float(values[1]), float(values[2])]]
+
+    result['mean'] = mean.tolist()
+    result['covariance'] = matrix(covariance)
+    result['covariance_ci'] = (matrix(covariance - spread), matrix(covariance + spread))
+    return result
+
+
+def monte_carlo(variant, rls1, rls2, samples=MC_CHUNK, seed=0, workers=1, noise='normal', confidence=0.95,
+                chunk=MC_CHUNK, **params):
+    """
+    Оценка точности местоопределения для областей варианта методом Монте-Карло
+
+    :param variant: Номер варианта (1 или 3)
+    :param rls1: Первый РЛС объект
+    :param rls2: Второй РЛС объект
+    :param samples: Количество точек выборки на область (цели - точки, попавшие в область)
+    :param seed: Начальное значение генератора
+    :param workers: Количество процессов (1 - без пула, None - по числу ядер)
+    :param noise: Распределение шума измерений ('normal' или 'uniform')
+    :param confidence: Доверительная вероятность интервалов
+    :param chunk: Размер блока выборки
+    :param params: Параметры зон и погрешностей соответствующего варианта
+    :return: Список словарей статистики (в порядке площадей compute_variant)
+    """
+    if noise not in MC_NOISE:
+        raise ValueError(f"Неизвестное распределение шума: {noise}")
+    measurement_errors(variant, **params)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    count = len(variant_masks(variant, np.empty((0, 2)), rls1, rls2, **params))
+    sizes = [min(chunk, samples - start) for start in range(0, samples, chunk)]
+
+    tasks = []
+    areas = []
+    for area, area_seed in enumerate(np.random.SeedSequence(seed).spawn(count)):
+        cells, cell = candidate_cells(variant, area, rls1, rls2, **params)
+        areas.append(len(cells) * cell**2)
+        if len(cells):
+            tasks += [(variant, area, rls1, rls2, params, cells, cell, size, block_seed, noise)
+                      for size, block_seed in zip(sizes, area_seed.spawn(len(sizes)))]
+
+    if workers == 1:
+        blocks = list(map(_sample_block, tasks))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            blocks = list(pool.map(_sample_block, tasks))
+
+    sums = np.zeros((count, _SUMS))
+    for task, block in zip(tasks, blocks):
+        sums[task[1]] += block
+    return [_summary(area_sums, cell_area, z) for area_sums, cell_area in zip(sums, areas)]
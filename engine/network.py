@@ -0,0 +1,98 @@
+"""
+Сеть из произвольного количества РЛС с расчётом вариантов для пар станций
+
+Варианты рассчитываются только для пар, ДНА которых пересекаются. Пары
+отбираются по пространственному индексу (STRtree) полигонов ДНА: кандидаты
+находятся по описанным прямоугольникам, затем проверяется точное
+пересечение, поэтому для реальных расстановок, где каждая РЛС видит лишь
+соседей, количество проверок растёт почти линейно.
+"""
+from shapely import STRtree
+
+from engine.geometry import VARIANT1_RANGE_SCALE, compute_variant, lobe_cache
+from models.presets import VARIANT_DEFAULTS
+
+
+def lobe_range_scale(variant):
+    """
+    Множитель дальности ДНА, используемый вариантом
+
+    :param variant: Номер варианта
+    :return: Множитель дальности
+    """
+    return VARIANT1_RANGE_SCALE if variant == 1 else 1.0
+
+
+class StationNetwork:
+    """Набор РЛС с отбором пар станций с пересекающимися ДНА."""
+
+    def __init__(self, stations=()):
+        """
+        :param stations: РЛС объекты
+        """
+        self.stations = list(stations)
+
+    def __len__(self):
+        return len(self.stations)
+
+    def __iter__(self):
+        return iter(self.stations)
+
+    def __getitem__(self, index):
+        return self.stations[index]
+
+    def add(self, rls):
+        """
+        Добавление РЛС в сеть
+
+        :param rls: РЛС объект
+        :return: Индекс РЛС в сети
+        """
+        self.stations.append(rls)
+        return len(self.stations) - 1
+
+    def lobe_polygons(self, variant=1):
+        """
+        Полигоны ДНА всех РЛС с дальностью, используемой вариантом
+
+        :param variant: Номер варианта
+        :return: Список полигонов Shapely
+        """
+        scale = lobe_range_scale(variant)
+        return [lobe_cache.lobe(rls, rls.R * scale)[2] for rls in self.stations]
+
+    def overlapping_pairs(self, variant=1):
+        """
+        Пары РЛС, ДНА которых пересекаются
+
+        :param variant: Номер варианта (определяет дальность ДНА)
+        :return: Отсортированный список пар индексов (i, j), i < j
+        """
+        polygons = self.lobe_polygons(variant)
+        if len(polygons) < 2:
+            return []
+        tree = STRtree(polygons)
+        left, right = tree.query(polygons, predicate='intersects')
+        return sorted((int(i), int(j)) for i, j in zip(left, right) if i < j)
+
+    def compute_pairs(self, variant, params=None, pairs=None):
+        """
+        Расчёт варианта для пар РЛС с пересекающимися ДНА
+
+        :param variant: Номер варианта (1, 2 или 3)
+        :param params: Параметры варианта: словарь, общий для всех пар, или функция
+                       (i, j, rls_i, rls_j) -> словарь (по умолчанию - начальные параметры варианта)
+        :param pairs: Пары индексов для расчёта (по умолчанию overlapping_pairs)
+        :return: Словарь {(i, j): результат compute_variant}
+        """
+        if params is None:
+            params = VARIANT_DEFAULTS[variant]
+        if pairs is None:
+            pairs = self.overlapping_pairs(variant)
+
+        results = {}
+        for i, j in pairs:
+            rls1, rls2 = self.stations[i], self.stations[j]
+            pair_params = params(i, j, rls1, rls2) if callable(params) else params
+            results[(i, j)] = compute_variant(variant, rls1, rls2, **pair_params)
+        return results
@@ -0,0 +1,151 @@
+"""
+Проверка принадлежности точек зонам без построения полигонов
+
+Каждая зона задаётся неравенством в полярных координатах РЛС или через
+сумму и разность расстояний до двух РЛС, поэтому проверка сводится к
+нескольким операциям над массивами. Точки передаются массивом формы (N, 2),
+результат - булев массив формы (N,). РЛС - любой объект с атрибутами
+x, y, R, A, W.
+"""
+import numpy as np
+
+from engine.lobes import VARIANT1_RANGE_SCALE, attenuation_factor
+
+
+def _offsets(points, rls):
+    """Смещения точек относительно РЛС."""
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    return points[:, 0] - rls.x, points[:, 1] - rls.y
+
+
+def _distance(points, rls):
+    return np.hypot(*_offsets(points, rls))
+
+
+def in_lobe(points, rls, max_range=None):
+    """
+    Принадлежность точек ДНА: d <= R * exp(-k * (phi - A)^2)
+
+    :param points: Точки, массив формы (N, 2)
+    :param rls: РЛС объект
+    :param max_range: Максимальная дальность ДНА (по умолчанию rls.R)
+    :return: Булев массив формы (N,)
+    """
+    if max_range is None:
+        max_range = rls.R
+    dx, dy = _offsets(points, rls)
+    delta = (np.rad2deg(np.arctan2(dy, dx)) - rls.A + 180) % 360 - 180
+    return np.hypot(dx, dy) <= max_range * np.exp(-attenuation_factor(rls.W) * delta**2)
+
+
+def in_ellipse_band(points, rls1, rls2, R1, R2, E_ellipse):
+    """
+    Принадлежность точек зоне эллипса: R1 + R2 <= d1 + d2 <= R1 + R2 + 2E
+
+    :param points: Точки, массив формы (N, 2)
+    :param rls1: Первый РЛС объект
+    :param rls2: Второй РЛС объект
+    :param R1: Дальность до цели от первой РЛС
+    :param R2: Дальность до цели от второй РЛС
+    :param E_ellipse: Погрешность эллипса
+    :return: Булев массив формы (N,)
+    """
+    total = _distance(points, rls1) + _distance(points, rls2)
+    return (total >= R1 + R2) & (total <= R1 + R2 + 2 * E_ellipse)
+
+
+def in_hyperbola_band(points, rls1, rls2, low, high):
+    """
+    Принадлежность точек зоне гиперболы: low <= d2 - d1 <= high
+
+    :param points: Точки, массив формы (N, 2)
+    :param rls1: Первый РЛС объект
+    :param rls2: Второй РЛС объект
+    :param low: Нижняя граница разности расстояний d2 - d1
+    :param high: Верхняя граница разности расстояний d2 - d1
+    :return: Булев массив формы (N,)
+    """
+    difference = _distance(points, rls2) - _distance(points, rls1)
+    return (difference >= low) & (difference <= high)
+
+
+def hyperbola_bands(rls1, rls2, R1, R2, E_hyperbola):
+    """
+    Границы зон гипербол варианта 1
+
+    :return: Список из двух пар (low, high) для d2 - d1: зона R2 - R1 и её отражение
+    """
+    c_h1 = R2 - R1
+    return [(c_h1 - 2 * E_hyperbola, c_h1 + 2 * E_hyperbola), (-c_h1 - 2 * E_hyperbola, -c_h1 + 2 * E_hyperbola)]
+
+
+def in_range_ring(points, rls, radius, error):
+    """
+    Принадлежность точек дальномерному кольцу погрешности: radius <= d <= radius + error
+
+    :param points: Точки, массив формы (N, 2)
+    :param rls: РЛС объект
+    :param radius: Измеренная дальность
+    :param error: Погрешность дальности
+    :return: Булев массив формы (N,)
+    """
+    distance = _distance(points, rls)
+    return (distance >= radius) & (distance <= radius + error)
+
+
+def variant1_masks(points, rls1, rls2, R1, R2, E_ellipse, E_hyperbola):
+    """
+    Принадлежность точек областям варианта 1 (как compute_variant1: вторая область
+    берётся только с ДНА первой РЛС)
+
+    :return: Список из двух булевых массивов формы (N,)
+    """
+    lobe1 = in_lobe(points, rls1, rls1.R * VARIANT1_RANGE_SCALE)
+    lobe2 = in_lobe(points, rls2, rls2.R * VARIANT1_RANGE_SCALE)
+    ellipse = in_ellipse_band(points, rls1, rls2, R1, R2, E_ellipse)
+    (low1, high1), (low2, high2) = hyperbola_bands(rls1, rls2, R1, R2, E_hyperbola)
+    return [
+        ellipse & in_hyperbola_band(points, rls1, rls2, low1, high1) & lobe1 & lobe2,
+        ellipse & in_hyperbola_band(points, rls1, rls2, low2, high2) & lobe1,
+    ]
+
+
+def variant2_masks(points, rls1, rls2):
+    """
+    Принадлежность точек пересечению двух ДНА (вариант 2)
+
+    :return: Список из одного булева массива формы (N,)
+    """
+    return [in_lobe(points, rls1) & in_lobe(points, rls2)]
+
+
+def variant3_masks(points, rls1, rls2, radius_rls1, error_rls1, radius_rls2, error_rls2):
+    """
+    Принадлежность точек пересечению колец погрешности и ДНА (вариант 3)
+
+    :return: Список из одного булева массива формы (N,)
+    """
+    return [in_range_ring(points, rls1, radius_rls1, error_rls1) & in_range_ring(points, rls2, radius_rls2, error_rls2)
+            & in_lobe(points, rls1) & in_lobe(points, rls2)]
+
+
+# Проверки по номеру варианта
+VARIANT_MASKS = {
+    1: variant1_masks,
+    2: variant2_masks,
+    3: variant3_masks,
+}
+
+
+def variant_masks(variant, points, rls1, rls2, **params):
+    """
+    Принадлежность точек областям варианта по его номеру
+
+    :param variant: Номер варианта (1, 2 или 3)
+    :param points: Точки, массив формы (N, 2)
+    :param rls1: Первый РЛС объект
+    :param rls2: Второй РЛС объект
+    :param params: Параметры зон и погрешностей соответствующего варианта
+    :return: Список булевых массивов в порядке площадей compute_variant
+    """
+    return VARIANT_MASKS[variant](points, rls1, rls2, **params)
@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# Переменная окружения, включающая профилирование при запуске
+PROFILE_ENV = 'RLS_PROFILE'
+
+# Количество последних замеров каждого этапа для скользящих перцентилей
+PROFILE_WINDOW = 240
+
+# Максимальное количество событий трассировки за сеанс
+TRACE_LIMIT = 200000
+
+
+class Profiler:
+    """
+    Замер длительности этапов расчёта и отрисовки
+
+    Для каждого этапа хранятся последние замеры (скользящее окно), по которым
+    считаются перцентили, и события сеанса в формате Chrome Trace Event
+    (открываются в chrome://tracing или Perfetto). Выключенный профилировщик
+    не делает замеров.
+    """
+
+    def __init__(self, enabled=False, window=PROFILE_WINDOW, trace_limit=TRACE_LIMIT):
+        """
+        :param enabled: Включить замеры
+        :param window: Количество последних замеров каждого этапа
+        :param trace_limit: Максимальное количество событий трассировки
+        """
+        self.enabled = enabled
+        self.window = window
+        self.trace_limit = trace_limit
+        self._samples = OrderedDict()
+        self._events = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def section(self, name):
+        """
+        Контекстный менеджер, замеряющий длительность блока кода
+
+        :param name: Имя этапа
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+
+    def record(self, name, start, end):
+        """
+        Запись замера этапа
+
+        :param name: Имя этапа
+        :param start: Время начала по time.perf_counter(), с
+        :param end: Время окончания по time.perf_counter(), с
+        """
+        duration_ms = (end - start) * 1000
+        event = {
+            'name': name,
+            'cat': name.split('.', 1)[0],
+            'ph': 'X',
+            'ts': (start - self._origin) * 1e6,
+            'dur': duration_ms * 1000,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+        }
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append(duration_ms)
+            if len(self._events) < self.trace_limit:
+                self._events.append(event)
+
+    def percentiles(self, name, q=(50, 95, 99)):
+        """
+        Скользящие перцентили длительности этапа
+
+        :param name: Имя этапа
+        :param q: Перцентили
+        :return: Массив длительностей в мс (пустой, если замеров нет)
+        """
+        with self._lock:
+            samples = np.array(self._samples.get(name, ()))
+        if samples.size == 0:
+            return np.array([])
+        return np.percentile(samples, q)
+
+    def summary(self):
+        """
+        Сводка по всем этапам
+
+        :return: Словарь {имя этапа: {'count', 'last', 'p50', 'p95', 'p99'}}, длительности в мс
+        """
+        with self._lock:
+            samples = {name: np.array(values) for name, values in self._samples.items()}
+        return {
+            name: {
+                'count': len(values),
+                'last': float(values[-1]),
+                'p50': float(np.percentile(values, 50)),
+                'p95': float(np.percentile(values, 95)),
+                'p99': float(np.percentile(values, 99)),
+            }
+            for name, values in samples.items() if len(values) > 0
+        }
+
+    def dump_trace(self, path):
+        """
+        Сохранение событий сеанса в файл Chrome Trace (JSON)
+
+        :param path: Путь к файлу
+        """
+        with self._lock:
+            events = list(self._events)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    def reset(self):
+        """Очистка замеров и событий."""
+        with self._lock:
+            self._samples.clear()
+            self._events.clear()
+            self._origin = time.perf_counter()
+
+
+# Общий профилировщик приложения; включается переменной окружения RLS_PROFILE=1
+profiler = Profiler(enabled=os.environ.get(PROFILE_ENV, '') not in ('', '0'))
@@ -0,0 +1,164 @@
+"""
+Растровый расчёт областей вариантов на регулярной сетке (без полигонов)
+
+Область расчёта делится на плитки фиксированного размера; в каждой плитке
+зоны проверяются в узлах сетки (углах ячеек) функциями engine.predicates,
+поэтому память ограничена размером плитки при любом размере области.
+Плитки независимы и могут считаться в пуле процессов.
+
+Площадь ячейки внутри области оценивается долей её углов, лежащих в области.
+Погрешность площади возникает только в граничных ячейках (углы которых
+лежат по разные стороны границы) и не превышает 3/4 площади ячейки на каждую
+из них; эта оценка возвращается вместе с площадью. На практике погрешности
+соседних граничных ячеек взаимно компенсируются, и фактическая погрешность
+много меньше. Детали области меньше ячейки могут быть пропущены.
+"""
+import math
+
+import numpy as np
+
+from engine.lobes import VARIANT1_RANGE_SCALE
+from engine.predicates import variant_masks
+
+# Размер ячейки сетки по умолчанию
+RASTER_CELL = 1.0
+
+# Размер плитки в ячейках (плитка RASTER_TILE x RASTER_TILE)
+RASTER_TILE = 512
+
+# Максимальная погрешность доли ячейки, оцененной по четырём углам
+_MIXED_CELL_ERROR = 0.75
+
+
+def _circle_box(x, y, radius):
+    return x - radius, y - radius, x + radius, y + radius
+
+
+def _ellipse_box(rls1, rls2, total):
+    """Прямоугольник, описанный вокруг эллипса d1 + d2 = total."""
+    a = total / 2
+    c = np.hypot(rls2.x - rls1.x, rls2.y - rls1.y) / 2
+    b = np.sqrt(max(a**2 - c**2, 0))
+    angle = np.arctan2(rls2.y - rls1.y, rls2.x - rls1.x)
+    half_x = np.hypot(a * np.cos(angle), b * np.sin(angle))
+    half_y = np.hypot(a * np.sin(angle), b * np.cos(angle))
+    x, y = (rls1.x + rls2.x) / 2, (rls1.y + rls2.y) / 2
+    return x - half_x, y - half_y, x + half_x, y + half_y
+
+
+def variant_extent(variant, rls1, rls2, **params):
+    """
+    Прямоугольник, содержащий все области варианта
+
+    Все области лежат внутри ДНА первой РЛС (круга её дальности); в варианте 1 -
+    внутри внешнего эллипса, в вариантах 2 и 3 - внутри ДНА второй РЛС, в
+    варианте 3 - внутри внешних окружностей колец.
+
+    :return: Кортеж (x_min, y_min, x_max, y_max); пустая область, если x_min >= x_max или y_min >= y_max
+    """
+    if variant == 1:
+        boxes = [_circle_box(rls1.x, rls1.y, rls1.R * VARIANT1_RANGE_SCALE),
+                 _ellipse_box(rls1, rls2, params['R1'] + params['R2'] + 2 * params['E_ellipse'])]
+    else:
+        boxes = [_circle_box(rls1.x, rls1.y, rls1.R), _circle_box(rls2.x, rls2.y, rls2.R)]
+    if variant == 3:
+        boxes += [_circle_box(rls1.x, rls1.y, params['radius_rls1'] + params['error_rls1']),
+                  _circle_box(rls2.x, rls2.y, params['radius_rls2'] + params['error_rls2'])]
+    x_min, y_min, x_max, y_max = zip(*boxes)
+    return float(max(x_min)), float(max(y_min)), float(min(x_max)), float(min(y_max))
+
+
+def iter_tiles(extent, cell=RASTER_CELL, tile=RASTER_TILE):
+    """
+    Разбиение области на плитки
+
+    :param extent: Прямоугольник (x_min, y_min, x_max, y_max)
+    :param cell: Размер ячейки
+    :param tile: Размер плитки в ячейках
+    :return: Генератор кортежей (x0, y0, nx, ny) - левый нижний угол и размер плитки в ячейках
+    """
+    x_min, y_min, x_max, y_max = extent
+    nx = max(math.ceil((x_max - x_min) / cell), 0)
+    ny = max(math.ceil((y_max - y_min) / cell), 0)
+    for j in range(0, ny, tile):
+        for i in range(0, nx, tile):
+            yield x_min + i * cell, y_min + j * cell, min(tile, nx - i), min(tile, ny - j)
+
+
+def tile_areas(variant, rls1, rls2, params, x0, y0, nx, ny, cell):
+    """
+    Площади областей варианта в одной плитке
+
+    :return: Кортеж из массивов площадей и оценок их погрешности (по одной на область)
+    """
+    x = x0 + cell * np.arange(nx + 1)
+    y = y0 + cell * np.arange(ny + 1)
+    points = np.stack(np.meshgrid(x, y), axis=-1).reshape(-1, 2)
+
+    areas = []
+    errors = []
+    for mask in variant_masks(variant, points, rls1, rls2, **params):
+        corners = mask.reshape(ny + 1, nx + 1).astype(np.uint8)
+        inside = corners[:-1, :-1] + corners[1:, :-1] + corners[:-1, 1:] + corners[1:, 1:]
+        areas.append(inside.sum() / 4 * cell**2)
+        errors.append(np.count_nonzero((inside > 0) & (inside < 4)) * _MIXED_CELL_ERROR * cell**2)
+    return np.array(areas), np.array(errors)
+
+
+def _tile_areas(task):
+    return tile_areas(*task)
+
+
+def raster_areas(variant, rls1, rls2, cell=RASTER_CELL, extent=None, tile=RASTER_TILE, workers=1, **params):
+    """
+    Площади областей варианта подсчётом ячеек сетки
+
+    :param variant: Номер варианта (1, 2 или 3)
+    :param rls1: Первый РЛС объект
+    :param rls2: Второй РЛС объект
+    :param cell: Размер ячейки
+    :param extent: Прямоугольник расчёта (по умолчанию variant_extent)
+    :param tile: Размер плитки в ячейках
+    :param workers: Количество процессов (1 - без пула, None - по числу ядер)
+    :param params: Параметры зон и погрешностей соответствующего варианта
+    :return: Кортеж из списков площадей (в порядке compute_variant) и оценок их погрешности
+    """
+    if extent is None:
+        extent = variant_extent(variant, rls1, rls2, **params)
+    tasks = ((variant, rls1, rls2, params, x0, y0, nx, ny, cell) for x0, y0, nx, ny in iter_tiles(extent, cell, tile))
+
+    count = len(variant_masks(variant, np.empty((0, 2)), rls1, rls2, **params))
+    if workers == 1:
+        return _sum_tiles(map(_tile_areas, tasks), count)
+
+    # multiprocessing загружается только для расчёта в пуле процессов
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return _sum_tiles(pool.map(_tile_areas, tasks, chunksize=4), count)
+
+
+def _sum_tiles(results, count):
+    areas, errors = np.zeros(count), np.zeros(count)
+    for tile_area, tile_error in results:
+        areas += tile_area
+        errors += tile_error
+    return areas.tolist(), errors.tolist()
+
+
+def rasterize(variant, rls1, rls2, extent, cell=RASTER_CELL, **params):
+    """
+    Маски областей варианта в центрах ячеек сетки (для отображения небольших сеток)
+
+    :param variant: Номер варианта (1, 2 или 3)
+    :param rls1: Первый РЛС объект
+    :param rls2: Второй РЛС объект
+    :param extent: Прямоугольник (x_min, y_min, x_max, y_max)
+    :param cell: Размер ячейки
+    :param params: Параметры зон и погрешностей соответствующего варианта
+    :return: Список булевых массивов формы (ny, nx), строка 0 - нижняя
+    """
+    x_min, y_min, x_max, y_max = extent
+    x = x_min + cell * (np.arange(max(math.ceil((x_max - x_min) / cell), 0)) + 0.5)
+    y = y_min + cell * (np.arange(max(math.ceil((y_max - y_min) / cell), 0)) + 0.5)
+    points = np.stack(np.meshgrid(x, y), axis=-1).reshape(-1, 2)
+    return [mask.reshape(len(y), len(x)) for mask in variant_masks(variant, points, rls1, rls2, **params)]
@@ -0,0 +1,364 @@
+"""
+Постоянный кэш результатов расчёта вариантов на диске (SQLite)
+
+Ключ записи - SHA-256 канонического JSON из номера варианта, параметров РЛС,
+параметров зон и погрешностей, движка расчёта и параметров дискретизации
+контуров (RESULT_RESOLUTION), поэтому при изменении любого из них ключ
+меняется. В записи хранятся площади, полигоны пересечений в формате WKB и,
+при необходимости, линии для отображения (контуры ДНА, эллипсы, гиперболы)
+в виде массивов numpy. Размер кэша ограничен; при превышении удаляются
+записи, к которым дольше всего не обращались (LRU).
+
+Путь к файлу задаётся переменной окружения RLS_RESULT_CACHE (значение off
+отключает кэш), по умолчанию - ~/.cache/radar-simulation/results.sqlite.
+"""
+import hashlib
+import inspect
+import io
+import json
+import os
+import sqlite3
+import struct
+import threading
+import time
+
+import numpy as np
+import shapely
+
+from engine.bands import BAND_BRANCH_SAMPLES
+from engine.geometry import VARIANT1_RANGE_SCALE, compute_variant
+from engine.lobes import LOBE_THRESHOLD, LOBE_TOLERANCE
+from utils.ellipse_calculator import compute_ellipse_batch
+from utils.hyperbola_calculator import compute_hyperbola_batch
+
+# Версия формата записей и алгоритмов расчёта (увеличивается при их изменении)
+RESULT_CACHE_VERSION = 1
+
+# Максимальный размер кэша по умолчанию, байт
+RESULT_CACHE_SIZE = 256 * 1024 * 1024
+
+# Доля максимального размера, до которой кэш сокращается при вытеснении
+_EVICT_TO = 0.9
+
+# Количество ключей в одном запросе чтения (ограничение SQLite на число параметров)
+_BATCH = 500
+
+# Параметры дискретизации, от которых зависят полигоны и линии
+RESULT_RESOLUTION = {
+    'lobe_tolerance': LOBE_TOLERANCE,
+    'lobe_threshold': LOBE_THRESHOLD,
+    'band_samples': BAND_BRANCH_SAMPLES,
+    'ellipse_samples': inspect.signature(compute_ellipse_batch).parameters['samples'].default,
+    'hyperbola_samples': inspect.signature(compute_hyperbola_batch).parameters['samples'].default,
+    'variant1_range_scale': VARIANT1_RANGE_SCALE,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    areas TEXT NOT NULL,
+    polygons BLOB,
+    curves BLOB,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+
+
+def default_cache_path():
+    """
+    Путь к файлу кэша
+
+    :return: Путь или None, если кэш отключён (RLS_RESULT_CACHE=off)
+    """
+    path = os.environ.get('RLS_RESULT_CACHE')
+    if path is None:
+        return os.path.join(os.path.expanduser('~'), '.cache', 'radar-simulation', 'results.sqlite')
+    return None if path.lower() in ('', 'off') else path
+
+
+def result_key(variant, rls1, rls2, engine='polygon', **params):
+    """
+    Ключ результата: SHA-256 канонического описания конфигурации
+
+    :param variant: Номер варианта
+    :param rls1: Первый РЛС объект
+    :param rls2: Второй РЛС объект
+    :param engine: Движок расчёта (строка или список из имени и настроек, влияющих на результат)
+    :param params: Параметры зон и погрешностей варианта
+    :return: Шестнадцатеричная строка ключа
+    """
+    def station(rls):
+        # + 0.0 приводит -0.0 к 0.0
+        return [float(getattr(rls, name)) + 0.0 for name in ('x', 'y', 'R', 'A', 'W')]
+
+    description = {
+        'version': RESULT_CACHE_VERSION,
+        'variant': int(variant),
+        'rls1': station(rls1),
+        'rls2': station(rls2),
+        'params': {name: float(value) + 0.0 for name, value in params.items()},
+        'engine': engine,
+        'resolution': RESULT_RESOLUTION,
+    }
+    canonical = json.dumps(description, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _pack_polygons(geometries):
+    """Список геометрий в WKB, каждая с префиксом длины."""
+    return b''.join(struct.pack('<I', len(wkb)) + wkb for wkb in shapely.to_wkb(list(geometries)))
+
+
+def _unpack_polygons(data):
+    wkbs = []
+    offset = 0
+    while offset < len(data):
+        length, = struct.unpack_from('<I', data, offset)
+        wkbs.append(data[offset + 4:offset + 4 + length])
+        offset += 4 + length
+    return list(shapely.from_wkb(wkbs))
+
+
+def _encode(value, arrays):
+    """Структура результата в JSON-совместимый вид; массивы заменяются ссылками на arrays."""
+    if isinstance(value, np.ndarray):
+        arrays.append(value)
+        return {'__array__': len(arrays) - 1}
+    if isinstance(value, dict):
+        return {'__dict__': {key: _encode(item, arrays) for key, item in value.items()}}
+    if isinstance(value, tuple):
+        return {'__tuple__': [_encode(item, arrays) for item in value]}
+    if isinstance(value, list):
+        return [_encode(item, arrays) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _decode(value, arrays):
+    if isinstance(value, dict):
+        if '__array__' in value:
+            return arrays[f"a{value['__array__']}"]
+        if '__tuple__' in value:
+            return tuple(_decode(item, arrays) for item in value['__tuple__'])
+        return {key: _decode(item, arrays) for key, item in value['__dict__'].items()}
+    if isinstance(value, list):
+        return [_decode(item, arrays) for item in value]
+    return value
+
+
+def _pack_curves(result):
+    """Линии результата (всё, кроме площадей и полигонов) в один npz-блок."""
+    arrays = []
+    structure = _encode({key: value for key, value in result.items() if key not in ('areas', 'intersections')},
+                        arrays)
+    buffer = io.BytesIO()
+    np.savez(buffer, structure=np.array(json.dumps(structure)), **{f'a{i}': array for i, array in enumerate(arrays)})
+    return buffer.getvalue()
+
+
+def _unpack_curves(data):
+    with np.load(io.BytesIO(data)) as arrays:
+        arrays = dict(arrays)
+    return _decode(json.loads(str(arrays['structure'])), arrays)
+
+
+class ResultCache:
+    """Кэш результатов в файле SQLite с ограничением размера и вытеснением LRU."""
+
+    def __init__(self, path, max_bytes=RESULT_CACHE_SIZE):
+        """
+        :param path: Путь к файлу базы
+        :param max_bytes: Максимальный суммарный размер записей, байт
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript(_SCHEMA)
+        # Суммарный размер записей; другие процессы могут дописывать в тот же файл,
+        # поэтому перед вытеснением он уточняется запросом к базе
+        self._size, = self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()
+
+    def get(self, key, curves=True):
+        """
+        Чтение результата
+
+        :param key: Ключ (result_key)
+        :param curves: Требуются линии для отображения (записи без линий считаются отсутствующими)
+        :return: Словарь результата ('areas', 'errors', 'intersections' и, если сохранены, линии) или None
+        """
+        return self.get_many([key], curves)[0]
+
+    def get_many(self, keys, curves=True):
+        """
+        Чтение результатов одним запросом к базе
+
+        :param keys: Список ключей
+        :param curves: Требуются линии для отображения
+        :return: Список результатов (None для отсутствующих) в порядке ключей
+        """
+        rows = {}
+        with self._lock:
+            for start in range(0, len(keys), _BATCH):
+                batch = keys[start:start + _BATCH]
+                query = f"SELECT key, areas, polygons, curves FROM results WHERE key IN ({','.join('?' * len(batch))})"
+                for key, *row in self._connection.execute(query, batch):
+                    if not (curves and row[2] is None):
+                        rows[key] = row
+            if rows:
+                now = time.time()
+                with self._connection:
+                    self._connection.executemany('UPDATE results SET accessed = ? WHERE key = ?',
+                                                 [(now, key) for key in rows])
+            self.hits += len(rows)
+            self.misses += len(keys) - len(rows)
+
+        results = []
+        for key in keys:
+            row = rows.get(key)
+            if row is None:
+                results.append(None)
+                continue
+            areas, polygons, curve_data = row
+            result = _unpack_curves(curve_data) if curve_data is not None else {}
+            result.update(json.loads(areas))
+            if polygons is not None:
+                result['intersections'] = _unpack_polygons(polygons)
+            results.append(result)
+        return results
+
+    def put(self, key, result, curves=True):
+        """
+        Запись результата
+
+        :param key: Ключ (result_key)
+        :param result: Словарь результата: 'areas', необязательные 'errors' и 'intersections', линии
+        :param curves: Сохранять линии для отображения
+        """
+        self.put_many([(key, result)], curves)
+
+    def put_many(self, items, curves=True):
+        """
+        Запись результатов одной транзакцией
+
+        Запись без линий не заменяет уже сохранённую запись (возможно, с линиями).
+
+        :param items: Список пар (ключ, результат)
+        :param curves: Сохранять линии для отображения
+        """
+        rows = []
+        for key, result in items:
+            areas = json.dumps({name: result[name] for name in ('areas', 'errors') if name in result})
+            polygons = _pack_polygons(result['intersections']) if 'intersections' in result else None
+            curve_data = _pack_curves(result) if curves else None
+            size = len(areas) + len(polygons or b'') + len(curve_data or b'')
+            rows.append((key, areas, polygons, curve_data, size, time.time()))
+
+        statement = 'REPLACE' if curves else 'IGNORE'
+        with self._lock:
+            with self._connection:
+                self._connection.executemany(
+                    f'INSERT OR {statement} INTO results (key, areas, polygons, curves, size, accessed) '
+                    'VALUES (?, ?, ?, ?, ?, ?)', rows)
+            self._size += sum(row[4] for row in rows)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Удаление давно не использованных записей до _EVICT_TO от максимального размера."""
+        self._size, = self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()
+        if self._size <= self.max_bytes:
+            return
+        excess = self._size - _EVICT_TO * self.max_bytes
+        removed = []
+        for key, size in self._connection.execute('SELECT key, size FROM results ORDER BY accessed'):
+            if excess <= 0:
+                break
+            removed.append((key,))
+            excess -= size
+            self._size -= size
+        with self._connection:
+            self._connection.executemany('DELETE FROM results WHERE key = ?', removed)
+
+    def stats(self):
+        """
+        Статистика кэша
+
+        :return: Словарь с количеством попаданий, промахов, записей и их суммарным размером
+        """
+        with self._lock:
+            count, size = self._connection.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results').fetchone()
+            return {'hits': self.hits, 'misses': self.misses, 'entries': count, 'bytes': size}
+
+    def clear(self):
+        """Удаление всех записей и сброс счётчиков."""
+        with self._lock:
+            with self._connection:
+                self._connection.execute('DELETE FROM results')
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+_default_cache = None
+_default_pid = None
+_default_lock = threading.Lock()
+
+
+def default_result_cache():
+    """
+    Общий кэш результатов процесса (открывается при первом обращении)
+
+    :return: ResultCache или None, если кэш отключён или файл недоступен
+    """
+    global _default_cache, _default_pid
+    with _default_lock:
+        # Соединение SQLite нельзя использовать в дочернем процессе (fork пула)
+        if _default_cache is None or _default_pid != os.getpid():
+            path = default_cache_path()
+            if path is None:
+                return None
+            try:
+                _default_cache = ResultCache(path)
+            except (OSError, sqlite3.Error):
+                return None
+            _default_pid = os.getpid()
+        return _default_cache
+
+
+def cached_compute_variant(variant, rls1, rls2, cache=None, **params):
+    """
+    Расчёт варианта с чтением и записью постоянного кэша
+
+    :param variant: Номер варианта (1, 2 или 3)
+    :param rls1: Первый РЛС объект
+    :param rls2: Второй РЛС объект
+    :param cache: ResultCache (по умолчанию - default_result_cache())
+    :param params: Параметры зон и погрешностей соответствующего варианта
+    :return: Словарь с результатами расчёта варианта (как compute_variant)
+    """
+    if cache is None:
+        cache = default_result_cache()
+    if cache is None:
+        return compute_variant(variant, rls1, rls2, **params)
+
+    key = result_key(variant, rls1, rls2, **params)
+    result = cache.get(key)
+    if result is None:
+        result = compute_variant(variant, rls1, rls2, **params)
+        cache.put(key, result)
+    return result
@@ -0,0 +1,188 @@
+"""
+Пакетное определение положения цели по измерениям двух РЛС
+
+Решения находятся в замкнутой форме сразу для массивов измерений. РЛС -
+РЛС объекты (общие для всех измерений) или таблицы РЛС models.rls.StationTable
+(своя пара станций для каждого измерения).
+
+Из двух кандидатов выбирается точка, лучше согласованная с направлениями ДНА
+обеих РЛС: с наибольшим суммарным логарифмом затухания
+-k1 * (phi1 - A1)^2 - k2 * (phi2 - A2)^2.
+"""
+import numpy as np
+
+from engine.lobes import attenuation_factor
+from models.rls import StationTable
+
+# Признаки решения
+SOLUTION_NONE = 0
+SOLUTION_TANGENT = 1
+SOLUTION_TWO = 2
+
+# Допустимая относительная величина h^2 / r1^2, при которой окружности считаются касающимися
+TANGENT_TOLERANCE = 1e-10
+
+# Количество измерений, решаемых за один проход (ограничивает память временных массивов)
+SOLVER_CHUNK = 1 << 20
+
+
+def _station_columns(rls):
+    """Параметры РЛС в виде массивов (или скаляров) x, y, A, W."""
+    return (np.asarray(rls.x, dtype=float), np.asarray(rls.y, dtype=float),
+            np.asarray(rls.A, dtype=float), np.asarray(rls.W, dtype=float))
+
+
+def _angle_offset(dx, dy, A):
+    """Отклонение направления (dx, dy) от направления ДНА A, градусы в [-180, 180]."""
+    # Угол в системе координат, повёрнутой на A, - без приведения разности углов по модулю
+    cos_a, sin_a = np.cos(np.deg2rad(A)), np.sin(np.deg2rad(A))
+    return np.rad2deg(np.arctan2(dy * cos_a - dx * sin_a, dx * cos_a + dy * sin_a))
+
+
+def _beam_choice(points, rls1, rls2):
+    """
+    Выбор кандидата по направлениям ДНА
+
+    :param points: Кандидаты, массив формы (N, 2, 2)
+    :return: Кортеж из номеров выбранных кандидатов (N,) и признака неоднозначности (N,):
+             оба кандидата лежат в пределах половины ширины ДНА обеих РЛС
+    """
+    scores = []
+    in_beams = []
+    for index in range(2):
+        x, y = points[:, index, 0], points[:, index, 1]
+        score = 0
+        in_beam = True
+        for rls in (rls1, rls2):
+            station_x, station_y, A, W = _station_columns(rls)
+            offset = _angle_offset(x - station_x, y - station_y, A)
+            score = score - attenuation_factor(W) * offset**2
+            in_beam = in_beam & (np.abs(offset) <= W / 2)
+        scores.append(score)
+        in_beams.append(in_beam)
+    return (scores[1] > scores[0]).astype(int), in_beams[0] & in_beams[1]
+
+
+def _solutions(points, status, rls1, rls2):
+    """Словарь результата решателя с выбором кандидата по ДНА."""
+    choice, ambiguous = _beam_choice(points, rls1, rls2)
+    return {
+        'points': points,
+        'status': status,
+        'best': points[np.arange(len(points)), choice],
+        'ambiguous': ambiguous & (status == SOLUTION_TWO),
+    }
+
+
+def _chunked(solve, rls1, rls2, first, second, chunk, **params):
+    """
+    Решение по частям длины chunk с объединением результатов
+
+    Таблицы РЛС делятся на части вместе с измерениями, РЛС объекты общие для всех частей.
+    """
+    first = np.atleast_1d(np.asarray(first, dtype=float))
+    second = np.atleast_1d(np.asarray(second, dtype=float))
+    count = max(len(first), len(second), *(len(rls) for rls in (rls1, rls2) if isinstance(rls, StationTable)))
+    if count <= chunk:
+        return solve(rls1, rls2, first, second, **params)
+
+    def part(values, start):
+        return values[start:start + chunk] if len(values) > 1 else values
+
+    parts = [solve(*(part(values, start) if isinstance(values, (np.ndarray, StationTable)) else values
+                     for values in (rls1, rls2, first, second)), **params)
+             for start in range(0, count, chunk)]
+    return {key: np.concatenate([result[key] for result in parts]) for key in parts[0]}
+
+
+def _circle_intersections(rls1, rls2, r1, r2, tolerance):
+    """
+    Пересечение окружностей радиусов r1, r2 вокруг двух РЛС
+
+    :return: Кортеж из кандидатов (N, 2, 2) и признаков решения (N,); при отсутствии
+             пересечения кандидаты - точка базы на расстоянии a от первой РЛС (h = 0)
+    """
+    x1, y1, _, _ = _station_columns(rls1)
+    x2, y2, _, _ = _station_columns(rls2)
+    r1, r2, x1, y1, x2, y2 = np.broadcast_arrays(r1, r2, x1, y1, x2, y2)
+
+    dx, dy = x2 - x1, y2 - y1
+    d = np.hypot(dx, dy)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Расстояние от первой РЛС до хорды пересечения вдоль базы и половина хорды
+        a = (r1**2 - r2**2 + d**2) / (2 * d)
+        h2 = r1**2 - a**2
+        ex, ey = dx / d, dy / d
+
+    limit = tolerance * r1**2
+    status = np.where(h2 > limit, SOLUTION_TWO, np.where(h2 >= -limit, SOLUTION_TANGENT, SOLUTION_NONE))
+    # Совпадающие РЛС и некорректные дальности
+    status[~np.isfinite(h2) | (d == 0)] = SOLUTION_NONE
+
+    h = np.sqrt(np.maximum(h2, 0))
+    base_x, base_y = x1 + a * ex, y1 + a * ey
+    points = np.stack([
+        np.column_stack((base_x - h * ey, base_y + h * ex)),
+        np.column_stack((base_x + h * ey, base_y - h * ex)),
+    ], axis=1)
+    return points, status
+
+
+def _solve_range_range(rls1, rls2, ranges1, ranges2, tolerance):
+    points, status = _circle_intersections(rls1, rls2, ranges1, ranges2, tolerance)
+    points[status == SOLUTION_NONE] = np.nan
+    return _solutions(points, status, rls1, rls2)
+
+
+def solve_range_range(rls1, rls2, ranges1, ranges2, tolerance=TANGENT_TOLERANCE, chunk=SOLVER_CHUNK):
+    """
+    Положение цели по дальностям от двух РЛС (пересечение окружностей дальности)
+
+    :param rls1: Первый РЛС объект или таблица РЛС
+    :param rls2: Второй РЛС объект или таблица РЛС
+    :param ranges1: Дальности от первой РЛС, массив формы (N,) или число
+    :param ranges2: Дальности от второй РЛС, массив формы (N,) или число
+    :param tolerance: Допустимая относительная величина h^2 / r1^2 для касания окружностей
+    :param chunk: Количество измерений, решаемых за один проход
+    :return: Словарь с кандидатами ('points', массив (N, 2, 2), NaN при отсутствии решения),
+             признаками решения ('status': SOLUTION_NONE, SOLUTION_TANGENT или SOLUTION_TWO),
+             выбранной по ДНА точкой ('best', массив (N, 2)) и признаком неоднозначности
+             выбора ('ambiguous', оба кандидата в пределах ДНА обеих РЛС)
+    """
+    return _chunked(_solve_range_range, rls1, rls2, ranges1, ranges2, chunk, tolerance=tolerance)
+
+
+def _solve_sum_difference(rls1, rls2, sums, differences, tolerance):
+    # Дальности от РЛС: d1 + d2 = S, d2 - d1 = D
+    points, status = _circle_intersections(rls1, rls2, (sums - differences) / 2, (sums + differences) / 2, tolerance)
+    result = _solutions(points, status, rls1, rls2)
+
+    # Невязка измерений в выбранной точке
+    x, y = result['best'][:, 0], result['best'][:, 1]
+    x1, y1, _, _ = _station_columns(rls1)
+    x2, y2, _, _ = _station_columns(rls2)
+    d1, d2 = np.hypot(x - x1, y - y1), np.hypot(x - x2, y - y2)
+    result['residual'] = np.hypot(d1 + d2 - sums, d2 - d1 - differences)
+    return result
+
+
+def solve_sum_difference(rls1, rls2, sums, differences, tolerance=TANGENT_TOLERANCE, chunk=SOLVER_CHUNK):
+    """
+    Положение цели по сумме (эллипс) и разности (гипербола) расстояний до двух РЛС
+
+    Сумма S = d1 + d2 и разность D = d2 - d1 однозначно задают дальности d1 = (S - D) / 2
+    и d2 = (S + D) / 2, поэтому пересечение эллипса и гиперболы находится в замкнутой
+    форме как пересечение окружностей. Если измерения несовместны (S меньше базы или
+    |D| больше базы), точкой решения считается точка на линии базы, а несовместность
+    видна по невязке.
+
+    :param rls1: Первый РЛС объект или таблица РЛС
+    :param rls2: Второй РЛС объект или таблица РЛС
+    :param sums: Суммы расстояний d1 + d2, массив формы (N,) или число
+    :param differences: Разности расстояний d2 - d1, массив формы (N,) или число
+    :param tolerance: Допустимая относительная величина h^2 / d1^2 для касания
+    :param chunk: Количество измерений, решаемых за один проход
+    :return: Словарь как у solve_range_range (кандидаты без NaN) и невязка выбранной точки
+             ('residual', массив (N,): sqrt(dS^2 + dD^2))
+    """
+    return _chunked(_solve_sum_difference, rls1, rls2, sums, differences, chunk, tolerance=tolerance)
@@ -1,12 +1,37 @@
+import json
+import os
 import sys
+import time
+
+# Момент запуска, от которого отсчитываются этапы (RLS_STARTUP_TIMING)
+START_TIME = time.perf_counter()
+
 from PyQt5.QtWidgets import QApplication
 from ui.main_window import MainWindow
 
+# Переменная окружения: вывести длительность этапов запуска после первого кадра и завершить работу
+STARTUP_TIMING_ENV = 'RLS_STARTUP_TIMING'
+
+
 def main():
+    imported = time.perf_counter()
     app = QApplication(sys.argv)
     window = MainWindow()
+    created = time.perf_counter()
     window.show()
+
+    if os.environ.get(STARTUP_TIMING_ENV):
+        # Обработка событий показа окна, включая первую отрисовку
+        app.processEvents()
+        shown = time.perf_counter()
+        print(json.dumps({
+            'imports_ms': (imported - START_TIME) * 1000,
+            'window_ms': (created - imported) * 1000,
+            'first_frame_ms': (shown - START_TIME) * 1000,
+        }))
+        return
+
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,26 @@
+from models.rls import RLS
+
+# Начальные конфигурации РЛС для вариантов 1-3: параметры (x, y, R, A, W) первой и второй РЛС
+RLS_PRESETS = {
+    0: ((0, -200, 300, 135, 20), (500, -200, 550, 45, 20)),
+    1: ((0, -200, 300, 45, 20), (500, -200, 550, 135, 20)),
+    2: ((0, -200, 450, 45, 20), (500, -200, 550, 135, 20)),
+}
+
+# Начальные параметры зон и погрешностей по номеру варианта
+VARIANT_DEFAULTS = {
+    1: {'R1': 300, 'R2': 550, 'E_ellipse': 10, 'E_hyperbola': 15},
+    2: {},
+    3: {'radius_rls1': 200, 'error_rls1': 10, 'radius_rls2': 350, 'error_rls2': 15},
+}
+
+
+def preset_rls(option):
+    """
+    Создание пары РЛС по номеру начальной конфигурации
+
+    :param option: Номер конфигурации (0, 1 или 2 - для вариантов 1, 2 и 3)
+    :return: Кортеж из двух РЛС объектов
+    """
+    params1, params2 = RLS_PRESETS[option]
+    return RLS(*params1), RLS(*params2)
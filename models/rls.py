@@ -1,16 +1,160 @@
+import numpy as np
+
+# Столбцы таблицы РЛС
+RLS_COLUMNS = ('x', 'y', 'R', 'A', 'W')
+
+
+class _Column:
+    """Столбец таблицы РЛС: представление массива (изменения видны в таблице)."""
+
+    def __init__(self, index):
+        self.index = index
+
+    def __get__(self, table, owner):
+        if table is None:
+            return self
+        return table.data[:, self.index]
+
+    def __set__(self, table, value):
+        table.data[:, self.index] = value
+
+
+class _Field:
+    """Параметр РЛС, хранящийся в строке таблицы."""
+
+    def __init__(self, index):
+        self.index = index
+
+    def __get__(self, rls, owner):
+        if rls is None:
+            return self
+        return float(rls._data[rls._row, self.index])
+
+    def __set__(self, rls, value):
+        rls._data[rls._row, self.index] = value
+
+
 class RLS:
+    """
+    Радиолокационная станция (РЛС)
+
+    Параметры хранятся в строке массива: у отдельной РЛС - в собственном массиве,
+    у РЛС, полученной из StationTable, - в строке таблицы (изменения видны в таблице).
+    """
+
+    __slots__ = ('_data', '_row')
+
+    x = _Field(0)
+    y = _Field(1)
+    R = _Field(2)
+    A = _Field(3)
+    W = _Field(4)
+
     def __init__(self, x=0, y=0, R=300, A=135, W=10):
         """
         Инициализация радиолокационной станции (РЛС)
-        
+
         :param x: x-координата станции
         :param y: y-координата станции
         :param R: Дальность станции
         :param A: Угол диаграммы направленности антенны
         :param W: Ширина диаграммы направленности антенны
         """
-        self.x = x
-        self.y = y
-        self.R = R
-        self.A = A
-        self.W = W
\ No newline at end of file
+        self._data = np.array([[x, y, R, A, W]], dtype=float)
+        self._row = 0
+
+    @classmethod
+    def view(cls, data, row):
+        """
+        РЛС - представление строки массива параметров
+
+        :param data: Массив параметров формы (N, 5)
+        :param row: Номер строки
+        :return: РЛС объект
+        """
+        rls = cls.__new__(cls)
+        rls._data = data
+        rls._row = row
+        return rls
+
+    def values(self):
+        """
+        Параметры РЛС
+
+        :return: Кортеж (x, y, R, A, W)
+        """
+        return tuple(float(value) for value in self._data[self._row])
+
+    def __copy__(self):
+        # Копия не связана с таблицей исходной РЛС
+        return RLS(*self.values())
+
+    def __deepcopy__(self, memo):
+        return RLS(*self.values())
+
+    def __reduce__(self):
+        return RLS, self.values()
+
+    def __repr__(self):
+        return 'RLS(x={}, y={}, R={}, A={}, W={})'.format(*self.values())
+
+
+class StationTable:
+    """
+    Таблица РЛС: параметры (x, y, R, A, W) в одном массиве формы (N, 5)
+
+    Столбцы и срезы таблицы - представления массива без копирования; строка
+    таблицы - РЛС объект, изменения которого видны в таблице. Таблицу можно
+    передавать пакетным функциям вместо массива параметров (np.asarray(table))
+    или координат (table.xy).
+    """
+
+    __slots__ = ('data',)
+
+    x = _Column(0)
+    y = _Column(1)
+    R = _Column(2)
+    A = _Column(3)
+    W = _Column(4)
+
+    def __init__(self, data=()):
+        """
+        :param data: Массив параметров формы (N, 5) (используется без копирования, если это float массив)
+        """
+        self.data = np.asarray(data, dtype=float).reshape(-1, len(RLS_COLUMNS))
+
+    @classmethod
+    def from_stations(cls, stations):
+        """
+        Таблица из РЛС объектов
+
+        :param stations: Объекты с атрибутами x, y, R, A, W
+        :return: Таблица РЛС
+        """
+        return cls([[getattr(rls, name) for name in RLS_COLUMNS] for rls in stations])
+
+    @property
+    def xy(self):
+        """Координаты РЛС, массив формы (N, 2)."""
+        return self.data[:, :2]
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return RLS.view(self.data, range(len(self.data))[index])
+        return StationTable(self.data[index])
+
+    def __iter__(self):
+        return (RLS.view(self.data, row) for row in range(len(self.data)))
+
+    def __array__(self, dtype=None, copy=None):
+        return self.data if dtype is None else self.data.astype(dtype)
+
+    def copy(self):
+        """Копия таблицы с собственным массивом."""
+        return StationTable(self.data.copy())
+
+    def __repr__(self):
+        return f'StationTable({len(self)} РЛС)'
@@ -0,0 +1,316 @@
+"""
+Подбор параметров РЛС, максимизирующих или минимизирующих площадь пересечения (без Qt)
+
+Поиск выполняется дифференциальной эволюцией (scipy.optimize.differential_evolution)
+в границах ползунков интерфейса. Каждое поколение считается одним пакетом:
+движком analytic - сразу для всего пакета без полигонов (варианты 1 и 3),
+движком polygon - частями в пуле процессов. Параметры округляются до точности
+полей ввода (OPTIMIZER_DECIMALS, PARAM_DECIMALS), и уже рассчитанные конфигурации берутся из кэша.
+
+Имена параметров - как в sweep.py (rls1.x, ..., rls2.W, R1, ..., error_rls2);
+остальные параметры берутся из начальной конфигурации варианта.
+
+Пример:
+    python optimizer.py --variant 1 --param rls1.A --param rls2.A --param rls1.W --param rls2.W --engine analytic
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from engine.analytic import AREA_ENGINES, QUADRATURE_TOLERANCE
+from sweep import ANALYTIC_VARIANTS, AREA_COUNTS, base_parameters, evaluate, evaluate_analytic
+
+# Границы параметров (как у полей ввода интерфейса)
+PARAM_BOUNDS = {
+    'x': (-1000, 1000),
+    'y': (-1000, 1000),
+    'R': (0, 10000),
+    'A': (-180, 180),
+    'W': (1, 45),
+    'R1': (1, 1000),
+    'R2': (1, 1000),
+    'E_ellipse': (1, 1000),
+    'E_hyperbola': (1, 110),
+    'radius_rls1': (0, 1000),
+    'error_rls1': (0, 500),
+    'radius_rls2': (0, 1000),
+    'error_rls2': (0, 500),
+}
+
+# Количество знаков после запятой параметров (точность полей ввода)
+OPTIMIZER_DECIMALS = 2
+PARAM_DECIMALS = {'A': 0, 'W': 0}
+
+# Количество конфигураций в одной задаче пула (движок polygon)
+OPTIMIZER_CHUNK = 16
+
+# Количество поколений без улучшения площади, после которого поиск останавливается
+OPTIMIZER_PATIENCE = 10
+
+
+def param_bounds(name):
+    """
+    Границы параметра
+
+    :param name: Имя параметра (rls1.x, ..., R1, ...)
+    :return: Кортеж (нижняя граница, верхняя граница)
+    """
+    return PARAM_BOUNDS[name.split('.')[-1]]
+
+
+def round_params(names, rows):
+    """
+    Округление параметров до точности полей ввода
+
+    :param names: Имена параметров
+    :param rows: Значения параметров, массив формы (..., len(names))
+    :return: Массив округлённых значений
+    """
+    scale = 10.0 ** np.array([PARAM_DECIMALS.get(name.split('.')[-1], OPTIMIZER_DECIMALS) for name in names])
+    return np.round(np.asarray(rows, dtype=float) * scale) / scale
+
+
+def evaluate_rows(variant, engine, tolerance, base, names, rows):
+    """
+    Площади для набора конфигураций (выполняется в процессе пула или в текущем процессе)
+
+    :param variant: Номер варианта
+    :param engine: Движок расчёта ('polygon' или 'analytic')
+    :param tolerance: Допустимая относительная погрешность площадей (только 'analytic')
+    :param base: Значения всех параметров варианта
+    :param names: Имена подбираемых параметров
+    :param rows: Значения подбираемых параметров, массив формы (M, len(names))
+    :return: Массив площадей формы (M, количество площадей); NaN, если расчёт не удался
+    """
+    rows = np.asarray(rows, dtype=float)
+    if engine == 'analytic':
+        columns = {name: rows[:, i] for i, name in enumerate(names)}
+        areas, _errors = evaluate_analytic(variant, columns, base, len(rows), tolerance)
+        return np.asarray(areas, dtype=float)
+
+    areas = []
+    params = dict(base)
+    for row in rows:
+        params.update(zip(names, row.tolist()))
+        try:
+            areas.append(evaluate(variant, params))
+        except Exception as e:
+            print(f"Конфигурация {row.tolist()}: {e}", file=sys.stderr)
+            areas.append(None)
+    count = max((len(area) for area in areas if area is not None), default=1)
+    return np.array([area if area is not None else [np.nan] * count for area in areas], dtype=float)
+
+
+def _evaluate_rows(task):
+    return evaluate_rows(*task)
+
+
+class CachedObjective:
+    """
+    Пакетная целевая функция с кэшем рассчитанных конфигураций
+
+    Вызывается differential_evolution с vectorized=True: аргумент - массив формы
+    (количество параметров, размер пакета), результат - массив формы (размер пакета,).
+    """
+
+    def __init__(self, variant, names, base, area=0, maximize=True, engine='polygon',
+                 tolerance=QUADRATURE_TOLERANCE, pool=None):
+        """
+        :param variant: Номер варианта
+        :param names: Имена подбираемых параметров
+        :param base: Значения всех параметров варианта
+        :param area: Номер площади (в порядке compute_variant)
+        :param maximize: Максимизировать площадь (иначе минимизировать)
+        :param engine: Движок расчёта ('polygon' или 'analytic')
+        :param tolerance: Допустимая относительная погрешность площадей (только 'analytic')
+        :param pool: Пул процессов для движка polygon (None - расчёт в текущем процессе)
+        """
+        self.variant = variant
+        self.names = list(names)
+        self.base = dict(base)
+        self.area = area
+        self.maximize = maximize
+        self.engine = engine
+        self.tolerance = tolerance
+        self.pool = pool
+        self.cache = {}
+        self.hits = 0
+        self.evaluations = 0
+        self.error = None
+
+    def areas(self, rows):
+        """
+        Площади конфигураций с учётом кэша
+
+        :param rows: Значения подбираемых параметров, массив формы (M, количество параметров)
+        :return: Массив выбранной площади формы (M,)
+        """
+        rows = round_params(self.names, rows)
+        keys = [tuple(row.tolist()) for row in rows]
+        missing = list(dict.fromkeys(key for key in keys if key not in self.cache))
+        self.hits += len(keys) - len(missing)
+        self.evaluations += len(missing)
+
+        if missing:
+            task = (self.variant, self.engine, self.tolerance, self.base, self.names)
+            if self.pool is None or self.engine == 'analytic':
+                blocks = [evaluate_rows(*task, missing)]
+            else:
+                chunks = [missing[i:i + OPTIMIZER_CHUNK] for i in range(0, len(missing), OPTIMIZER_CHUNK)]
+                blocks = self.pool.map(_evaluate_rows, [(*task, chunk) for chunk in chunks])
+            values = np.concatenate([block[:, self.area] for block in blocks])
+            self.cache.update(zip(missing, values.tolist()))
+        return np.array([self.cache[key] for key in keys])
+
+    def __call__(self, population):
+        try:
+            areas = self.areas(np.asarray(population).T)
+        except Exception as e:
+            # differential_evolution заменяет TypeError и ValueError целевой функции своим RuntimeError
+            self.error = e
+            raise
+        # Неудачный расчёт - худшее значение
+        cost = -areas if self.maximize else areas
+        return np.where(np.isnan(cost), np.inf, cost)
+
+
+def optimize(variant, names, area=0, maximize=True, engine='polygon', tolerance=QUADRATURE_TOLERANCE,
+             base=None, bounds=None, workers=1, maxiter=50, popsize=15, seed=0, patience=OPTIMIZER_PATIENCE,
+             progress=None):
+    """
+    Подбор параметров дифференциальной эволюцией
+
+    :param variant: Номер варианта
+    :param names: Имена подбираемых параметров
+    :param area: Номер площади (в порядке compute_variant)
+    :param maximize: Максимизировать площадь (иначе минимизировать)
+    :param engine: Движок расчёта ('polygon' или 'analytic')
+    :param tolerance: Допустимая относительная погрешность площадей (только 'analytic')
+    :param base: Значения всех параметров варианта (по умолчанию - начальная конфигурация)
+    :param bounds: Словарь {имя: (нижняя, верхняя граница)} (по умолчанию - PARAM_BOUNDS)
+    :param workers: Количество процессов для движка polygon (1 - без пула, None - по числу ядер)
+    :param maxiter: Максимальное количество поколений
+    :param popsize: Множитель размера популяции (популяция - popsize * количество параметров)
+    :param seed: Начальное значение генератора
+    :param patience: Количество поколений без улучшения, после которого поиск останавливается
+                     (при максимизации - после появления ненулевой площади)
+    :param progress: Функция (поколение, параметры, площадь), вызываемая после каждого поколения;
+                     возврат True останавливает поиск
+    :return: Словарь с найденными параметрами ('params' - все параметры варианта), площадью ('area'),
+             количеством поколений ('iterations'), расчётов ('evaluations') и попаданий в кэш ('cache_hits')
+    """
+    if base is None:
+        base = base_parameters(variant)
+    unknown = [name for name in names if name not in base]
+    if unknown:
+        raise ValueError(f"Неизвестные параметры варианта {variant}: {', '.join(unknown)}")
+    if engine == 'analytic' and variant not in ANALYTIC_VARIANTS:
+        raise ValueError(f"Движок analytic недоступен для варианта {variant}")
+    if not 0 <= area < AREA_COUNTS[variant]:
+        raise ValueError(f"Вариант {variant} не содержит площади {area + 1}")
+    bounds = [(bounds or {}).get(name, param_bounds(name)) for name in names]
+
+    # scipy загружается только при запуске поиска: импорт scipy.optimize занимает сотни миллисекунд
+    from scipy.optimize import differential_evolution
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 and engine == 'polygon' else None
+    objective = CachedObjective(variant, names, base, area, maximize, engine, tolerance, pool)
+    iterations = 0
+    best = np.inf
+    stalled = 0
+
+    def callback(intermediate_result):
+        nonlocal iterations, best, stalled
+        iterations += 1
+        cost = float(intermediate_result.fun)
+        if not np.isfinite(best) or cost < best - 1e-6 * max(abs(best), 1):
+            best, stalled = cost, 0
+        elif best != 0 or not maximize:
+            stalled += 1
+
+        stop = stalled >= patience
+        if progress is not None:
+            params = dict(zip(names, round_params(names, intermediate_result.x).tolist()))
+            stop |= bool(progress(iterations, params, abs(cost)))
+        return stop
+
+    try:
+        # Исходная конфигурация входит в начальную популяцию: при случайных параметрах области
+        # обычно не пересекаются, и без неё все площади поколения могут оказаться нулевыми
+        x0 = [min(max(base[name], low), high) for name, (low, high) in zip(names, bounds)]
+        # Собственный критерий остановки scipy (малый разброс значений популяции) отключён:
+        # он срабатывает, когда все площади поколения нулевые; остановка - по patience
+        result = differential_evolution(objective, bounds, x0=x0, maxiter=maxiter, popsize=popsize, seed=seed,
+                                        tol=0, atol=-1, vectorized=True, updating='deferred', polish=False,
+                                        callback=callback)
+    except RuntimeError:
+        if objective.error is not None:
+            raise objective.error from None
+        raise
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    params = dict(base)
+    params.update(zip(names, round_params(names, result.x).tolist()))
+    return {
+        'params': params,
+        'area': abs(float(result.fun)),
+        'iterations': iterations,
+        'evaluations': objective.evaluations,
+        'cache_hits': objective.hits,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--variant', type=int, choices=(1, 2, 3), required=True, help="Номер варианта")
+    parser.add_argument('--param', action='append', default=[], metavar='ИМЯ[=НИЖНЯЯ:ВЕРХНЯЯ]',
+                        help="Подбираемый параметр и, при необходимости, его границы")
+    parser.add_argument('--area', type=int, default=1, help="Номер площади (1 или 2)")
+    parser.add_argument('--minimize', action='store_true', help="Минимизировать площадь (по умолчанию - максимизировать)")
+    parser.add_argument('--engine', choices=AREA_ENGINES, default='polygon', help="Движок расчёта площадей")
+    parser.add_argument('--tolerance', type=float, default=QUADRATURE_TOLERANCE,
+                        help="Допустимая относительная погрешность площадей движка analytic (вариант 1)")
+    parser.add_argument('--workers', type=int, default=None, help="Количество процессов (движок polygon)")
+    parser.add_argument('--maxiter', type=int, default=50, help="Максимальное количество поколений")
+    parser.add_argument('--popsize', type=int, default=15, help="Множитель размера популяции")
+    parser.add_argument('--seed', type=int, default=0, help="Начальное значение генератора")
+    args = parser.parse_args(argv)
+
+    names = []
+    bounds = {}
+    for item in args.param:
+        name, _, spec = item.partition('=')
+        names.append(name)
+        if spec:
+            low, high = spec.split(':')
+            bounds[name] = (float(low), float(high))
+    if not names:
+        parser.error("не задан ни один параметр --param")
+
+    start = time.perf_counter()
+
+    def progress(iteration, params, area):
+        print(f"\rПоколение {iteration}: площадь {area:.2f} м², {time.perf_counter() - start:.1f} с", end='', flush=True)
+
+    try:
+        result = optimize(args.variant, names, args.area - 1, not args.minimize, args.engine, args.tolerance,
+                          bounds=bounds, workers=args.workers, maxiter=args.maxiter, popsize=args.popsize,
+                          seed=args.seed, progress=progress)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print()
+    print(f"Площадь {args.area}: {result['area']:.2f} м² (расчётов: {result['evaluations']}, "
+          f"из кэша: {result['cache_hits']})")
+    for name in names:
+        print(f"{name} = {result['params'][name]}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
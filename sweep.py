@@ -0,0 +1,403 @@
+"""
+Перебор параметров РЛС и погрешностей с расчётом площадей пересечения (без Qt)
+
+Сетка задаётся параметрами --param ИМЯ=ЗНАЧЕНИЯ, где ИМЯ - параметр РЛС
+(rls1.x, rls1.y, rls1.R, rls1.A, rls1.W, то же для rls2) или параметр
+варианта (R1, R2, E_ellipse, E_hyperbola, radius_rls1, error_rls1,
+radius_rls2, error_rls2), а ЗНАЧЕНИЯ - список через запятую или диапазон
+start:stop:num (как в np.linspace). Остальные параметры берутся из начальной
+конфигурации варианта.
+
+Сетка делится на блоки, которые считаются в пуле процессов; каждый
+готовый блок сразу записывается в отдельный файл chunk_NNNNNN.npz со
+столбцами индекса конфигурации, перебираемых параметров и площадей.
+Повторный запуск с тем же каталогом пропускает уже записанные блоки.
+
+Движок --engine analytic считает площади без построения полигонов сразу
+для всего блока (engine/analytic.py); доступен для вариантов 1 и 3. Для
+варианта 1 точность задаётся --tolerance, а в блоки дополнительно
+записываются оценки погрешности площадей (error1, error2).
+
+Результаты конфигураций сначала ищутся в постоянном кэше результатов
+(engine/result_cache.py) и заносятся в него после расчёта; --no-cache
+отключает кэш.
+
+Пример:
+    python sweep.py --variant 1 --out sweep_v1 --param rls1.A=0:180:181 --param E_hyperbola=5,10,15,20
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from models.presets import VARIANT_DEFAULTS, preset_rls
+from engine.analytic import AREA_ENGINES, QUADRATURE_TOLERANCE, variant1_area_batch, variant3_area_batch
+from engine.geometry import compute_variant
+from engine.result_cache import default_result_cache, result_key
+from models.rls import RLS, StationTable
+
+RLS_PARAMS = ('x', 'y', 'R', 'A', 'W')
+
+# Количество площадей в результате каждого варианта
+AREA_COUNTS = {1: 2, 2: 1, 3: 1}
+
+
+def _variant1_analytic(stations1, stations2, tolerance, **params):
+    return variant1_area_batch(stations1, stations2, tolerance=tolerance, **params)
+
+
+def _variant3_analytic(stations1, stations2, tolerance, **params):
+    return variant3_area_batch(stations1, stations2, **params)[:, None], None
+
+
+# Векторизованный расчёт площадей без полигонов по номеру варианта:
+# функция возвращает площади и оценки погрешности (None, если оценки нет)
+ANALYTIC_VARIANTS = {1: _variant1_analytic, 3: _variant3_analytic}
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def parse_values(spec):
+    """
+    Разбор значений параметра
+
+    :param spec: Строка 'start:stop:num' или список значений через запятую
+    :return: Список значений
+    """
+    if ':' in spec:
+        start, stop, num = spec.split(':')
+        return np.linspace(float(start), float(stop), int(num)).tolist()
+    return [float(value) for value in spec.split(',')]
+
+
+def base_parameters(variant):
+    """
+    Начальные значения всех параметров варианта
+
+    :param variant: Номер варианта
+    :return: Словарь {имя параметра: значение}
+    """
+    rls1, rls2 = preset_rls(variant - 1)
+    params = {}
+    for prefix, rls in (('rls1', rls1), ('rls2', rls2)):
+        for name in RLS_PARAMS:
+            params[f'{prefix}.{name}'] = float(getattr(rls, name))
+    params.update({name: float(value) for name, value in VARIANT_DEFAULTS[variant].items()})
+    return params
+
+
+def _configuration(variant, params):
+    """РЛС объекты и параметры зон одной конфигурации."""
+    rls1, rls2 = (RLS(*(params[f'{prefix}.{name}'] for name in RLS_PARAMS)) for prefix in ('rls1', 'rls2'))
+    return rls1, rls2, {name: params[name] for name in VARIANT_DEFAULTS[variant]}
+
+
+def evaluate(variant, params):
+    """
+    Расчёт площадей для одной конфигурации
+
+    :param variant: Номер варианта
+    :param params: Словарь всех параметров варианта
+    :return: Список площадей
+    """
+    rls1, rls2, variant_params = _configuration(variant, params)
+    return compute_variant(variant, rls1, rls2, **variant_params)['areas']
+
+
+def evaluate_polygon(variant, configurations, cache=None, labels=None):
+    """
+    Расчёт площадей списка конфигураций полигональным движком
+
+    При заданном кэше конфигурации ищутся в нём одним запросом, а рассчитанные
+    заносятся одной транзакцией (только площади: полигоны и линии при переборе не нужны).
+
+    :param variant: Номер варианта
+    :param configurations: Список словарей всех параметров варианта
+    :param cache: Постоянный кэш результатов (ResultCache) или None
+    :param labels: Номера конфигураций для сообщений об ошибках (по умолчанию - позиции в списке)
+    :return: Массив площадей формы (количество конфигураций, количество площадей)
+    :raises RuntimeError: Если расчёт конфигурации завершился ошибкой
+    """
+    labels = range(len(configurations)) if labels is None else labels
+    results = [None] * len(configurations)
+    keys = None
+    if cache is not None:
+        keys = [result_key(variant, rls1, rls2, **variant_params)
+                for rls1, rls2, variant_params in (_configuration(variant, params) for params in configurations)]
+        results = [None if result is None else result['areas'] for result in cache.get_many(keys, curves=False)]
+
+    computed = []
+    for row, params in enumerate(configurations):
+        if results[row] is not None:
+            continue
+        try:
+            results[row] = evaluate(variant, params)
+        except Exception as e:
+            raise RuntimeError(f"Конфигурация {labels[row]}: {e}") from e
+        computed.append(row)
+
+    if keys is not None and computed:
+        cache.put_many([(keys[row], {'areas': results[row]}) for row in computed], curves=False)
+    return np.array(results, dtype=float).reshape(len(configurations), AREA_COUNTS[variant])
+
+
+def evaluate_analytic(variant, columns, base, count, tolerance=QUADRATURE_TOLERANCE, cache=None):
+    """
+    Расчёт площадей блока конфигураций без построения полигонов
+
+    При заданном кэше считаются только конфигурации, которых в нём нет.
+
+    :param variant: Номер варианта
+    :param columns: Столбцы перебираемых параметров блока
+    :param base: Значения остальных параметров
+    :param count: Количество конфигураций в блоке
+    :param tolerance: Допустимая относительная погрешность площадей
+    :param cache: Постоянный кэш результатов (ResultCache) или None
+    :return: Кортеж из массивов площадей и оценок погрешности формы (count, количество площадей)
+             (оценки - None, если движок их не даёт)
+    """
+    params = {name: np.broadcast_to(columns.get(name, value), (count,)) for name, value in base.items()}
+    stations1 = np.column_stack([params[f'rls1.{name}'] for name in RLS_PARAMS])
+    stations2 = np.column_stack([params[f'rls2.{name}'] for name in RLS_PARAMS])
+    variant_params = {name: params[name] for name in VARIANT_DEFAULTS[variant]}
+    if cache is None:
+        return ANALYTIC_VARIANTS[variant](stations1, stations2, tolerance, **variant_params)
+
+    table1, table2 = StationTable(stations1), StationTable(stations2)
+    keys = [result_key(variant, table1[row], table2[row], engine=['analytic', tolerance],
+                       **{name: values[row] for name, values in variant_params.items()})
+            for row in range(count)]
+    results = cache.get_many(keys, curves=False)
+
+    missing = np.array([row for row, result in enumerate(results) if result is None], dtype=np.int64)
+    if len(missing):
+        areas, errors = ANALYTIC_VARIANTS[variant](
+            stations1[missing], stations2[missing], tolerance,
+            **{name: values[missing] for name, values in variant_params.items()})
+        computed = []
+        for i, row in enumerate(missing):
+            result = {'areas': areas[i].tolist()}
+            if errors is not None:
+                result['errors'] = errors[i].tolist()
+            results[row] = result
+            computed.append((keys[row], result))
+        cache.put_many(computed, curves=False)
+
+    areas = np.array([result['areas'] for result in results], dtype=float).reshape(count, AREA_COUNTS[variant])
+    if not any('errors' in result for result in results):
+        return areas, None
+    errors = np.array([result.get('errors', [np.nan] * AREA_COUNTS[variant]) for result in results], dtype=float)
+    return areas, errors.reshape(count, AREA_COUNTS[variant])
+
+
+def run_chunk(manifest, chunk, use_cache=True):
+    """
+    Расчёт одного блока сетки (выполняется в процессе пула)
+
+    Соседние конфигурации отличаются последним параметром сетки, поэтому
+    запомненные этапы движка в процессе переиспользуются между ними.
+
+    :param manifest: Описание перебора
+    :param chunk: Номер блока
+    :param use_cache: Использовать постоянный кэш результатов
+    :return: Словарь столбцов блока
+    """
+    variant = manifest['variant']
+    cache = default_result_cache() if use_cache else None
+    names = list(manifest['grid'])
+    axes = [np.asarray(manifest['grid'][name]) for name in names]
+    shape = tuple(len(axis) for axis in axes)
+
+    start = chunk * manifest['chunk_size']
+    stop = min(start + manifest['chunk_size'], manifest['total'])
+    index = np.arange(start, stop, dtype=np.int64)
+    positions = np.unravel_index(index, shape)
+
+    columns = {'index': index}
+    for name, axis, position in zip(names, axes, positions):
+        columns[name] = axis[position]
+
+    errors = None
+    if manifest['engine'] == 'analytic':
+        areas, errors = evaluate_analytic(variant, columns, manifest['base'], len(index), manifest['tolerance'],
+                                           cache)
+    else:
+        configurations = []
+        for row in range(len(index)):
+            params = dict(manifest['base'])
+            params.update((name, float(columns[name][row])) for name in names)
+            configurations.append(params)
+        # Ошибка в конфигурации прерывает блок: он не записывается и будет рассчитан при повторном запуске
+        areas = evaluate_polygon(variant, configurations, cache, index)
+    for i in range(areas.shape[1]):
+        columns[f'area{i + 1}'] = areas[:, i]
+        if errors is not None:
+            columns[f'error{i + 1}'] = errors[:, i]
+    return columns
+
+
+def _chunk_path(out_dir, chunk):
+    return os.path.join(out_dir, f'chunk_{chunk:06d}.npz')
+
+
+def _write_chunk(out_dir, chunk, columns):
+    """Атомарная запись блока: незавершённый файл не будет принят за готовый."""
+    path = _chunk_path(out_dir, chunk)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez_compressed(f, **columns)
+    os.replace(tmp_path, path)
+
+
+def prepare(out_dir, variant, grid, chunk_size, engine='polygon', tolerance=QUADRATURE_TOLERANCE):
+    """
+    Создание или проверка описания перебора в каталоге результатов
+
+    :param out_dir: Каталог результатов
+    :param variant: Номер варианта
+    :param grid: Словарь {имя параметра: список значений}
+    :param chunk_size: Количество конфигураций в блоке
+    :param engine: Движок расчёта ('polygon' или 'analytic')
+    :param tolerance: Допустимая относительная погрешность площадей (только 'analytic')
+    :return: Описание перебора
+    """
+    base = base_parameters(variant)
+    unknown = [name for name in grid if name not in base]
+    if unknown:
+        raise ValueError(f"Неизвестные параметры варианта {variant}: {', '.join(unknown)}")
+    if engine == 'analytic' and variant not in ANALYTIC_VARIANTS:
+        raise ValueError(f"Движок analytic недоступен для варианта {variant}")
+
+    manifest = {
+        'variant': variant,
+        'engine': engine,
+        'tolerance': tolerance,
+        'grid': grid,
+        'base': base,
+        'chunk_size': chunk_size,
+        'total': int(np.prod([len(values) for values in grid.values()])),
+    }
+
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            existing = json.load(f)
+        if existing != manifest:
+            raise ValueError(f"Каталог {out_dir} содержит результаты другого перебора")
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=4)
+    return manifest
+
+
+def sweep(out_dir, variant, grid, chunk_size=1000, workers=None, engine='polygon', tolerance=QUADRATURE_TOLERANCE,
+          use_cache=True):
+    """
+    Перебор сетки параметров в пуле процессов с потоковой записью блоков
+
+    :param out_dir: Каталог результатов
+    :param variant: Номер варианта
+    :param grid: Словарь {имя параметра: список значений}
+    :param chunk_size: Количество конфигураций в блоке
+    :param workers: Количество процессов (None - по числу ядер)
+    :param engine: Движок расчёта ('polygon' или 'analytic')
+    :param tolerance: Допустимая относительная погрешность площадей (только 'analytic')
+    :param use_cache: Использовать постоянный кэш результатов
+    :return: Количество рассчитанных в этом запуске блоков
+    :raises RuntimeError: Если расчёт хотя бы одного блока завершился ошибкой (остальные блоки записываются)
+    """
+    manifest = prepare(out_dir, variant, grid, chunk_size, engine, tolerance)
+    chunks = -(-manifest['total'] // chunk_size)
+    pending = [chunk for chunk in range(chunks) if not os.path.exists(_chunk_path(out_dir, chunk))]
+    print(f"Конфигураций: {manifest['total']}, блоков: {chunks}, осталось: {len(pending)}")
+
+    start = time.perf_counter()
+    done = 0
+    rows = 0
+    failed = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_chunk, manifest, chunk, use_cache): chunk for chunk in pending}
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                columns = future.result()
+            except Exception as e:
+                print(f"\nБлок {chunk}: {e}", file=sys.stderr)
+                failed[chunk] = e
+                continue
+            _write_chunk(out_dir, chunk, columns)
+            done += 1
+            rows += len(columns['index'])
+            rate = rows / (time.perf_counter() - start)
+            print(f"\rБлоков {done}/{len(pending)}, ~{rate:.0f} конф./с", end='', flush=True)
+    if pending:
+        print()
+    if failed:
+        chunks = ', '.join(str(chunk) for chunk in sorted(failed))
+        raise RuntimeError(f"Не рассчитаны блоки: {chunks}") from failed[min(failed)]
+    return done
+
+
+def load_sweep(out_dir):
+    """
+    Загрузка результатов перебора
+
+    :param out_dir: Каталог результатов
+    :return: Словарь столбцов, упорядоченных по индексу конфигурации
+    """
+    parts = []
+    for path in sorted(glob.glob(os.path.join(out_dir, 'chunk_*.npz'))):
+        with np.load(path) as data:
+            parts.append({name: data[name] for name in data.files})
+    if not parts:
+        return {}
+    columns = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+    order = np.argsort(columns['index'], kind='stable')
+    return {name: values[order] for name, values in columns.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--variant', type=int, choices=(1, 2, 3), required=True, help="Номер варианта")
+    parser.add_argument('--out', required=True, help="Каталог результатов")
+    parser.add_argument('--param', action='append', default=[], metavar='ИМЯ=ЗНАЧЕНИЯ',
+                        help="Перебираемый параметр; порядок задаёт вложенность (последний меняется быстрее)")
+    parser.add_argument('--chunk-size', type=int, default=1000, help="Количество конфигураций в блоке")
+    parser.add_argument('--workers', type=int, default=None, help="Количество процессов")
+    parser.add_argument('--engine', choices=AREA_ENGINES, default='polygon', help="Движок расчёта площадей")
+    parser.add_argument('--tolerance', type=float, default=QUADRATURE_TOLERANCE,
+                        help="Допустимая относительная погрешность площадей движка analytic (вариант 1)")
+    parser.add_argument('--no-cache', action='store_true', help="Не использовать постоянный кэш результатов")
+    args = parser.parse_args(argv)
+
+    grid = {}
+    for item in args.param:
+        name, _, spec = item.partition('=')
+        try:
+            grid[name] = parse_values(spec)
+        except ValueError:
+            parser.error(f"неверные значения параметра: {item}")
+    if not grid:
+        parser.error("не задан ни один параметр --param")
+
+    # Ошибки описания перебора (неизвестные параметры, движок, каталог другого перебора);
+    # ошибки расчёта не перехватываются
+    try:
+        prepare(args.out, args.variant, grid, args.chunk_size, args.engine, args.tolerance)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    sweep(args.out, args.variant, grid, args.chunk_size, args.workers, args.engine, args.tolerance,
+          not args.no_cache)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
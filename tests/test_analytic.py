@@ -0,0 +1,58 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from engine.analytic import compute_areas, variant1_area_batch
+from models.presets import VARIANT_DEFAULTS
+from models.rls import RLS
+
+VARIANT1_PARAMS = {'R1': 300, 'R2': 320, 'E_ellipse': 10, 'E_hyperbola': 15}
+
+
+def _stations(rls):
+    return [rls.x, rls.y, rls.R, rls.A, rls.W]
+
+
+def test_variant1_without_overlap_matches_polygon():
+    # R1 + R2 + 2 * E_ellipse меньше расстояния между РЛС: зона эллипса пуста
+    rls1, rls2 = RLS(0, 0, 300, 45, 20), RLS(1000, 0, 300, 135, 20)
+    params = {'R1': 200, 'R2': 200, 'E_ellipse': 10, 'E_hyperbola': 15}
+    areas, errors = compute_areas(1, rls1, rls2, engine='analytic', **params)
+    polygon, _ = compute_areas(1, rls1, rls2, engine='polygon', **params)
+    assert areas == polygon == [0.0, 0.0]
+    assert errors == [0.0, 0.0]
+
+
+def test_variant1_coincident_stations():
+    rls1, rls2 = RLS(0, 0, 300, 45, 20), RLS(0, 0, 300, 135, 20)
+    areas, errors = compute_areas(1, rls1, rls2, engine='analytic', **VARIANT1_PARAMS)
+    assert areas == [0.0, 0.0]
+    assert errors == [0.0, 0.0]
+
+
+def test_variant1_mixed_batch_matches_polygon():
+    pairs = [
+        (RLS(0, -200, 400, 30, 30), RLS(500, -200, 550, 150, 30)),
+        (RLS(0, 0, 300, 45, 20), RLS(1000, 0, 300, 135, 20)),
+        (RLS(0, -200, 400, 30, 30), RLS(1500, -200, 550, 150, 30)),
+    ]
+    stations1 = np.array([_stations(rls1) for rls1, _ in pairs])
+    stations2 = np.array([_stations(rls2) for _, rls2 in pairs])
+    areas, _errors = variant1_area_batch(stations1, stations2, **VARIANT1_PARAMS)
+
+    for row, (rls1, rls2) in enumerate(pairs):
+        polygon, _ = compute_areas(1, rls1, rls2, engine='polygon', **VARIANT1_PARAMS)
+        assert areas[row] == pytest.approx(polygon, rel=1e-3, abs=1e-6)
+    assert areas[0].min() > 0
+    assert not areas[1:].any()
+
+
+@pytest.mark.parametrize('variant', (1, 3))
+def test_zero_range_without_warnings(variant):
+    rls1, rls2 = RLS(0, -200, 0, 30, 30), RLS(500, -200, 550, 150, 30)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        areas, _errors = compute_areas(variant, rls1, rls2, engine='analytic', **VARIANT_DEFAULTS[variant])
+    polygon, _ = compute_areas(variant, rls1, rls2, engine='polygon', **VARIANT_DEFAULTS[variant])
+    assert areas == pytest.approx(polygon, abs=1e-6)
@@ -0,0 +1,20 @@
+import pytest
+
+import optimizer
+
+
+def test_generation_without_overlap():
+    # При rls2.x от 1500 до 1600 зоны варианта 1 не пересекаются ни в одной конфигурации
+    result = optimizer.optimize(1, ['rls2.x'], engine='analytic', bounds={'rls2.x': (1500, 1600)},
+                                maxiter=2, popsize=3)
+    assert result['area'] == 0.0
+    assert 1500 <= result['params']['rls2.x'] <= 1600
+
+
+def test_objective_error_is_not_wrapped(monkeypatch):
+    def failing(*args, **kwargs):
+        raise ValueError("ошибка расчёта")
+
+    monkeypatch.setattr(optimizer, 'evaluate_analytic', failing)
+    with pytest.raises(ValueError, match="ошибка расчёта"):
+        optimizer.optimize(1, ['rls2.x'], engine='analytic', maxiter=2, popsize=3)
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from engine.solvers import (SOLUTION_NONE, SOLUTION_TANGENT, SOLUTION_TWO, solve_range_range,
+                            solve_sum_difference)
+from models.rls import RLS, StationTable
+
+# Обе РЛС направлены вдоль оси y: зеркальный кандидат (y < 0) вне ДНА
+RLS1, RLS2 = RLS(0, 0, 1000, 90, 60), RLS(500, 0, 1000, 90, 60)
+
+
+def _targets(count=50, seed=0):
+    generator = np.random.default_rng(seed)
+    return np.column_stack((generator.uniform(100, 400, count), generator.uniform(200, 600, count)))
+
+
+def _ranges(targets, rls):
+    return np.hypot(targets[:, 0] - rls.x, targets[:, 1] - rls.y)
+
+
+def test_range_range_round_trip():
+    targets = _targets()
+    result = solve_range_range(RLS1, RLS2, _ranges(targets, RLS1), _ranges(targets, RLS2))
+    assert (result['status'] == SOLUTION_TWO).all()
+    assert result['best'] == pytest.approx(targets, abs=1e-6)
+    assert not result['ambiguous'].any()
+
+
+def test_sum_difference_round_trip():
+    targets = _targets()
+    d1, d2 = _ranges(targets, RLS1), _ranges(targets, RLS2)
+    result = solve_sum_difference(RLS1, RLS2, d1 + d2, d2 - d1)
+    assert (result['status'] == SOLUTION_TWO).all()
+    assert result['best'] == pytest.approx(targets, abs=1e-6)
+    assert result['residual'] == pytest.approx(0, abs=1e-6)
+
+
+def test_status_codes():
+    # Окружности не пересекаются, касаются внешним образом и вложены одна в другую
+    result = solve_range_range(RLS1, RLS2, [100, 200, 1000], [100, 300, 100])
+    assert result['status'].tolist() == [SOLUTION_NONE, SOLUTION_TANGENT, SOLUTION_NONE]
+    assert np.isnan(result['points'][[0, 2]]).all()
+    assert result['best'][1] == pytest.approx([200, 0])
+    assert not result['ambiguous'].any()
+
+
+def test_coincident_stations():
+    result = solve_range_range(RLS1, RLS(0, 0, 1000, 45, 60), [300, 300], [300, 400])
+    assert (result['status'] == SOLUTION_NONE).all()
+    assert np.isnan(result['points']).all()
+
+
+def test_incompatible_sum_difference_has_residual():
+    # Сумма расстояний меньше базы: решение - точка на линии базы с ненулевой невязкой
+    result = solve_sum_difference(RLS1, RLS2, [400], [0])
+    assert result['status'].tolist() == [SOLUTION_NONE]
+    assert np.isfinite(result['best']).all()
+    assert result['residual'][0] > 0
+
+
+@pytest.mark.parametrize('solve', (solve_range_range, solve_sum_difference))
+def test_chunked_matches_unchunked(solve):
+    targets = _targets(53)
+    generator = np.random.default_rng(1)
+    # Своя пара РЛС для каждого измерения, часть измерений без решения
+    stations1 = StationTable(np.column_stack((generator.uniform(-50, 50, 53), generator.uniform(-50, 50, 53),
+                                              np.full(53, 1000), np.full(53, 90), np.full(53, 60))))
+    stations2 = StationTable(np.column_stack((generator.uniform(450, 550, 53), generator.uniform(-50, 50, 53),
+                                              np.full(53, 1000), np.full(53, 90), np.full(53, 60))))
+    first, second = _ranges(targets, RLS1), _ranges(targets, RLS2)
+    first[::5] = 10
+    if solve is solve_sum_difference:
+        first, second = first + second, second - first
+
+    for rls1, rls2 in ((RLS1, RLS2), (stations1, stations2)):
+        whole = solve(rls1, rls2, first, second)
+        parts = solve(rls1, rls2, first, second, chunk=7)
+        assert whole.keys() == parts.keys()
+        for key in whole:
+            np.testing.assert_array_equal(parts[key], whole[key])
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+import pytest
+
+import sweep
+
+
+@pytest.fixture(autouse=True)
+def no_result_cache(monkeypatch):
+    monkeypatch.setenv('RLS_RESULT_CACHE', 'off')
+
+
+def _fail_on(monkeypatch, value):
+    """Ошибка расчёта конфигурации с rls1.A == value."""
+    evaluate = sweep.evaluate
+
+    def failing(variant, params):
+        if params['rls1.A'] == value:
+            raise ValueError("ошибка расчёта")
+        return evaluate(variant, params)
+
+    monkeypatch.setattr(sweep, 'evaluate', failing)
+
+
+def test_failed_chunk_is_not_written(tmp_path, monkeypatch):
+    grid = {'rls1.A': [0.0, 10.0, 20.0, 30.0]}
+    _fail_on(monkeypatch, 30.0)
+    with pytest.raises(RuntimeError, match="блоки: 1"):
+        sweep.sweep(str(tmp_path), 2, grid, chunk_size=2, workers=1)
+    assert os.path.exists(tmp_path / 'chunk_000000.npz')
+    assert not os.path.exists(tmp_path / 'chunk_000001.npz')
+
+    # Повторный запуск досчитывает только блок с ошибкой
+    monkeypatch.undo()
+    assert sweep.sweep(str(tmp_path), 2, grid, chunk_size=2, workers=1) == 1
+    columns = sweep.load_sweep(str(tmp_path))
+    assert columns['index'].tolist() == [0, 1, 2, 3]
+    assert not np.isnan(columns['area1']).any()
+
+
+def test_run_chunk_reports_configuration(monkeypatch):
+    _fail_on(monkeypatch, 10.0)
+    manifest = {'variant': 2, 'engine': 'polygon', 'tolerance': 0, 'grid': {'rls1.A': [0.0, 10.0]},
+                'base': sweep.base_parameters(2), 'chunk_size': 2, 'total': 2}
+    with pytest.raises(RuntimeError, match="Конфигурация 1"):
+        sweep.run_chunk(manifest, 0, use_cache=False)
+
+
+def test_main_analytic_without_overlap(tmp_path):
+    out = str(tmp_path / 'sweep')
+    assert sweep.main(['--variant', '1', '--engine', 'analytic', '--out', out,
+                       '--param', 'rls2.x=1500:1600:5', '--workers', '1']) == 0
+    columns = sweep.load_sweep(out)
+    assert columns['area1'].tolist() == [0.0] * 5
+    assert columns['area2'].tolist() == [0.0] * 5
+
+
+def test_main_unknown_parameter(tmp_path):
+    assert sweep.main(['--variant', '1', '--out', str(tmp_path), '--param', 'rls3.x=1,2']) == 1
+
+
+def test_main_does_not_hide_compute_errors(tmp_path, monkeypatch):
+    def failing(*args, **kwargs):
+        raise ValueError("ошибка расчёта")
+
+    monkeypatch.setattr(sweep, 'evaluate_analytic', failing)
+    with pytest.raises(RuntimeError) as error:
+        sweep.main(['--variant', '1', '--engine', 'analytic', '--out', str(tmp_path),
+                    '--param', 'rls2.x=1500:1600:5', '--workers', '1'])
+    assert isinstance(error.value.__cause__, ValueError)
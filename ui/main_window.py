@@ -1,17 +1,27 @@
+import copy
 import json
+import os
 import numpy as np
 from PyQt5 import QtWidgets, QtCore
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QFileDialog 
-from PyQt5.QtGui import QPolygonF
+from PyQt5.QtGui import QKeySequence, QPainterPath
 import pyqtgraph as pg
-from shapely.geometry import Polygon, GeometryCollection
 
 from ui.slider_double_spinbox import SliderDoubleSpinBox
+from ui.recompute_scheduler import RecomputeScheduler
+from ui.optimizer_dialog import OptimizerDialog
+from ui.monte_carlo_thread import MonteCarloThread
+
+from models.presets import preset_rls
+from engine.accuracy import accuracy_tiles
+from engine.geometry import compute_variant, iter_polygons
+from engine.profiler import profiler
+from engine.result_cache import cached_compute_variant
+
+# Количество точек выборки оценки Монте-Карло (на область)
+MONTE_CARLO_SAMPLES = 1_000_000
 
-from models.rls import RLS
-from utils.ellipse_calculator import compute_ellipse
-from utils.hyperbola_calculator import compute_hyperbola
 
 class MainWindow(QtWidgets.QWidget):
     def __init__(self):
@@ -19,7 +29,10 @@ class MainWindow(QtWidgets.QWidget):
         self._initialize_rls()
         self._setup_ui()
         self._setup_plot()
-        self.update_plot()
+        self.recompute_scheduler = RecomputeScheduler(self._compute_snapshot, parent=self)
+        self.recompute_scheduler.resultReady.connect(self._on_result_ready)
+        self._setup_profiling()
+        self.update_plot(persist=True)
 
     def _setup_ui(self):
         self.setWindowTitle("Моделирование двух угломерно-дальномерных систем (РЛС)")
@@ -40,49 +53,29 @@ class MainWindow(QtWidgets.QWidget):
         # НАЧАЛЬНАЯ КОНФИГУРАЦИЯ СИСТЕМЫ
         if option < 0:
             # Инициализация конфигураций РЛС
-            self.rls1 = RLS(x=0, y=-200, R=300, A=135, W=20)
-            self.rls2 = RLS(x=500, y=-200, R=550, A=45, W=20)
+            self.rls1, self.rls2 = preset_rls(0)
             
             # Параметры ошибки
             self.E_ellipse = 10
             self.E_hyperbola = 15
             
-            # Списки для отслеживания построенных графиков
-            self.current_antennas_lobes = list()
-            self.current_intersection_items = list()
- 
             self.firstRun = True
 
         elif option == 0:
             # Инициализация конфигураций РЛС
-            self.rls1 = RLS(x=0, y=-200, R=300, A=135, W=20)
-            self.rls2 = RLS(x=500, y=-200, R=550, A=45, W=20)
+            self.rls1, self.rls2 = preset_rls(0)
             
             # Параметры ошибки
             self.E_ellipse = 10
             self.E_hyperbola = 15
-            
-            # Списки для отслеживания построенных графиков
-            self.current_antennas_lobes = list()
-            self.current_intersection_items = list()
 
         elif option == 1:
             # Инициализация конфигураций РЛС
-            self.rls1 = RLS(x=0, y=-200, R=300, A=45, W=20)
-            self.rls2 = RLS(x=500, y=-200, R=550, A=135, W=20)
-            
-            # Списки для отслеживания построенных графиков
-            self.current_antennas_lobes = list()
-            self.current_intersection_items = list()
+            self.rls1, self.rls2 = preset_rls(1)
 
         elif option == 2:
             # Инициализация конфигураций РЛС
-            self.rls1 = RLS(x=0, y=-200, R=450, A=45, W=20)
-            self.rls2 = RLS(x=500, y=-200, R=550, A=135, W=20)
-            
-            # Списки для отслеживания построенных графиков
-            self.current_antennas_lobes = list()
-            self.current_intersection_items = list()
+            self.rls1, self.rls2 = preset_rls(2)
 
     def _setup_plot(self):
         # Добавление элементов на график
@@ -90,6 +83,9 @@ class MainWindow(QtWidgets.QWidget):
         self.rls1_point = self.plot_widget.plot([], [], pen=None, symbol='o', symbolBrush='blue', symbolSize=10, name="РЛС 1")
         self.rls2_point = self.plot_widget.plot([], [], pen=None, symbol='o', symbolBrush='red', symbolSize=10, name="РЛС 2")
 
+        # Положения цели (варианты 1 и 3)
+        self.target_point = self.plot_widget.plot([], [], pen=None, symbol='x', symbolBrush='black', symbolPen='black', symbolSize=14, name="Цель")
+
         # Эллипсы
         self.ellipse1 = self.plot_widget.plot([], [], pen=pg.mkPen(color='green', width=2), name="Эллипс 1 (Идеальный)")
         self.ellipse2 = self.plot_widget.plot([], [], pen=pg.mkPen(color='orange', width=2), name="Эллипс 2 (Погрешность)")
@@ -101,6 +97,96 @@ class MainWindow(QtWidgets.QWidget):
         self.hyperbola2_uncertainty = self.plot_widget.plot([], [], pen=pg.mkPen(color='brown', width=2, style=QtCore.Qt.DashDotLine), name="Гипербола 2 (Погрешность)")
         self.hyperbola2_uncertainty_neg = self.plot_widget.plot([], [], pen=pg.mkPen(color='brown', width=2, style=QtCore.Qt.DotLine), name="Гипербола 2 (Погрешность Минус)")
 
+        # Элементы ниже создаются один раз и обновляются на месте при каждой перерисовке
+        # Карта точности местоопределения (под остальными элементами)
+        self.accuracy_image = pg.ImageItem()
+        self.accuracy_image.setLookupTable(pg.colormap.get('viridis').getLookupTable(alpha=True))
+        self.accuracy_image.setOpacity(0.7)
+        self.accuracy_image.setZValue(-10)
+        self.accuracy_image.setVisible(False)
+        self.plot_widget.addItem(self.accuracy_image)
+        # Перерисовка карты при изменении видимой области
+        self.plot_widget.sigRangeChanged.connect(self._on_view_changed)
+
+        # Линии направления главных лепестков
+        self.beam_lines = [
+            self.plot_widget.plot([], [], pen=pg.mkPen('b', style=Qt.DashLine, width=1)),
+            self.plot_widget.plot([], [], pen=pg.mkPen('r', style=Qt.DashLine, width=1)),
+        ]
+
+        # ДНА
+        self.lobe_items = [
+            self._create_path_item(pg.mkBrush(0, 255, 255, 100), pg.mkPen(color='blue', width=2)),
+            self._create_path_item(pg.mkBrush(255, 0, 0, 100), pg.mkPen(color='red', width=2)),
+        ]
+
+        # Области пересечения
+        self.intersection_item = self._create_path_item(pg.mkBrush(0, 255, 0, 255), pg.mkPen(None))
+
+        # Окружности дальности и погрешности (вариант 3)
+        self.circle_items = []
+        for pen in (pg.mkPen(color='blue', width=2), pg.mkPen(color='blue', style=QtCore.Qt.DashLine),
+                    pg.mkPen(color='red', width=2), pg.mkPen(color='red', style=QtCore.Qt.DashLine)):
+            circle = QtWidgets.QGraphicsEllipseItem()
+            circle.setPen(pen)
+            circle.setVisible(False)
+            self.plot_widget.addItem(circle)
+            self.circle_items.append(circle)
+
+    def _setup_profiling(self):
+        """Панель времени этапов поверх графика (только при включённом профилировании)."""
+        self.profile_hud = None
+        if not profiler.enabled:
+            return
+
+        self.profile_hud = QtWidgets.QLabel(self.plot_widget)
+        self.profile_hud.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.profile_hud.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 160); color: white; font-family: monospace; padding: 4px;"
+        )
+        self.profile_hud.move(10, 10)
+
+        # Сохранение трассировки сеанса в формате Chrome Trace
+        QtWidgets.QShortcut(QKeySequence("Ctrl+Shift+P"), self, activated=self.save_profile_trace)
+
+    def _update_profile_hud(self):
+        """Обновление панели: последнее значение и скользящие перцентили каждого этапа, мс."""
+        if self.profile_hud is None:
+            return
+        lines = [f"{'этап':<24}{'посл.':>7}{'p50':>7}{'p95':>7}"]
+        for name, stats in profiler.summary().items():
+            lines.append(f"{name:<24}{stats['last']:>7.2f}{stats['p50']:>7.2f}{stats['p95']:>7.2f}")
+        self.profile_hud.setText("\n".join(lines))
+        self.profile_hud.adjustSize()
+
+    def save_profile_trace(self):
+        """Сохранение трассировки сеанса профилирования (Ctrl+Shift+P)."""
+        options = QFileDialog.Options()
+        filename, _ = QFileDialog.getSaveFileName(self, "Save Profile Trace", "", "JSON Files (*.json);;All Files (*)", options=options)
+        if filename:
+            try:
+                profiler.dump_trace(filename)
+            except Exception as e:
+                QtWidgets.QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить трассировку:\n{e}")
+
+    def closeEvent(self, event):
+        if self.monte_carlo_thread is not None and self.monte_carlo_thread.isRunning():
+            self.monte_carlo_thread.wait()
+
+        # Трассировка сеанса сохраняется автоматически, если задан путь RLS_PROFILE_TRACE
+        trace_path = os.environ.get('RLS_PROFILE_TRACE')
+        if profiler.enabled and trace_path:
+            profiler.dump_trace(trace_path)
+        super().closeEvent(event)
+
+    def _create_path_item(self, brush, pen):
+        """Создание постоянного элемента графика для заливаемых контуров."""
+        item = QtWidgets.QGraphicsPathItem()
+        item.setBrush(brush)
+        item.setPen(pen)
+        self.plot_widget.addItem(item)
+        return item
+
     def _create_control_panel(self):
         control_layout = QtWidgets.QVBoxLayout()
         control_layout.setAlignment(QtCore.Qt.AlignTop)
@@ -117,6 +203,21 @@ class MainWindow(QtWidgets.QWidget):
         h_layout_combo.addWidget(self.combo_box)
         control_layout.addLayout(h_layout_combo)
 
+        # Карта точности местоопределения (варианты 1 и 3)
+        self.check_accuracy = QtWidgets.QCheckBox("Карта точности (СКО местоопределения)")
+        self.check_accuracy.stateChanged.connect(self.schedule_update)
+        control_layout.addWidget(self.check_accuracy)
+
+        # Оценка Монте-Карло выполняется в фоновом потоке; кнопка создаётся в панелях вариантов 1 и 3
+        self.monte_carlo_thread = None
+        self.monte_carlo_button = None
+
+        # Подбор параметров РЛС по площади пересечения
+        self.optimizer_dialog = None
+        optimizer_button = QtWidgets.QPushButton("Подбор параметров РЛС...")
+        optimizer_button.clicked.connect(self.open_optimizer)
+        control_layout.addWidget(optimizer_button)
+
         self.dynamic_layout = QtWidgets.QVBoxLayout()
         control_layout.addLayout(self.dynamic_layout)
 
@@ -140,35 +241,20 @@ class MainWindow(QtWidgets.QWidget):
                     sub_layout.deleteLater()
 
     def _clear_plot_items(self):
-        for item in self.current_antennas_lobes:
-            self.plot_widget.removeItem(item)
-        self.current_antennas_lobes.clear()
-
-        for item in self.current_intersection_items:
-            self.plot_widget.removeItem(item)
-        self.current_intersection_items.clear()
-
-        # Очищаем статические элементы графика, такие как эллипсы и гиперболы
-        self.plot_widget.removeItem(self.ellipse1)
-        self.plot_widget.removeItem(self.ellipse2)
-        self.plot_widget.removeItem(self.hyperbola1_uncertainty)
-        self.plot_widget.removeItem(self.hyperbola1_uncertainty_neg)
-        self.plot_widget.removeItem(self.hyperbola2_uncertainty)
-        self.plot_widget.removeItem(self.hyperbola2_uncertainty_neg)
-
-        # Очищаем точки РЛС (синие и красные точки)
-        self.plot_widget.removeItem(self.rls1_point)
-        self.plot_widget.removeItem(self.rls2_point)
-
-        # Сброс элементов графика
-        self.ellipse1.clear()
-        self.ellipse2.clear()
-        self.hyperbola1_uncertainty.clear()
-        self.hyperbola1_uncertainty_neg.clear()
-        self.hyperbola2_uncertainty.clear()
-        self.hyperbola2_uncertainty_neg.clear()
-        self.rls1_point.clear()
-        self.rls2_point.clear()
+        """Сброс данных элементов графика без их удаления (элементы переиспользуются между вариантами)."""
+        for curve in (self.ellipse1, self.ellipse2,
+                      self.hyperbola1_uncertainty, self.hyperbola1_uncertainty_neg,
+                      self.hyperbola2_uncertainty, self.hyperbola2_uncertainty_neg,
+                      self.rls1_point, self.rls2_point, self.target_point, *self.beam_lines):
+            curve.clear()
+
+        for item in (*self.lobe_items, self.intersection_item):
+            item.setPath(QPainterPath())
+
+        for circle in self.circle_items:
+            circle.setVisible(False)
+
+        self.accuracy_image.setVisible(False)
 
     def _reset_input_values(self):
         """Сброс всех вводимых значений в состояние по умолчанию."""
@@ -179,7 +265,13 @@ class MainWindow(QtWidgets.QWidget):
     
     def _handle_combobox_change(self):
         """Обработка изменений в ComboBox и перезагрузка соответствующего пользовательского интерфейса и графика."""
+        # Подбор параметров относится к предыдущему варианту
+        if self.optimizer_dialog is not None:
+            self.optimizer_dialog.close()
+            self.optimizer_dialog = None
+
         # Рекурсивная очистка всех виджетов и макетов в dynamic_layout
+        self.monte_carlo_button = None
         self._clear_layout(self.dynamic_layout)
 
         self.inputs_rls1 = {}
@@ -192,42 +284,25 @@ class MainWindow(QtWidgets.QWidget):
         # Загрузка пользовательского интерфейса и обновление графика в зависимости от выбранного варианта
         if self.combo_box.currentIndex() == 0:
             self._load_option_1_ui()
-            self.update_plot()
+            self.update_plot(persist=True)
         elif self.combo_box.currentIndex() == 1:
             self._load_option_2_ui()
-            self.update_plot()
+            self.update_plot(persist=True)
         elif self.combo_box.currentIndex() == 2:
             self._load_option_3_ui()
-            self.update_plot()
-
-    def _initialize_static_plot_items(self):
-        """Переинициализация статических элементов графика, таких как точки, эллипсы и гиперболы."""
-        # Повторное добавление точек РЛС (синие и красные точки)
-        self.rls1_point = self.plot_widget.plot([], [], pen=None, symbol='o', symbolBrush='blue', symbolSize=10, name="РЛС 1")
-        self.rls2_point = self.plot_widget.plot([], [], pen=None, symbol='o', symbolBrush='red', symbolSize=10, name="РЛС 2")
-
-        # Повторное добавление эллипсов
-        self.ellipse1 = self.plot_widget.plot([], [], pen=pg.mkPen(color='green', width=2), name="Эллипс 1 (Идеальный)")
-        self.ellipse2 = self.plot_widget.plot([], [], pen=pg.mkPen(color='orange', width=2), name="Эллипс 2 (Погрешность)")
-
-        # Повторное добавление гипербол
-        self.hyperbola1_uncertainty = self.plot_widget.plot([], [], pen=pg.mkPen(color='purple', width=2, style=QtCore.Qt.DashDotLine), name="Гипербола 1 (Погрешность)")
-        self.hyperbola1_uncertainty_neg = self.plot_widget.plot([], [], pen=pg.mkPen(color='purple', width=2, style=QtCore.Qt.DotLine), name="Гипербола 1 (Погрешность Минус)")
-
-        self.hyperbola2_uncertainty = self.plot_widget.plot([], [], pen=pg.mkPen(color='brown', width=2, style=QtCore.Qt.DashDotLine), name="Гипербола 2 (Погрешность)")
-        self.hyperbola2_uncertainty_neg = self.plot_widget.plot([], [], pen=pg.mkPen(color='brown', width=2, style=QtCore.Qt.DotLine), name="Гипербола 2 (Погрешность Минус)")
+            self.update_plot(persist=True)
 
     def _sync_angles_from_rls1(self, value):
         self.angle_spin_rls2.blockSignals(True)
         self.angle_spin_rls2.setValue(180 - value)
         self.angle_spin_rls2.blockSignals(False)
-        self.update_plot()
+        self.schedule_update()
 
     def _sync_angles_from_rls2(self, value):
         self.angle_spin_rls1.blockSignals(True)
         self.angle_spin_rls1.setValue(180 - value)
         self.angle_spin_rls1.blockSignals(False)
-        self.update_plot()
+        self.schedule_update()
 
     def _toggle_beam_sync(self, state):
         """Включение или отключение синхронизации ДНА."""
@@ -240,8 +315,6 @@ class MainWindow(QtWidgets.QWidget):
 
     def _load_option_1_ui(self):
         """Загрузка элементов пользовательского интерфейса для Варианта 1."""
-        self._initialize_static_plot_items()
-
         self.dynamic_layout.addSpacing(20)
 
         # Параметры для первой РЛС
@@ -272,7 +345,7 @@ class MainWindow(QtWidgets.QWidget):
                 input_element.setValue(getattr(self.rls1, param))
                 input_element.setSingleStep(1)
 
-            input_element.valueChanged.connect(self.update_plot)
+            input_element.valueChanged.connect(self.schedule_update)
             self.inputs_rls1[param] = input_element
             h_layout = QtWidgets.QHBoxLayout()
             h_layout.addWidget(label)
@@ -309,7 +382,7 @@ class MainWindow(QtWidgets.QWidget):
                 input_element.setValue(getattr(self.rls2, param))
                 input_element.setSingleStep(1)
 
-            input_element.valueChanged.connect(self.update_plot)
+            input_element.valueChanged.connect(self.schedule_update)
             self.inputs_rls2[param] = input_element
             h_layout = QtWidgets.QHBoxLayout()
             h_layout.addWidget(label)
@@ -325,7 +398,7 @@ class MainWindow(QtWidgets.QWidget):
         spin_R1.setRange(1, 1000)
         spin_R1.setDecimals(0)
         spin_R1.setValue(300)
-        spin_R1.valueChanged.connect(self.update_plot)
+        spin_R1.valueChanged.connect(self.schedule_update)
         self.spin_R1 = spin_R1
         h_layout_R1 = QtWidgets.QHBoxLayout()
         h_layout_R1.addWidget(label_R1)
@@ -337,7 +410,7 @@ class MainWindow(QtWidgets.QWidget):
         spin_R2.setRange(1, 1000)
         spin_R2.setDecimals(0)
         spin_R2.setValue(550)
-        spin_R2.valueChanged.connect(self.update_plot)
+        spin_R2.valueChanged.connect(self.schedule_update)
         self.spin_R2 = spin_R2
         h_layout_R2 = QtWidgets.QHBoxLayout()
         h_layout_R2.addWidget(label_R2)
@@ -355,7 +428,7 @@ class MainWindow(QtWidgets.QWidget):
         spin_E_ellipse.setRange(1, 1000)
         spin_E_ellipse.setDecimals(2)
         spin_E_ellipse.setValue(self.E_ellipse)
-        spin_E_ellipse.valueChanged.connect(self.update_plot)
+        spin_E_ellipse.valueChanged.connect(self.schedule_update)
         self.spin_E_ellipse = spin_E_ellipse
         h_layout_E_ellipse = QtWidgets.QHBoxLayout()
         h_layout_E_ellipse.addWidget(label_E_ellipse)
@@ -368,7 +441,7 @@ class MainWindow(QtWidgets.QWidget):
         spin_E_hyperbola.setRange(1, 110)
         spin_E_hyperbola.setDecimals(2)
         spin_E_hyperbola.setValue(self.E_hyperbola)
-        spin_E_hyperbola.valueChanged.connect(self.update_plot)
+        spin_E_hyperbola.valueChanged.connect(self.schedule_update)
         self.spin_E_hyperbola = spin_E_hyperbola
         h_layout_E_hyperbola = QtWidgets.QHBoxLayout()
         h_layout_E_hyperbola.addWidget(label_E_hyperbola)
@@ -384,6 +457,8 @@ class MainWindow(QtWidgets.QWidget):
         self.label_area2 = QtWidgets.QLabel("Площадь 2: 0 м²")
         self.dynamic_layout.addWidget(self.label_area2)
 
+        self._add_monte_carlo_button()
+
         self.dynamic_layout.addSpacing(20)
 
         # Кнопки сохранения/загрузки конфигурации
@@ -400,8 +475,6 @@ class MainWindow(QtWidgets.QWidget):
     def _load_option_2_ui(self):
         """Загрузка элементов пользовательского интерфейса для Варианта 2."""
         self._initialize_rls(1)
-        self._initialize_static_plot_items()
-
         self.dynamic_layout.addSpacing(20)
 
         self.sync_checkbox = QtWidgets.QCheckBox("Синхронизировать поворот РЛС")
@@ -439,7 +512,7 @@ class MainWindow(QtWidgets.QWidget):
                 input_element.setValue(getattr(self.rls1, param))
                 input_element.setSingleStep(1)
 
-            input_element.valueChanged.connect(self.update_plot)
+            input_element.valueChanged.connect(self.schedule_update)
             self.inputs_rls1[param] = input_element
             h_layout = QtWidgets.QHBoxLayout()
             h_layout.addWidget(label)
@@ -477,7 +550,7 @@ class MainWindow(QtWidgets.QWidget):
                 input_element.setValue(getattr(self.rls2, param))
                 input_element.setSingleStep(1)
 
-            input_element.valueChanged.connect(self.update_plot)
+            input_element.valueChanged.connect(self.schedule_update)
             self.inputs_rls2[param] = input_element
             h_layout = QtWidgets.QHBoxLayout()
             h_layout.addWidget(label)
@@ -507,8 +580,6 @@ class MainWindow(QtWidgets.QWidget):
     def _load_option_3_ui(self):
         """Загрузка элементов пользовательского интерфейса для Варианта 3."""
         self._initialize_rls(2)
-        self._initialize_static_plot_items()
-
         self.dynamic_layout.addSpacing(20)
 
         # Параметры для первой РЛС
@@ -539,7 +610,7 @@ class MainWindow(QtWidgets.QWidget):
                 input_element.setValue(getattr(self.rls1, param))
                 input_element.setSingleStep(1)
 
-            input_element.valueChanged.connect(self.update_plot)
+            input_element.valueChanged.connect(self.schedule_update)
             self.inputs_rls1[param] = input_element
             h_layout = QtWidgets.QHBoxLayout()
             h_layout.addWidget(label)
@@ -576,7 +647,7 @@ class MainWindow(QtWidgets.QWidget):
                 input_element.setValue(getattr(self.rls2, param))
                 input_element.setSingleStep(1)
 
-            input_element.valueChanged.connect(self.update_plot)
+            input_element.valueChanged.connect(self.schedule_update)
             self.inputs_rls2[param] = input_element
             h_layout = QtWidgets.QHBoxLayout()
             h_layout.addWidget(label)
@@ -591,7 +662,7 @@ class MainWindow(QtWidgets.QWidget):
         self.spin_radius_rls1 = QtWidgets.QDoubleSpinBox()
         self.spin_radius_rls1.setRange(0, 1000)
         self.spin_radius_rls1.setValue(200)
-        self.spin_radius_rls1.valueChanged.connect(self.update_plot)
+        self.spin_radius_rls1.valueChanged.connect(self.schedule_update)
         h_layout_radius_rls1 = QtWidgets.QHBoxLayout()
         h_layout_radius_rls1.addWidget(label_radius_rls1)
         h_layout_radius_rls1.addWidget(self.spin_radius_rls1)
@@ -601,7 +672,7 @@ class MainWindow(QtWidgets.QWidget):
         self.spin_error_rls1 = QtWidgets.QDoubleSpinBox()
         self.spin_error_rls1.setRange(0, 500)
         self.spin_error_rls1.setValue(10)
-        self.spin_error_rls1.valueChanged.connect(self.update_plot)
+        self.spin_error_rls1.valueChanged.connect(self.schedule_update)
         h_layout_error_rls1 = QtWidgets.QHBoxLayout()
         h_layout_error_rls1.addWidget(label_error_rls1)
         h_layout_error_rls1.addWidget(self.spin_error_rls1)
@@ -613,7 +684,7 @@ class MainWindow(QtWidgets.QWidget):
         self.spin_radius_rls2 = QtWidgets.QDoubleSpinBox()
         self.spin_radius_rls2.setRange(0, 1000)
         self.spin_radius_rls2.setValue(350)
-        self.spin_radius_rls2.valueChanged.connect(self.update_plot)
+        self.spin_radius_rls2.valueChanged.connect(self.schedule_update)
         h_layout_radius_rls2 = QtWidgets.QHBoxLayout()
         h_layout_radius_rls2.addWidget(label_radius_rls2)
         h_layout_radius_rls2.addWidget(self.spin_radius_rls2)
@@ -623,7 +694,7 @@ class MainWindow(QtWidgets.QWidget):
         self.spin_error_rls2 = QtWidgets.QDoubleSpinBox()
         self.spin_error_rls2.setRange(0, 500)
         self.spin_error_rls2.setValue(15)
-        self.spin_error_rls2.valueChanged.connect(self.update_plot)
+        self.spin_error_rls2.valueChanged.connect(self.schedule_update)
         h_layout_error_rls2 = QtWidgets.QHBoxLayout()
         h_layout_error_rls2.addWidget(label_error_rls2)
         h_layout_error_rls2.addWidget(self.spin_error_rls2)
@@ -635,6 +706,8 @@ class MainWindow(QtWidgets.QWidget):
 
         self.label_area1 = QtWidgets.QLabel("Площадь: 0 м²")
         self.dynamic_layout.addWidget(self.label_area1)
+
+        self._add_monte_carlo_button()
         
         self.dynamic_layout.addSpacing(20)
 
@@ -687,6 +760,8 @@ class MainWindow(QtWidgets.QWidget):
             try:
                 with open(filename, 'w', encoding='utf-8') as f:
                     json.dump(config, f, ensure_ascii=False, indent=4)
+                # Результат сохранённой конфигурации заносится в постоянный кэш
+                self.update_plot(persist=True)
                 QtWidgets.QMessageBox.information(self, "Успех", "Конфигурация сохранена успешна.")
             except Exception as e:
                 QtWidgets.QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить конфигурацию:\n{e}")
@@ -729,523 +804,308 @@ class MainWindow(QtWidgets.QWidget):
                 self.spin_radius_rls2.setValue(config['circle_radius_rls2'])
                 self.spin_error_rls2.setValue(config['circle_error_rls2'])
 
+                # Сразу, без отложенного перерасчёта, с чтением постоянного кэша
+                self.update_plot(persist=True)
+
                 QtWidgets.QMessageBox.information(self, "Успех", "Конфигурация загружена успешно.")
             except Exception as e:
                 QtWidgets.QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить конфигурацию:\n{e}")
 
-    def update_plot(self):
-        current_option = self.combo_box.currentIndex()
+    def _read_rls_inputs(self):
+        """Обновление параметров РЛС из интерфейса."""
+        for rls, inputs in ((self.rls1, self.inputs_rls1), (self.rls2, self.inputs_rls2)):
+            rls.x = inputs['X'].value()
+            rls.y = inputs['Y'].value()
+            rls.R = inputs['R'].value()
+            rls.A = inputs['A'].value()
+            rls.W = inputs['W'].value()
+
+    def _render_lobes(self, result):
+        """Отрисовка ДНА и линий направления главных лепестков."""
+        for line, (x, y) in zip(self.beam_lines, result['beam_lines']):
+            line.setData(x, y)
+
+        # Контур строится напрямую из массивов NumPy, без создания объектов QPointF
+        for item, (x, y) in zip(self.lobe_items, result['lobes']):
+            item.setPath(pg.arrayToQPath(np.asarray(x), np.asarray(y)))
+
+    def _render_intersections(self, result):
+        """Отрисовка областей пересечения одним контуром."""
+        xs, ys = [], []
+        for intersection in result['intersections']:
+            for polygon in iter_polygons(intersection):
+                # Внутренние кольца (отверстия) вырезаются правилом заливки чёт-нечет
+                for ring in (polygon.exterior, *polygon.interiors):
+                    coords = np.asarray(ring.coords)
+                    xs.extend((coords[:, 0], [np.nan]))
+                    ys.extend((coords[:, 1], [np.nan]))
+
+        if xs:
+            path = pg.arrayToQPath(np.concatenate(xs), np.concatenate(ys), connect='finite')
+        else:
+            path = QPainterPath()
+        self.intersection_item.setPath(path)
+
+    def _render_circles(self, result):
+        """Отрисовка окружностей дальности и погрешности (вариант 3)."""
+        for circle, (x, y, radius, _is_error) in zip(self.circle_items, result['circles']):
+            circle.setRect(x - radius, y - radius, 2 * radius, 2 * radius)
+            circle.setVisible(True)
+
+    def open_optimizer(self):
+        """Окно подбора параметров РЛС для текущего варианта и текущих значений параметров."""
+        snapshot = self._snapshot_parameters()
+        base = dict(snapshot['params'])
+        for prefix, rls in (('rls1', snapshot['rls1']), ('rls2', snapshot['rls2'])):
+            for name in ('x', 'y', 'R', 'A', 'W'):
+                base[f'{prefix}.{name}'] = getattr(rls, name)
+
+        if self.optimizer_dialog is not None:
+            self.optimizer_dialog.close()
+        self.optimizer_dialog = OptimizerDialog(snapshot['variant'], base, self.apply_parameters, self)
+        self.optimizer_dialog.show()
+
+    def apply_parameters(self, params):
+        """
+        Установка значений в поля ввода (график перерисовывается отложенно)
+
+        :param params: Словарь {имя параметра: значение}, имена как в sweep.py (rls1.x, ..., R1, ...)
+        """
+        for name, value in params.items():
+            if name.startswith('rls'):
+                prefix, param = name.split('.')
+                inputs = self.inputs_rls1 if prefix == 'rls1' else self.inputs_rls2
+                inputs[param.upper()].setValue(value)
+            else:
+                getattr(self, f'spin_{name}').setValue(value)
 
-        if not self.inputs_rls1 or not self.inputs_rls2:
+    def _add_monte_carlo_button(self):
+        """Кнопка оценки Монте-Карло в панели варианта (недоступна, пока оценка выполняется)."""
+        self.monte_carlo_button = QtWidgets.QPushButton("Оценка Монте-Карло")
+        self.monte_carlo_button.clicked.connect(self.run_monte_carlo)
+        self._update_monte_carlo_button()
+        self.dynamic_layout.addWidget(self.monte_carlo_button)
+
+    def _update_monte_carlo_button(self):
+        if self.monte_carlo_button is None:
             return
+        running = self.monte_carlo_thread is not None
+        self.monte_carlo_button.setEnabled(not running)
+        self.monte_carlo_button.setText("Оценка Монте-Карло..." if running else "Оценка Монте-Карло")
 
-        if current_option == 0:
-            # Обновление параметров РЛС из интерфейса
-            self.rls1.x = self.inputs_rls1['X'].value()
-            self.rls1.y = self.inputs_rls1['Y'].value()
-            self.rls1.R = self.inputs_rls1['R'].value()
-            self.rls1.A = self.inputs_rls1['A'].value()
-            self.rls1.W = self.inputs_rls1['W'].value()
-            position1 = np.array([self.rls1.x, self.rls1.y])
-            main_lobe_direction_deg1 = self.rls1.A
-            max_range1 = self.rls1.R * 1.5
-
-            self.rls2.x = self.inputs_rls2['X'].value()
-            self.rls2.y = self.inputs_rls2['Y'].value()
-            self.rls2.R = self.inputs_rls2['R'].value()
-            self.rls2.A = self.inputs_rls2['A'].value()
-            self.rls2.W = self.inputs_rls2['W'].value()
-            position2 = np.array([self.rls2.x, self.rls2.y])
-            main_lobe_direction_deg2 = self.rls2.A
-            max_range2 = self.rls2.R * 1.5
+    def run_monte_carlo(self):
+        """Запуск фоновой оценки точности местоопределения методом Монте-Карло для текущих параметров."""
+        if self.monte_carlo_thread is not None:
+            return
+        self.monte_carlo_thread = MonteCarloThread(self._snapshot_parameters(), MONTE_CARLO_SAMPLES, parent=self)
+        self.monte_carlo_thread.resultReady.connect(self._on_monte_carlo_ready)
+        self.monte_carlo_thread.failed.connect(self._on_monte_carlo_failed)
+        self.monte_carlo_thread.finished.connect(self._on_monte_carlo_finished)
+        self._update_monte_carlo_button()
+        self.monte_carlo_thread.start()
+
+    def _on_monte_carlo_finished(self):
+        self.monte_carlo_thread.deleteLater()
+        self.monte_carlo_thread = None
+        self._update_monte_carlo_button()
+
+    def _on_monte_carlo_failed(self, message):
+        QtWidgets.QMessageBox.critical(self, "Оценка Монте-Карло", f"Не удалось выполнить оценку:\n{message}")
+
+    def _on_monte_carlo_ready(self, snapshot, results):
+        # Оценка, запущенная для другого варианта, устарела
+        if snapshot['variant'] != self.combo_box.currentIndex() + 1:
+            return
 
+        lines = []
+        for index, result in enumerate(results, start=1):
+            low, high = result['probability_ci']
+            (cxx, cxy), (_, cyy) = result['covariance']
+            lines.append(
+                f"Область {index}: площадь {result['area']:.2f} м², целей {result['targets']}\n"
+                f"  вероятность попадания {result['probability']:.3f} (95%: {low:.3f} - {high:.3f})\n"
+                f"  СКО ошибки: x {np.sqrt(cxx):.2f} м, y {np.sqrt(cyy):.2f} м, ковариация xy {cxy:.2f} м²"
+            )
+        QtWidgets.QMessageBox.information(self, "Оценка Монте-Карло", "\n\n".join(lines))
+
+    def _on_view_changed(self, *args):
+        if self.check_accuracy.isChecked():
+            self.schedule_update()
+
+    def _render_accuracy(self, result):
+        """Отрисовка карты точности: десятичный логарифм СКО местоопределения, NaN - прозрачные ячейки."""
+        accuracy = result.get('accuracy')
+        if accuracy is None:
+            self.accuracy_image.setVisible(False)
+            return
+
+        field, (x_min, y_min, x_max, y_max) = accuracy
+        with np.errstate(divide='ignore', invalid='ignore'):
+            image = np.log10(field)
+        finite = image[np.isfinite(image)]
+        if not len(finite):
+            self.accuracy_image.setVisible(False)
+            return
+        low, high = np.percentile(finite, (2, 98))
+        self.accuracy_image.setImage(image.T, levels=(low, max(high, low + 1e-6)), autoLevels=False)
+        self.accuracy_image.setRect(QtCore.QRectF(x_min, y_min, x_max - x_min, y_max - y_min))
+        self.accuracy_image.setVisible(True)
+
+    def _render_targets(self, result):
+        """Отрисовка положений цели, найденных по измерениям (варианты 1 и 3)."""
+        targets = [target for target in result['targets'] if target is not None]
+        if targets:
+            self.target_point.setData(*zip(*targets))
+        else:
+            self.target_point.clear()
+
+    def _snapshot_parameters(self, persist=False):
+        """
+        Чтение параметров из интерфейса в независимый от виджетов снимок для расчёта
+
+        :param persist: Использовать постоянный кэш результатов (загрузка и сохранение конфигураций, пресеты)
+        """
+        # Обновление параметров РЛС из интерфейса
+        self._read_rls_inputs()
+        variant = self.combo_box.currentIndex() + 1
+
+        if variant == 1:
             # Обновление глобальных погрешностей
             self.R1 = self.spin_R1.value()
             self.R2 = self.spin_R2.value()
             self.E_ellipse = self.spin_E_ellipse.value()
             self.E_hyperbola = self.spin_E_hyperbola.value()
+            params = {'R1': self.R1, 'R2': self.R2, 'E_ellipse': self.E_ellipse, 'E_hyperbola': self.E_hyperbola}
+        elif variant == 2:
+            params = {}
+        else:
+            params = {
+                'radius_rls1': self.spin_radius_rls1.value(),
+                'error_rls1': self.spin_error_rls1.value(),
+                'radius_rls2': self.spin_radius_rls2.value(),
+                'error_rls2': self.spin_error_rls2.value(),
+            }
 
-            # Обновление точек РЛС
-            self.rls1_point.setData([self.rls1.x], [self.rls1.y])
-            self.rls2_point.setData([self.rls2.x], [self.rls2.y])
-
-            for item in self.current_antennas_lobes:
-                self.plot_widget.getPlotItem().removeItem(item)
-            self.current_antennas_lobes.clear()
-
-            # Расчёт ДНА
-
-            angles_deg = np.linspace(-360, 360, 3600)
-
-            attenuation_factor1 = np.log(2) / (self.rls1.W / 2)**2
-            main_lobe1 = np.exp(-attenuation_factor1 * (angles_deg - main_lobe_direction_deg1)**2)
-            main_lobe1 = main_lobe1 / np.max(main_lobe1)
-
-            attenuation_factor2 = np.log(2) / (self.rls2.W / 2)**2
-            main_lobe2 = np.exp(-attenuation_factor2 * (angles_deg - main_lobe_direction_deg2)**2)
-            main_lobe2 = main_lobe2 / np.max(main_lobe2)
-
-            max_range_distances1 = main_lobe1 * max_range1
-            max_range_distances2 = main_lobe2 * max_range2
-
-            theta = np.deg2rad(angles_deg)
-            x_fill1 = max_range_distances1 * np.cos(theta) + position1[0]
-            y_fill1 = max_range_distances1 * np.sin(theta) + position1[1]
-
-            x_fill2 = max_range_distances2 * np.cos(theta) + position2[0]
-            y_fill2 = max_range_distances2 * np.sin(theta) + position2[1]
-
-            poly1_coords = np.column_stack((x_fill1, y_fill1))
-            poly1 = Polygon(poly1_coords)
-            poly2_coords = np.column_stack((x_fill2, y_fill2))
-            poly2 = Polygon(poly2_coords)
-
-            angle_rad1 = np.deg2rad(main_lobe_direction_deg1)
-            end_point1 = position1 + max_range1 * np.array([np.cos(angle_rad1), np.sin(angle_rad1)])
-            line1 = self.plot_widget.plot([position1[0], end_point1[0]], [position1[1], end_point1[1]], pen=pg.mkPen('b', style=Qt.DashLine, width=1))
-            self.current_antennas_lobes.append(line1)
-
-            angle_rad2 = np.deg2rad(main_lobe_direction_deg2)
-            end_point2 = position2 + max_range2 * np.array([np.cos(angle_rad2), np.sin(angle_rad2)])
-            line2 = self.plot_widget.plot([position2[0], end_point2[0]], [position2[1], end_point2[1]], pen=pg.mkPen('r', style=Qt.DashLine, width=1))
-            self.current_antennas_lobes.append(line2)
-
-            points1 = [pg.QtCore.QPointF(x, y) for x, y in zip(x_fill1, y_fill1)]
-            polygon1 = QPolygonF(points1)
-            polygon_item1 = pg.QtWidgets.QGraphicsPolygonItem(polygon1)
-            polygon_item1.setBrush(pg.mkBrush(0, 255, 255, 100))
-            polygon_item1.setPen(pg.mkPen(color='blue', width=2))
-            self.plot_widget.addItem(polygon_item1)
-            self.current_antennas_lobes.append(polygon_item1)
-
-            points2 = [pg.QtCore.QPointF(x, y) for x, y in zip(x_fill2, y_fill2)]
-            polygon2 = QPolygonF(points2)
-            polygon_item2 = pg.QtWidgets.QGraphicsPolygonItem(polygon2)
-            polygon_item2.setBrush(pg.mkBrush(255, 0, 0, 100))
-            polygon_item2.setPen(pg.mkPen(color='red', width=2))
-            self.plot_widget.addItem(polygon_item2)
-            self.current_antennas_lobes.append(polygon_item2)
-
-            # Конец расчёта ДНА
-
-            # Построение эллипсов
-            c1 = self.R1 + self.R2
-            ellipse1_x, ellipse1_y = compute_ellipse(self.rls1, self.rls2, c1)
-            if len(ellipse1_x) > 0:
-                self.ellipse1.setData(ellipse1_x, ellipse1_y)
-            else:
-                self.ellipse1.clear()
-
-            c2 = (self.R1 + self.E_ellipse) + (self.R2 + self.E_ellipse)
-            ellipse2_x, ellipse2_y = compute_ellipse(self.rls1, self.rls2, c2)
-            if len(ellipse2_x) > 0:
-                self.ellipse2.setData(ellipse2_x, ellipse2_y)
-            else:
-                self.ellipse2.clear()
-
-            # Построение гипербол
-            # Гипербола 1: R2 - R1 = c
-            c_h1 = self.R2 - self.R1
-            hyperbola1_ideal_x1, hyperbola1_ideal_y1, hyperbola1_ideal_x2, hyperbola1_ideal_y2 = compute_hyperbola(self.rls1, self.rls2, c_h1)
-
-            # Гипербола 1 с погрешностью (положительная)
-            c_h1_uncertainty_pos = c_h1 + 2 * self.E_hyperbola
-            hyperbola1_uncertainty_x1, hyperbola1_uncertainty_y1, hyperbola1_uncertainty_x2, hyperbola1_uncertainty_y2 = compute_hyperbola(self.rls1, self.rls2, c_h1_uncertainty_pos)
-
-            # Гипербола 1 с погрешностью (отрицательная)
-            c_h1_uncertainty_neg = c_h1 - 2 * self.E_hyperbola
-            hyperbola1_uncertainty_neg_x1, hyperbola1_uncertainty_neg_y1, hyperbola1_uncertainty_neg_x2, hyperbola1_uncertainty_neg_y2 = compute_hyperbola(self.rls1, self.rls2, c_h1_uncertainty_neg)
-
-            # Гипербола 2: R1 - R2 = c
-            c_h2 = self.R1 - self.R2
-            hyperbola2_ideal_x1, hyperbola2_ideal_y1, hyperbola2_ideal_x2, hyperbola2_ideal_y2 = compute_hyperbola(self.rls1, self.rls2, c_h2)
-
-            # Гипербола 2 с погрешностью (положительная)
-            c_h2_uncertainty_pos = c_h2 + 2 * self.E_hyperbola
-            hyperbola2_uncertainty_x1, hyperbola2_uncertainty_y1, hyperbola2_uncertainty_x2, hyperbola2_uncertainty_y2 = compute_hyperbola(self.rls1, self.rls2, c_h2_uncertainty_pos)
-
-            # Гипербола 2 с погрешностью (отрицательная)
-            c_h2_uncertainty_neg = c_h2 - 2 * self.E_hyperbola
-            hyperbola2_uncertainty_neg_x1, hyperbola2_uncertainty_neg_y1, hyperbola2_uncertainty_neg_x2, hyperbola2_uncertainty_neg_y2 = compute_hyperbola(self.rls1, self.rls2, c_h2_uncertainty_neg)
-
-            # Гипербола 1 (Погрешность Плюс)
-            if all([len(hyperbola1_uncertainty_x1) > 0, len(hyperbola1_uncertainty_y1) > 0,
-                    len(hyperbola1_uncertainty_x2) > 0, len(hyperbola1_uncertainty_y2) > 0]):
-                hyperbola1_uncertainty_x = np.concatenate([hyperbola1_uncertainty_x1, [np.nan], hyperbola1_uncertainty_x2])
-                hyperbola1_uncertainty_y = np.concatenate([hyperbola1_uncertainty_y1, [np.nan], hyperbola1_uncertainty_y2])
-                self.hyperbola1_uncertainty.setData(hyperbola1_uncertainty_x, hyperbola1_uncertainty_y)
-            else:
-                self.hyperbola1_uncertainty.clear()
-
-            # Гипербола 1 (Погрешность Минус)
-            if all([len(hyperbola1_uncertainty_neg_x1) > 0, len(hyperbola1_uncertainty_neg_y1) > 0,
-                    len(hyperbola1_uncertainty_neg_x2) > 0, len(hyperbola1_uncertainty_neg_y2) > 0]):
-                hyperbola1_uncertainty_neg_x = np.concatenate([hyperbola1_uncertainty_neg_x1, [np.nan], hyperbola1_uncertainty_neg_x2])
-                hyperbola1_uncertainty_neg_y = np.concatenate([hyperbola1_uncertainty_neg_y1, [np.nan], hyperbola1_uncertainty_neg_y2])
-                self.hyperbola1_uncertainty_neg.setData(hyperbola1_uncertainty_neg_x, hyperbola1_uncertainty_neg_y)
-            else:
-                self.hyperbola1_uncertainty_neg.clear()
-
-            # Гипербола 2 (Погрешность Плюс)
-            if all([len(hyperbola2_uncertainty_x1) > 0, len(hyperbola2_uncertainty_y1) > 0,
-                    len(hyperbola2_uncertainty_x2) > 0, len(hyperbola2_uncertainty_y2) > 0]):
-                hyperbola2_uncertainty_x = np.concatenate([hyperbola2_uncertainty_x1, [np.nan], hyperbola2_uncertainty_x2])
-                hyperbola2_uncertainty_y = np.concatenate([hyperbola2_uncertainty_y1, [np.nan], hyperbola2_uncertainty_y2])
-                self.hyperbola2_uncertainty.setData(hyperbola2_uncertainty_x, hyperbola2_uncertainty_y)
-            else:
-                self.hyperbola2_uncertainty.clear()
-
-            # Гипербола 2 (Погрешность Минус)
-            if all([len(hyperbola2_uncertainty_neg_x1) > 0, len(hyperbola2_uncertainty_neg_y1) > 0,
-                    len(hyperbola2_uncertainty_neg_x2) > 0, len(hyperbola2_uncertainty_neg_y2) > 0]):
-                hyperbola2_uncertainty_neg_x = np.concatenate([hyperbola2_uncertainty_neg_x1, [np.nan], hyperbola2_uncertainty_neg_x2])
-                hyperbola2_uncertainty_neg_y = np.concatenate([hyperbola2_uncertainty_neg_y1, [np.nan], hyperbola2_uncertainty_neg_y2])
-                self.hyperbola2_uncertainty_neg.setData(hyperbola2_uncertainty_neg_x, hyperbola2_uncertainty_neg_y)
-            else:
-                self.hyperbola2_uncertainty_neg.clear()
-
-            for item in self.current_intersection_items:
-                self.plot_widget.removeItem(item)
-            self.current_intersection_items.clear()
-
-            ellipse_inner_polygon = Polygon(list(zip(ellipse1_x, ellipse1_y)))
-            ellipse_outer_polygon = Polygon(list(zip(ellipse2_x, ellipse2_y)))
-            hyperbola1_outer_polygon = Polygon(list(zip(hyperbola1_uncertainty_neg_x2, hyperbola1_uncertainty_neg_y2)))
-            hyperbola1_inner_polygon = Polygon(list(zip(hyperbola2_uncertainty_neg_x1, hyperbola2_uncertainty_neg_y1)))
-            hyperbola2_outer_polygon = Polygon(list(zip(hyperbola1_uncertainty_neg_x1, hyperbola1_uncertainty_neg_y1)))
-            hyperbola2_inner_polygon = Polygon(list(zip(hyperbola2_uncertainty_neg_x2, hyperbola2_uncertainty_neg_y2)))
-            
-            ellipse_difference = ellipse_outer_polygon.difference(ellipse_inner_polygon)
-            hyperbola1_difference = hyperbola1_outer_polygon.difference(hyperbola1_inner_polygon)
-            hyperbola2_difference = hyperbola2_outer_polygon.difference(hyperbola2_inner_polygon)
-            ellipse_hyperbola1_intersection = ellipse_difference.intersection(hyperbola1_difference)
-            ellipse_hyperbola2_intersection = ellipse_difference.intersection(hyperbola2_difference)
-
-            final_intersection1 = poly1.intersection(poly2).intersection(ellipse_hyperbola1_intersection)
-            final_intersection2 = poly1.intersection(poly1).intersection(ellipse_hyperbola2_intersection)
-
-            x, y = final_intersection1.exterior.coords.xy
-            points = [pg.QtCore.QPointF(xi, yi) for xi, yi in zip(x, y)]
-            polygon_qt = QPolygonF(points)
-            polygon_item = pg.QtWidgets.QGraphicsPolygonItem(polygon_qt)
-            polygon_item.setBrush(pg.mkBrush(0, 255, 0, 255))  # Green with transparency
-            polygon_item.setPen(pg.mkPen(None))
-            self.plot_widget.addItem(polygon_item)
-            self.current_intersection_items.append(polygon_item)
-
-            x, y = final_intersection2.exterior.coords.xy
-            points = [pg.QtCore.QPointF(xi, yi) for xi, yi in zip(x, y)]
-            polygon_qt = QPolygonF(points)
-            polygon_item = pg.QtWidgets.QGraphicsPolygonItem(polygon_qt)
-            polygon_item.setBrush(pg.mkBrush(0, 255, 0, 255))  # Green with transparency
-            polygon_item.setPen(pg.mkPen(None))
-            self.plot_widget.addItem(polygon_item)
-            self.current_intersection_items.append(polygon_item)
-
-            if not final_intersection1.is_empty:
-                area1 = final_intersection1.area
-                self.label_area1.setText(f"Площадь 1: {area1:.2f} м²")
-            else:
-                self.label_area1.setText("Площадь 1: 0 м²")
-
-            if not final_intersection2.is_empty:
-                area2 = final_intersection2.area
-                self.label_area2.setText(f"Площадь 2: {area2:.2f} м²")
+        # Видимая область и её ширина в пикселях для карты точности
+        accuracy = None
+        if self.check_accuracy.isChecked() and variant != 2:
+            (x_min, x_max), (y_min, y_max) = self.plot_widget.viewRange()
+            accuracy = ((x_min, y_min, x_max, y_max), self.plot_widget.width())
+
+        return {'variant': variant, 'rls1': copy.copy(self.rls1), 'rls2': copy.copy(self.rls2), 'params': params,
+                'accuracy': accuracy, 'persist': persist}
+
+    @staticmethod
+    def _compute_snapshot(snapshot):
+        """Расчёт геометрии по снимку параметров (выполняется в фоновом потоке)."""
+        with profiler.section(f"compute.variant{snapshot['variant']}"):
+            if snapshot['persist']:
+                result = cached_compute_variant(snapshot['variant'], snapshot['rls1'], snapshot['rls2'],
+                                                **snapshot['params'])
             else:
-                self.label_area2.setText("Площадь 2: 0 м²")
-
-        elif current_option == 1:
-            self.rls1.x = self.inputs_rls1['X'].value()
-            self.rls1.y = self.inputs_rls1['Y'].value()
-            self.rls1.R = self.inputs_rls1['R'].value()
-            self.rls1.A = self.inputs_rls1['A'].value()
-            self.rls1.W = self.inputs_rls1['W'].value()
-            position1 = np.array([self.rls1.x, self.rls1.y])
-            main_lobe_direction_deg1 = self.rls1.A
-            max_range1 = self.rls1.R
-
-            self.rls2.x = self.inputs_rls2['X'].value()
-            self.rls2.y = self.inputs_rls2['Y'].value()
-            self.rls2.R = self.inputs_rls2['R'].value()
-            self.rls2.A = self.inputs_rls2['A'].value()
-            self.rls2.W = self.inputs_rls2['W'].value()
-            position2 = np.array([self.rls2.x, self.rls2.y])
-            main_lobe_direction_deg2 = self.rls2.A
-            max_range2 = self.rls2.R
-
-            # Обновление точек РЛС
-            self.rls1_point.setData([self.rls1.x], [self.rls1.y])
-            self.rls2_point.setData([self.rls2.x], [self.rls2.y])
-
-            for item in self.current_antennas_lobes:
-                self.plot_widget.getPlotItem().removeItem(item)
-            self.current_antennas_lobes.clear()
-            
-            # Расчёт ДНА
-
-            angles_deg = np.linspace(-360, 360, 3600)
-
-            attenuation_factor1 = np.log(2) / (self.rls1.W / 2)**2
-            main_lobe1 = np.exp(-attenuation_factor1 * (angles_deg - main_lobe_direction_deg1)**2)
-            main_lobe1 = main_lobe1 / np.max(main_lobe1)
-
-            attenuation_factor2 = np.log(2) / (self.rls2.W / 2)**2
-            main_lobe2 = np.exp(-attenuation_factor2 * (angles_deg - main_lobe_direction_deg2)**2)
-            main_lobe2 = main_lobe2 / np.max(main_lobe2)
-
-            max_range_distances1 = main_lobe1 * max_range1
-            max_range_distances2 = main_lobe2 * max_range2
-
-            theta = np.deg2rad(angles_deg)
-            x_fill1 = max_range_distances1 * np.cos(theta) + position1[0]
-            y_fill1 = max_range_distances1 * np.sin(theta) + position1[1]
-
-            x_fill2 = max_range_distances2 * np.cos(theta) + position2[0]
-            y_fill2 = max_range_distances2 * np.sin(theta) + position2[1]
-
-            poly1_coords = np.column_stack((x_fill1, y_fill1))
-            poly1 = Polygon(poly1_coords)
-            poly2_coords = np.column_stack((x_fill2, y_fill2))
-            poly2 = Polygon(poly2_coords)
-
-            angle_rad1 = np.deg2rad(main_lobe_direction_deg1)
-            end_point1 = position1 + max_range1 * np.array([np.cos(angle_rad1), np.sin(angle_rad1)])
-            line1 = self.plot_widget.plot([position1[0], end_point1[0]], [position1[1], end_point1[1]], pen=pg.mkPen('b', style=Qt.DashLine, width=1))
-            self.current_antennas_lobes.append(line1)
-
-            angle_rad2 = np.deg2rad(main_lobe_direction_deg2)
-            end_point2 = position2 + max_range2 * np.array([np.cos(angle_rad2), np.sin(angle_rad2)])
-            line2 = self.plot_widget.plot([position2[0], end_point2[0]], [position2[1], end_point2[1]], pen=pg.mkPen('r', style=Qt.DashLine, width=1))
-            self.current_antennas_lobes.append(line2)
-
-            points1 = [pg.QtCore.QPointF(x, y) for x, y in zip(x_fill1, y_fill1)]
-            polygon1 = QPolygonF(points1)
-            polygon_item1 = pg.QtWidgets.QGraphicsPolygonItem(polygon1)
-            polygon_item1.setBrush(pg.mkBrush(0, 255, 255, 100))
-            polygon_item1.setPen(pg.mkPen(color='blue', width=2))
-            self.plot_widget.addItem(polygon_item1)
-            self.current_antennas_lobes.append(polygon_item1)
-
-            points2 = [pg.QtCore.QPointF(x, y) for x, y in zip(x_fill2, y_fill2)]
-            polygon2 = QPolygonF(points2)
-            polygon_item2 = pg.QtWidgets.QGraphicsPolygonItem(polygon2)
-            polygon_item2.setBrush(pg.mkBrush(255, 0, 0, 100))
-            polygon_item2.setPen(pg.mkPen(color='red', width=2))
-            self.plot_widget.addItem(polygon_item2)
-            self.current_antennas_lobes.append(polygon_item2)
-
-            # Конец расчёта ДНА
-
-            for item in self.current_intersection_items:
-                self.plot_widget.removeItem(item)
-            self.current_intersection_items.clear()
-
-            intersect_poly = poly1.intersection(poly2)
-
-            if isinstance(intersect_poly, GeometryCollection):
-                for geom in intersect_poly.geoms:
-                    if isinstance(geom, Polygon):
-                        x, y = geom.exterior.coords.xy
-                        points = [pg.QtCore.QPointF(xi, yi) for xi, yi in zip(x, y)]
-                        polygon_qt = QPolygonF(points)
-                        polygon_item = pg.QtWidgets.QGraphicsPolygonItem(polygon_qt)
-                        polygon_item.setBrush(pg.mkBrush(0, 255, 0, 255))
-                        polygon_item.setPen(pg.mkPen(None))
-                        self.plot_widget.addItem(polygon_item)
-                        self.current_intersection_items.append(polygon_item)
-            else:
-                x, y = intersect_poly.exterior.coords.xy
-                points = [pg.QtCore.QPointF(xi, yi) for xi, yi in zip(x, y)]
-                polygon_qt = QPolygonF(points)
-                polygon_item = pg.QtWidgets.QGraphicsPolygonItem(polygon_qt)
-                polygon_item.setBrush(pg.mkBrush(0, 255, 0, 255))
-                polygon_item.setPen(pg.mkPen(None))
-                self.plot_widget.addItem(polygon_item)
-                self.current_intersection_items.append(polygon_item)
-
-            if not intersect_poly.is_empty:
-                area = intersect_poly.area
-                self.label_area1.setText(f"Площадь: {area:.2f} м²")
-            else:
-                self.label_area1.setText("Площадь: 0 м²")
-        
-        elif current_option == 2:
-            self.rls1.x = self.inputs_rls1['X'].value()
-            self.rls1.y = self.inputs_rls1['Y'].value()
-            self.rls1.R = self.inputs_rls1['R'].value()
-            self.rls1.A = self.inputs_rls1['A'].value()
-            self.rls1.W = self.inputs_rls1['W'].value()
-
-            position1 = np.array([self.rls1.x, self.rls1.y])
-            main_lobe_direction_deg1 = self.rls1.A
-            max_range1 = self.rls1.R
-
-            self.rls2.x = self.inputs_rls2['X'].value()
-            self.rls2.y = self.inputs_rls2['Y'].value()
-            self.rls2.R = self.inputs_rls2['R'].value()
-            self.rls2.A = self.inputs_rls2['A'].value()
-            self.rls2.W = self.inputs_rls2['W'].value()
-
-            position2 = np.array([self.rls2.x, self.rls2.y])
-            main_lobe_direction_deg2 = self.rls2.A
-            max_range2 = self.rls2.R
-
-            radius_rls1 = self.spin_radius_rls1.value()
-            error_rls1 = self.spin_error_rls1.value()
-            radius_rls2 = self.spin_radius_rls2.value()
-            error_rls2 = self.spin_error_rls2.value()
-
-            # Обновление точек РЛС
-            self.rls1_point.setData([self.rls1.x], [self.rls1.y])
-            self.rls2_point.setData([self.rls2.x], [self.rls2.y])
-
-            for item in self.current_antennas_lobes:
-                self.plot_widget.getPlotItem().removeItem(item)
-            self.current_antennas_lobes.clear()
-            
-            # Расчёт ДНА
-
-            angles_deg = np.linspace(-360, 360, 3600)
-
-            attenuation_factor1 = np.log(2) / (self.rls1.W / 2)**2
-            main_lobe1 = np.exp(-attenuation_factor1 * (angles_deg - main_lobe_direction_deg1)**2)
-            main_lobe1 = main_lobe1 / np.max(main_lobe1)
-
-            attenuation_factor2 = np.log(2) / (self.rls2.W / 2)**2
-            main_lobe2 = np.exp(-attenuation_factor2 * (angles_deg - main_lobe_direction_deg2)**2)
-            main_lobe2 = main_lobe2 / np.max(main_lobe2)
+                result = compute_variant(snapshot['variant'], snapshot['rls1'], snapshot['rls2'], **snapshot['params'])
+        if snapshot['accuracy'] is not None:
+            with profiler.section('compute.accuracy'):
+                view, pixels = snapshot['accuracy']
+                result['accuracy'] = accuracy_tiles.render(snapshot['variant'], snapshot['rls1'], snapshot['rls2'],
+                                                           view, pixels, **snapshot['params'])
+        return result
+
+    def schedule_update(self, *args):
+        """Отложенный фоновый перерасчёт графика (используется при перемещении ползунков)."""
+        if not self.inputs_rls1 or not self.inputs_rls2:
+            return
+        self.recompute_scheduler.request(self._snapshot_parameters())
 
-            max_range_distances1 = main_lobe1 * max_range1
-            max_range_distances2 = main_lobe2 * max_range2
+    def _on_result_ready(self, snapshot, result):
+        # Результат, рассчитанный для другого варианта, устарел
+        if snapshot['variant'] != self.combo_box.currentIndex() + 1:
+            return
+        self._render(snapshot, result)
 
-            theta = np.deg2rad(angles_deg)
-            x_fill1 = max_range_distances1 * np.cos(theta) + position1[0]
-            y_fill1 = max_range_distances1 * np.sin(theta) + position1[1]
+    def update_plot(self, persist=False):
+        """
+        Синхронный перерасчёт и перерисовка графика
 
-            x_fill2 = max_range_distances2 * np.cos(theta) + position2[0]
-            y_fill2 = max_range_distances2 * np.sin(theta) + position2[1]
+        :param persist: Использовать постоянный кэш результатов
+        """
+        if not self.inputs_rls1 or not self.inputs_rls2:
+            return
 
-            poly1_coords = np.column_stack((x_fill1, y_fill1))
-            poly1 = Polygon(poly1_coords)
-            poly2_coords = np.column_stack((x_fill2, y_fill2))
-            poly2 = Polygon(poly2_coords)
+        self.recompute_scheduler.cancel()
+        snapshot = self._snapshot_parameters(persist)
+        self._render(snapshot, self._compute_snapshot(snapshot))
 
-            angle_rad1 = np.deg2rad(main_lobe_direction_deg1)
-            end_point1 = position1 + max_range1 * np.array([np.cos(angle_rad1), np.sin(angle_rad1)])
-            line1 = self.plot_widget.plot([position1[0], end_point1[0]], [position1[1], end_point1[1]], pen=pg.mkPen('b', style=Qt.DashLine, width=1))
-            self.current_antennas_lobes.append(line1)
+    def _render(self, snapshot, result):
+        """Отрисовка рассчитанной геометрии."""
+        with profiler.section('render.frame'):
+            self._render_frame(snapshot, result)
+        self._update_profile_hud()
 
-            angle_rad2 = np.deg2rad(main_lobe_direction_deg2)
-            end_point2 = position2 + max_range2 * np.array([np.cos(angle_rad2), np.sin(angle_rad2)])
-            line2 = self.plot_widget.plot([position2[0], end_point2[0]], [position2[1], end_point2[1]], pen=pg.mkPen('r', style=Qt.DashLine, width=1))
-            self.current_antennas_lobes.append(line2)
+    def _render_curves(self, result):
+        """Отрисовка эллипсов и гипербол (вариант 1)."""
+        # Эллипсы
+        for curve, data in zip((self.ellipse1, self.ellipse2), result['ellipses']):
+            if data is not None:
+                curve.setData(*data)
+            else:
+                curve.clear()
 
-            points1 = [pg.QtCore.QPointF(x, y) for x, y in zip(x_fill1, y_fill1)]
-            polygon1 = QPolygonF(points1)
-            polygon_item1 = pg.QtWidgets.QGraphicsPolygonItem(polygon1)
-            polygon_item1.setBrush(pg.mkBrush(0, 255, 255, 100))
-            polygon_item1.setPen(pg.mkPen(color='blue', width=2))
-            self.plot_widget.addItem(polygon_item1)
-            self.current_antennas_lobes.append(polygon_item1)
+        # Гиперболы
+        for name, data in result['hyperbolas'].items():
+            curve = getattr(self, name)
+            if data is not None:
+                curve.setData(*data)
+            else:
+                curve.clear()
 
-            points2 = [pg.QtCore.QPointF(x, y) for x, y in zip(x_fill2, y_fill2)]
-            polygon2 = QPolygonF(points2)
-            polygon_item2 = pg.QtWidgets.QGraphicsPolygonItem(polygon2)
-            polygon_item2.setBrush(pg.mkBrush(255, 0, 0, 100))
-            polygon_item2.setPen(pg.mkPen(color='red', width=2))
-            self.plot_widget.addItem(polygon_item2)
-            self.current_antennas_lobes.append(polygon_item2)
+    def _render_frame(self, snapshot, result):
+        rls1, rls2 = snapshot['rls1'], snapshot['rls2']
+        variant = snapshot['variant']
 
-            # Конец расчёта ДНА
+        # Обновление точек РЛС
+        self.rls1_point.setData([rls1.x], [rls1.y])
+        self.rls2_point.setData([rls2.x], [rls2.y])
 
-            for item in self.current_intersection_items:
-                self.plot_widget.removeItem(item)
-            self.current_intersection_items.clear()
+        with profiler.section('render.lobes'):
+            self._render_lobes(result)
+        with profiler.section('render.accuracy'):
+            self._render_accuracy(result)
 
-            # Дальность РЛС1 + погрешность
+        if variant == 1:
+            with profiler.section('render.curves'):
+                self._render_curves(result)
+            with profiler.section('render.intersections'):
+                self._render_intersections(result)
+            self._render_targets(result)
 
-            circle_rls1 = pg.QtWidgets.QGraphicsEllipseItem(
-                position1[0] - radius_rls1, position1[1] - radius_rls1, 2 * radius_rls1, 2 * radius_rls1
-            )
-            circle_rls1.setPen(pg.mkPen(color='blue', width=2))
-            self.plot_widget.addItem(circle_rls1)
-            self.current_antennas_lobes.append(circle_rls1)
+            area1, area2 = result['areas']
+            self.label_area1.setText(f"Площадь 1: {area1:.2f} м²" if area1 else "Площадь 1: 0 м²")
+            self.label_area2.setText(f"Площадь 2: {area2:.2f} м²" if area2 else "Площадь 2: 0 м²")
 
-            error_circle_rls1 = pg .QtWidgets.QGraphicsEllipseItem(
-                position1[0] - (radius_rls1 + error_rls1), position1[1] - (radius_rls1 + error_rls1),
-                2 * (radius_rls1 + error_rls1), 2 * (radius_rls1 + error_rls1)
-            )
-            error_circle_rls1.setPen(pg.mkPen(color='blue', style=QtCore.Qt.DashLine))
-            self.plot_widget.addItem(error_circle_rls1)
-            self.current_antennas_lobes.append(error_circle_rls1)
+        elif variant == 2:
+            with profiler.section('render.intersections'):
+                self._render_intersections(result)
 
-            # Дальность РЛС2 + погрешность
+            area, = result['areas']
+            self.label_area1.setText(f"Площадь: {area:.2f} м²" if area else "Площадь: 0 м²")
 
-            circle_rls2 = pg.QtWidgets.QGraphicsEllipseItem(
-                position2[0] - radius_rls2, position2[1] - radius_rls2, 2 * radius_rls2, 2 * radius_rls2
-            )
-            circle_rls2.setPen(pg.mkPen(color='red', width=2))
-            self.plot_widget.addItem(circle_rls2)
-            self.current_antennas_lobes.append(circle_rls2)
+        elif variant == 3:
+            with profiler.section('render.intersections'):
+                self._render_intersections(result)
+            with profiler.section('render.circles'):
+                self._render_circles(result)
+            self._render_targets(result)
 
-            error_circle_rls2 = pg.QtWidgets.QGraphicsEllipseItem(
-                position2[0] - (radius_rls2 + error_rls2), position2[1] - (radius_rls2 + error_rls2),
-                2 * (radius_rls2 + error_rls2), 2 * (radius_rls2 + error_rls2)
-            )
-            error_circle_rls2.setPen(pg.mkPen(color='red', style=QtCore.Qt.DashLine))
-            self.plot_widget.addItem(error_circle_rls2)
-            self.current_antennas_lobes.append(error_circle_rls2)
-
-            # Пересечение
-
-            theta = np.linspace(0, 2 * np.pi, 360)
-           
-            x_circle1 = self.rls1.x + radius_rls1 * np.cos(theta)
-            y_circle1 = self.rls1.y + radius_rls1 * np.sin(theta)
-            circle1_coords = list(zip(x_circle1, y_circle1))
-            circle1_polygon = Polygon(circle1_coords)
-
-            x_error_circle1 = self.rls1.x + (radius_rls1 + error_rls1) * np.cos(theta)
-            y_error_circle1 = self.rls1.y + (radius_rls1 + error_rls1) * np.sin(theta)
-            error_circle1_coords = list(zip(x_error_circle1, y_error_circle1))
-            error_circle1_polygon = Polygon(error_circle1_coords)
-
-            x_circle2 = self.rls2.x + radius_rls2 * np.cos(theta)
-            y_circle2 = self.rls2.y + radius_rls2 * np.sin(theta)
-            circle2_coords = list(zip(x_circle2, y_circle2))
-            circle2_polygon = Polygon(circle2_coords)
-
-            x_error_circle2 = self.rls2.x + (radius_rls2 + error_rls2) * np.cos(theta)
-            y_error_circle2 = self.rls2.y + (radius_rls2 + error_rls2) * np.sin(theta)
-            error_circle2_coords = list(zip(x_error_circle2, y_error_circle2))
-            error_circle2_polygon = Polygon(error_circle2_coords)
-
-            ring1 = error_circle1_polygon.difference(circle1_polygon)
-            ring2 = error_circle2_polygon.difference(circle2_polygon)
-
-            rings_intersection = ring1.intersection(ring2)
-            beams_intersection = rings_intersection.intersection(poly1).intersection(poly2)
-
-            x, y = beams_intersection.exterior.coords.xy
-            points = [pg.QtCore.QPointF(xi, yi) for xi, yi in zip(x, y)]
-            polygon_qt = QPolygonF(points)
-            polygon_item = pg.QtWidgets.QGraphicsPolygonItem(polygon_qt)
-            polygon_item.setBrush(pg.mkBrush(0, 255, 0, 255))  # Green with transparency
-            polygon_item.setPen(pg.mkPen(None))
-            self.plot_widget.addItem(polygon_item)
-            self.current_intersection_items.append(polygon_item)
-
-            if not beams_intersection.is_empty:
-                area = beams_intersection.area
-                self.label_area1.setText(f"Площадь: {area:.2f} м²")
-            else:
-                self.label_area1.setText("Площадь 1: 0 м²")
+            area, = result['areas']
+            self.label_area1.setText(f"Площадь: {area:.2f} м²" if area else "Площадь 1: 0 м²")
 
         if self.firstRun:
             # Настройка границ графика
-            all_x = [self.rls1.x, self.rls2.x]
-            all_y = [self.rls1.y, self.rls2.y]
+            c2 = (self.R1 + self.E_ellipse) + (self.R2 + self.E_ellipse)
+            all_x = [rls1.x, rls2.x]
+            all_y = [rls1.y, rls2.y]
             margin = max(c2, 800) * 1.1
             self.plot_widget.setXRange(min(all_x) - margin, max(all_x) + margin, padding=0)
             self.plot_widget.setYRange(min(all_y) - margin, max(all_y) + margin, padding=0)
-            self.firstRun = False
\ No newline at end of file
+            self.firstRun = False
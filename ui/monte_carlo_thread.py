@@ -0,0 +1,34 @@
+import sys
+import traceback
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from engine.montecarlo import monte_carlo
+
+
+class MonteCarloThread(QThread):
+    """Фоновая оценка точности методом Монте-Карло для снимка параметров главного окна."""
+    resultReady = pyqtSignal(object, object)  # снимок, результат monte_carlo
+    failed = pyqtSignal(str)
+
+    def __init__(self, snapshot, samples, workers=None, parent=None):
+        """
+        :param snapshot: Снимок параметров (MainWindow._snapshot_parameters)
+        :param samples: Количество точек выборки на область
+        :param workers: Количество процессов (None - по числу ядер)
+        """
+        super().__init__(parent)
+        self.snapshot = snapshot
+        self.samples = samples
+        self.workers = workers
+
+    def run(self):
+        snapshot = self.snapshot
+        try:
+            results = monte_carlo(snapshot['variant'], snapshot['rls1'], snapshot['rls2'], samples=self.samples,
+                                  workers=self.workers, **snapshot['params'])
+        except Exception as e:
+            traceback.print_exc(file=sys.stderr)
+            self.failed.emit(str(e))
+            return
+        self.resultReady.emit(snapshot, results)
@@ -0,0 +1,161 @@
+import sys
+import traceback
+
+from PyQt5 import QtWidgets
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from optimizer import optimize
+
+# Параметры РЛС, доступные для подбора: (имя параметра, подпись)
+OPTIMIZER_PARAMS = [
+    (f'rls{index}.{name}', f"РЛС {index}: {name.upper()}")
+    for index in (1, 2) for name in ('x', 'y', 'R', 'A', 'W')
+]
+
+# Параметры, выбранные по умолчанию
+DEFAULT_OPTIMIZER_PARAMS = ('rls1.A', 'rls1.W', 'rls2.A', 'rls2.W')
+
+
+class OptimizerThread(QThread):
+    """Фоновый подбор параметров с передачей лучшей конфигурации после каждого поколения."""
+    progress = pyqtSignal(int, object, float)  # поколение, параметры, площадь
+    resultReady = pyqtSignal(object)  # результат optimize
+    failed = pyqtSignal(str)
+
+    def __init__(self, variant, names, options, parent=None):
+        """
+        :param variant: Номер варианта
+        :param names: Имена подбираемых параметров
+        :param options: Остальные аргументы optimize
+        """
+        super().__init__(parent)
+        self.variant = variant
+        self.names = names
+        self.options = options
+        self._stop = False
+
+    def stop(self):
+        """Остановка поиска после текущего поколения."""
+        self._stop = True
+
+    def _progress(self, iteration, params, area):
+        self.progress.emit(iteration, params, area)
+        return self._stop
+
+    def run(self):
+        try:
+            result = optimize(self.variant, self.names, progress=self._progress, **self.options)
+        except Exception as e:
+            traceback.print_exc(file=sys.stderr)
+            self.failed.emit(str(e))
+            return
+        self.resultReady.emit(result)
+
+
+class OptimizerDialog(QtWidgets.QDialog):
+    """
+    Окно подбора параметров РЛС
+
+    Лучшая конфигурация каждого поколения применяется к полям ввода главного
+    окна, поэтому график обновляется по ходу поиска.
+    """
+
+    def __init__(self, variant, base, apply, parent=None):
+        """
+        :param variant: Номер варианта
+        :param base: Текущие значения всех параметров варианта (как в sweep.py)
+        :param apply: Функция, применяющая словарь параметров к полям ввода
+        """
+        super().__init__(parent)
+        self.variant = variant
+        self.base = base
+        self.apply = apply
+        self.thread = None
+        self.setWindowTitle("Подбор параметров РЛС")
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(QtWidgets.QLabel(f"<b>Вариант {variant}: подбираемые параметры</b>"))
+        self.checks = {}
+        grid = QtWidgets.QGridLayout()
+        for i, (name, label) in enumerate(OPTIMIZER_PARAMS):
+            check = QtWidgets.QCheckBox(label)
+            check.setChecked(name in DEFAULT_OPTIMIZER_PARAMS)
+            grid.addWidget(check, i % 5, i // 5)
+            self.checks[name] = check
+        layout.addLayout(grid)
+
+        form = QtWidgets.QFormLayout()
+        self.combo_area = QtWidgets.QComboBox()
+        self.combo_area.addItems(["Площадь 1", "Площадь 2"] if variant == 1 else ["Площадь"])
+        form.addRow("Целевая площадь:", self.combo_area)
+        self.combo_goal = QtWidgets.QComboBox()
+        self.combo_goal.addItems(["Максимизировать", "Минимизировать"])
+        form.addRow("Цель:", self.combo_goal)
+        self.spin_maxiter = QtWidgets.QSpinBox()
+        self.spin_maxiter.setRange(1, 1000)
+        self.spin_maxiter.setValue(50)
+        form.addRow("Поколений, не более:", self.spin_maxiter)
+        layout.addLayout(form)
+
+        self.label_status = QtWidgets.QLabel("")
+        layout.addWidget(self.label_status)
+
+        buttons = QtWidgets.QHBoxLayout()
+        self.start_button = QtWidgets.QPushButton("Запустить")
+        self.start_button.clicked.connect(self.start)
+        buttons.addWidget(self.start_button)
+        self.stop_button = QtWidgets.QPushButton("Остановить")
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self.stop)
+        buttons.addWidget(self.stop_button)
+        layout.addLayout(buttons)
+
+    def start(self):
+        names = [name for name, check in self.checks.items() if check.isChecked()]
+        if not names:
+            self.label_status.setText("Не выбран ни один параметр")
+            return
+
+        options = {
+            'area': self.combo_area.currentIndex(),
+            'maximize': self.combo_goal.currentIndex() == 0,
+            # Варианты 1 и 3 считаются пакетно без полигонов
+            'engine': 'polygon' if self.variant == 2 else 'analytic',
+            'base': self.base,
+            'maxiter': self.spin_maxiter.value(),
+        }
+        self.thread = OptimizerThread(self.variant, names, options, self)
+        self.thread.progress.connect(self._on_progress)
+        self.thread.resultReady.connect(self._on_result)
+        self.thread.failed.connect(self._on_failed)
+        self.thread.finished.connect(self._on_finished)
+        self.start_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
+        self.label_status.setText("Поиск...")
+        self.thread.start()
+
+    def stop(self):
+        if self.thread is not None:
+            self.thread.stop()
+
+    def _on_progress(self, iteration, params, area):
+        self.label_status.setText(f"Поколение {iteration}: площадь {area:.2f} м²")
+        self.apply(params)
+
+    def _on_result(self, result):
+        self.apply(result['params'])
+        self.label_status.setText(f"Площадь {result['area']:.2f} м², поколений: {result['iterations']}, "
+                                  f"расчётов: {result['evaluations']}, из кэша: {result['cache_hits']}")
+
+    def _on_failed(self, message):
+        self.label_status.setText(f"Ошибка: {message}")
+
+    def _on_finished(self):
+        self.start_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+
+    def closeEvent(self, event):
+        if self.thread is not None and self.thread.isRunning():
+            self.thread.stop()
+            self.thread.wait()
+        super().closeEvent(event)
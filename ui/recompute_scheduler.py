@@ -0,0 +1,104 @@
+import sys
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+
+class _WorkerSignals(QObject):
+    """Сигналы фоновой задачи (QRunnable не может отправлять сигналы сам)."""
+    finished = pyqtSignal(int, object, object)  # поколение, снимок, результат
+
+
+class _ComputeJob(QRunnable):
+    """Фоновая задача расчёта геометрии для одного снимка параметров."""
+
+    def __init__(self, compute, generation, snapshot):
+        """
+        :param compute: Функция расчёта, принимающая снимок параметров
+        :param generation: Номер поколения запроса
+        :param snapshot: Неизменяемый снимок параметров
+        """
+        super().__init__()
+        self.compute = compute
+        self.generation = generation
+        self.snapshot = snapshot
+        self.signals = _WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.compute(self.snapshot)
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+            result = None
+        self.signals.finished.emit(self.generation, self.snapshot, result)
+
+
+class RecomputeScheduler(QObject):
+    """
+    Отложенный фоновый перерасчёт с приоритетом последнего запроса
+
+    Изменения параметров, поступившие в пределах interval_ms, объединяются в
+    один запрос. Одновременно выполняется не более одной задачи; пока она
+    выполняется, новые запросы только заменяют ожидающий снимок. Результаты
+    устаревших снимков отбрасываются, поэтому в интерфейс попадает только
+    геометрия последних параметров.
+    """
+    resultReady = pyqtSignal(object, object)  # снимок, результат
+
+    def __init__(self, compute, interval_ms=16, parent=None):
+        """
+        :param compute: Функция расчёта, принимающая снимок параметров (выполняется в фоновом потоке)
+        :param interval_ms: Интервал объединения запросов, мс
+        :param parent: Родительский объект Qt
+        """
+        super().__init__(parent)
+        self.compute = compute
+        self.pool = QThreadPool.globalInstance()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._dispatch)
+
+        self._generation = 0
+        self._pending = None
+        self._running = False
+        self._jobs = set()
+
+    def request(self, snapshot):
+        """
+        Запрос перерасчёта
+
+        :param snapshot: Неизменяемый снимок параметров
+        """
+        self._generation += 1
+        self._pending = (self._generation, snapshot)
+        self._timer.start()
+
+    def cancel(self):
+        """Отмена ожидающего запроса; результат выполняемой задачи будет отброшен."""
+        self._timer.stop()
+        self._generation += 1
+        self._pending = None
+
+    def _dispatch(self):
+        if self._running or self._pending is None:
+            return
+        generation, snapshot = self._pending
+        self._pending = None
+        self._running = True
+
+        job = _ComputeJob(self.compute, generation, snapshot)
+        job.signals.finished.connect(self._on_finished)
+        # Задача (и объект её сигналов) хранится до получения результата
+        job.setAutoDelete(False)
+        self._jobs.add(job)
+        self.pool.start(job)
+
+    def _on_finished(self, generation, snapshot, result):
+        self._jobs = {job for job in self._jobs if job.generation != generation}
+        self._running = False
+        if generation == self._generation and result is not None:
+            self.resultReady.emit(snapshot, result)
+        if self._pending is not None:
+            self._dispatch()
@@ -1,9 +1,28 @@
+from functools import lru_cache
+
 import numpy as np
 
+
+@lru_cache(maxsize=8)
+def _ellipse_basis(samples):
+    """
+    Тригонометрический базис параметризации эллипса (кэшируется по числу точек)
+
+    :param samples: Количество точек эллипса
+    :return: Кортеж из cos(theta) и sin(theta), доступных только для чтения
+    """
+    theta = np.linspace(0, 2 * np.pi, samples)
+    cos_theta = np.cos(theta)
+    sin_theta = np.sin(theta)
+    cos_theta.flags.writeable = False
+    sin_theta.flags.writeable = False
+    return cos_theta, sin_theta
+
+
 def compute_ellipse(rls1, rls2, c):
     """
     Расчёт точек эллипса по двум РЛС станциям
-    
+
     :param rls1: Первый РЛС объект
     :param rls2: Второй РЛС объект
     :param c: Константа, характеризующая размер эллипса
@@ -30,14 +49,58 @@ def compute_ellipse(rls1, rls2, c):
     if a < distance / 2:
         print(f"Невозможно построить эллипс с c={c}, так как a={a} < distance/2={distance/2}")
         return [], []
-    
+
     b = np.sqrt(a**2 - (distance / 2)**2)
 
     # Параметризация эллипса
-    theta = np.linspace(0, 2 * np.pi, 500)
+    cos_theta, sin_theta = _ellipse_basis(500)
     cos_phi = np.cos(phi)
     sin_phi = np.sin(phi)
-    ellipse_x = h + a * np.cos(theta) * cos_phi - b * np.sin(theta) * sin_phi
-    ellipse_y = k + a * np.cos(theta) * sin_phi + b * np.sin(theta) * cos_phi
-    
-    return ellipse_x, ellipse_y
\ No newline at end of file
+    ellipse_x = h + a * cos_theta * cos_phi - b * sin_theta * sin_phi
+    ellipse_y = k + a * cos_theta * sin_phi + b * sin_theta * cos_phi
+
+    return ellipse_x, ellipse_y
+
+
+def compute_ellipse_batch(foci1, foci2, c, samples=500):
+    """
+    Пакетный расчёт точек эллипсов для массивов фокусов и констант
+
+    Все аргументы приводятся к общей длине N по правилам broadcasting, расчёт
+    выполняется одним векторизованным проходом без циклов Python.
+
+    :param foci1: Координаты первых фокусов, массив формы (N, 2) или (2,) либо таблица РЛС
+    :param foci2: Координаты вторых фокусов, массив формы (N, 2) или (2,) либо таблица РЛС
+    :param c: Константы, характеризующие размер эллипсов, массив формы (N,) или скаляр
+    :param samples: Количество точек каждого эллипса
+    :return: Кортеж из x и y координат формы (N, samples) и маски корректности формы (N,);
+             строки некорректных эллипсов заполнены NaN
+    """
+    foci1 = np.asarray(getattr(foci1, 'xy', foci1), dtype=float)
+    foci2 = np.asarray(getattr(foci2, 'xy', foci2), dtype=float)
+    x1, y1, x2, y2, c = np.broadcast_arrays(foci1[..., 0], foci1[..., 1], foci2[..., 0], foci2[..., 1],
+                                            np.asarray(c, dtype=float))
+    x1, y1, x2, y2, c = (np.atleast_1d(value) for value in (x1, y1, x2, y2, c))
+
+    # Центр, расстояние между фокусами и угол наклона главной оси
+    h = (x1 + x2) / 2
+    k = (y1 + y2) / 2
+    dx = x2 - x1
+    dy = y2 - y1
+    half_distance = np.hypot(dx, dy) / 2
+    phi = np.arctan2(dy, dx)
+
+    # Полуоси эллипсов; эллипс существует при несовпадающих фокусах и a >= distance / 2
+    a = c / 2
+    valid = (half_distance > 0) & (a >= half_distance)
+    b = np.sqrt(np.where(valid, a**2 - half_distance**2, np.nan))
+
+    cos_theta, sin_theta = _ellipse_basis(samples)
+    cos_phi = np.cos(phi)[:, None]
+    sin_phi = np.sin(phi)[:, None]
+    a_cos = a[:, None] * cos_theta
+    b_sin = b[:, None] * sin_theta
+    ellipse_x = h[:, None] + a_cos * cos_phi - b_sin * sin_phi
+    ellipse_y = k[:, None] + a_cos * sin_phi + b_sin * cos_phi
+
+    return ellipse_x, ellipse_y, valid
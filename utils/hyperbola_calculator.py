@@ -1,5 +1,24 @@
+from functools import lru_cache
+
 import numpy as np
 
+
+@lru_cache(maxsize=8)
+def _hyperbola_basis(samples, t_max):
+    """
+    Базис параметризации гиперболы (кэшируется по числу точек и диапазону параметра)
+
+    :param samples: Количество точек ветви гиперболы
+    :param t_max: Граница параметра t, ветвь строится для t из [-t_max, t_max]
+    :return: Кортеж из cosh(t) и sinh(t), доступных только для чтения
+    """
+    t = np.linspace(-t_max, t_max, samples)
+    cosh_t = np.cosh(t)
+    sinh_t = np.sinh(t)
+    cosh_t.flags.writeable = False
+    sinh_t.flags.writeable = False
+    return cosh_t, sinh_t
+
 def compute_hyperbola(rls1, rls2, c):
     """
     Расчёт точек гипербол по двум РЛС станциям
@@ -41,9 +60,9 @@ def compute_hyperbola(rls1, rls2, c):
     b = np.sqrt(c_focus**2 - a**2)
 
     # Параметризация гиперболы
-    t = np.linspace(-6, 6, 2000)
-    hyperbola_x = a * np.cosh(t)
-    hyperbola_y = b * np.sinh(t)
+    cosh_t, sinh_t = _hyperbola_basis(2000, 6)
+    hyperbola_x = a * cosh_t
+    hyperbola_y = b * sinh_t
 
     # Если c < 0, отзеркаливаем гиперболу относительно центра
     if c < 0:
@@ -58,4 +77,63 @@ def compute_hyperbola(rls1, rls2, c):
     rotated_x2 = h - hyperbola_x * cos_phi - hyperbola_y * sin_phi
     rotated_y2 = k - hyperbola_x * sin_phi + hyperbola_y * cos_phi
 
-    return rotated_x1, rotated_y1, rotated_x2, rotated_y2
\ No newline at end of file
+    return rotated_x1, rotated_y1, rotated_x2, rotated_y2
+
+
+def compute_hyperbola_batch(foci1, foci2, c, samples=2000, t_max=6):
+    """
+    Пакетный расчёт ветвей гипербол для массивов фокусов и констант
+
+    Все аргументы приводятся к общей длине N по правилам broadcasting, базис
+    cosh/sinh общий для всех гипербол, расчёт выполняется одним проходом.
+
+    :param foci1: Координаты первых фокусов, массив формы (N, 2) или (2,) либо таблица РЛС
+    :param foci2: Координаты вторых фокусов, массив формы (N, 2) или (2,) либо таблица РЛС
+    :param c: Константы, характеризующие форму гипербол, массив формы (N,) или скаляр
+    :param samples: Количество точек каждой ветви
+    :param t_max: Граница параметра t ветвей
+    :return: Кортеж из x и y координат первой и второй ветвей формы (N, samples)
+             и маски корректности формы (N,); строки некорректных гипербол заполнены NaN
+    """
+    foci1 = np.asarray(getattr(foci1, 'xy', foci1), dtype=float)
+    foci2 = np.asarray(getattr(foci2, 'xy', foci2), dtype=float)
+    x1, y1, x2, y2, c = np.broadcast_arrays(foci1[..., 0], foci1[..., 1], foci2[..., 0], foci2[..., 1],
+                                            np.asarray(c, dtype=float))
+    x1, y1, x2, y2, c = (np.atleast_1d(value) for value in (x1, y1, x2, y2, c))
+
+    # Центр, половина расстояния между фокусами и угол наклона главной оси
+    h = (x1 + x2) / 2
+    k = (y1 + y2) / 2
+    dx = x2 - x1
+    dy = y2 - y1
+    c_focus = np.hypot(dx, dy) / 2
+    phi = np.arctan2(dy, dx)
+
+    # Гипербола существует при c != 0, несовпадающих фокусах и a < c_focus
+    a = np.abs(c) / 2
+    valid = (c != 0) & (c_focus > 0) & (a < c_focus)
+    b = np.sqrt(np.where(valid, c_focus**2 - a**2, np.nan))
+
+    # Для c < 0 гипербола отзеркаливается относительно центра
+    signed_a = np.where(c < 0, -a, a)
+
+    cosh_t, sinh_t = _hyperbola_basis(samples, t_max)
+    hyperbola_x = signed_a[:, None] * cosh_t
+    hyperbola_y = b[:, None] * sinh_t
+
+    # Поворот на угол phi и перенос в центр (h, k)
+    cos_phi = np.cos(phi)[:, None]
+    sin_phi = np.sin(phi)[:, None]
+    x_cos = hyperbola_x * cos_phi
+    x_sin = hyperbola_x * sin_phi
+    y_cos = hyperbola_y * cos_phi
+    y_sin = hyperbola_y * sin_phi
+    h = h[:, None]
+    k = k[:, None]
+
+    rotated_x1 = h + x_cos - y_sin
+    rotated_y1 = k + x_sin + y_cos
+    rotated_x2 = h - x_cos - y_sin
+    rotated_y2 = k - x_sin + y_cos
+
+    return rotated_x1, rotated_y1, rotated_x2, rotated_y2, valid